@@ -0,0 +1,152 @@
+"""
+배치 작업 관리
+오래 걸리는 배치를 백그라운드에서 돌리고, 진행 상황을 이벤트로 쌓아 두었다가
+구독자(SSE)에게 보낸다. 취소는 작업이 중간중간 확인하는 방식으로 멈춘다.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 작업이 끝났음을 알리는 이벤트 종류
+TERMINAL_EVENTS = ('done', 'cancelled', 'failed')
+
+class AllocationJob:
+    """배치 작업 하나의 상태와 이벤트 기록"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'  # queued → running → done / cancelled / failed
+        self.created_at = time.time()
+        self.started = None     # time.perf_counter() 기준 시작/끝 시각
+        self.ended = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.events = []        # {'id', 'event', 'data'} 목록 (id는 순번)
+        self._condition = threading.Condition()
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in TERMINAL_EVENTS
+
+    def elapsed_ms(self):
+        if self.started is None:
+            return 0
+        end = self.ended if self.ended is not None else time.perf_counter()
+        return int((end - self.started) * 1000)
+
+    def publish(self, event, data):
+        """이벤트를 기록하고 기다리는 구독자를 깨운다."""
+        with self._condition:
+            self.events.append({'id': len(self.events), 'event': event, 'data': data})
+            self._condition.notify_all()
+
+    def cancel(self):
+        """취소를 요청한다. 작업은 다음 확인 때 멈추고 그때까지의 최선을 남긴다."""
+        self._cancel.set()
+
+    def should_stop(self):
+        return self._cancel.is_set()
+
+    def wait_events(self, after, timeout=None):
+        """after번 다음 이벤트들을 돌려준다. 없으면 timeout초까지 기다린다."""
+        with self._condition:
+            if len(self.events) <= after + 1 and not self.finished:
+                self._condition.wait(timeout)
+            return self.events[after + 1:]
+
+    def _finish(self, status, result=None, error=None):
+        with self._condition:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self.ended = time.perf_counter()
+            data = {'status': status, 'elapsed_ms': self.elapsed_ms()}
+            if result is not None:
+                data['result'] = result
+            if error is not None:
+                data['error'] = error
+            self.events.append({'id': len(self.events), 'event': status, 'data': data})
+            self._condition.notify_all()
+
+    def summary(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'elapsed_ms': self.elapsed_ms(),
+            'events': len(self.events),
+            'result': self.result,
+            'error': self.error
+        }
+
+class JobManager:
+    """작업을 스레드 풀에서 돌리고 최근 작업을 max_jobs개까지 기억한다.
+
+    끝난 작업은 retention_seconds가 지나거나 개수가 넘치면 오래된 것부터 버린다.
+    """
+
+    def __init__(self, max_workers=2, max_jobs=100, retention_seconds=600, id_prefix=''):
+        self.id_prefix = id_prefix  # 여러 프로세스가 함께 서비스할 때 작업 주인을 알아보는 접두사
+        self.max_jobs = max_jobs
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='allocation-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, target):
+        """target(job)을 백그라운드에서 실행하는 작업을 만든다.
+
+        target은 job.publish로 진행 상황을 알리고, job.should_stop()을 확인해
+        멈추며, 최종 결과를 돌려준다.
+        """
+        job = AllocationJob(self.id_prefix + uuid.uuid4().hex)
+        with self._lock:
+            self._evict()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, target)
+        return job
+
+    def _run(self, job, target):
+        job.status = 'running'
+        job.started = time.perf_counter()
+        try:
+            result = target(job)
+        except Exception as e:
+            print(f"배치 작업 오류: {e}")
+            job._finish('failed', error=str(e))
+            return
+        job._finish('cancelled' if job.should_stop() else 'done', result=result)
+
+    def _evict(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and now - job.finished_at > self.retention_seconds:
+                del self._jobs[job_id]
+        # 개수가 넘치면 끝난 작업부터 오래된 순으로 버린다
+        for job_id, job in list(self._jobs.items()):
+            if len(self._jobs) < self.max_jobs:
+                break
+            if job.finished:
+                del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """작업을 취소한다. 없는 작업이면 None."""
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,122 @@
+"""
+편집 중인 배치
+화면에서 드래그로 고치는 배치를 서버에 모둠별 그룹 인원 수(TeamOccupancy)와 함께
+두고, 이동/교환 하나의 충돌 수 변화와 바뀌는 자리의 충돌 표시를 바로 계산한다.
+"""
+import threading
+import uuid
+
+from seat_allocation import TeamOccupancy
+
+class StaleArrangement(Exception):
+    """요청이 가리키는 판(version)이 이미 다른 변경으로 지나간 경우"""
+
+class Arrangement:
+    """편집 중인 배치 하나. 변경을 적용할 때마다 version이 1씩 오른다.
+
+    이동/교환의 충돌 수 변화는 옮기는 멤버의 그룹 칸만 보고(move_delta, swap_delta),
+    충돌 표시는 멤버가 오가는 두 모둠의 자리만 다시 본다.
+    """
+
+    def __init__(self, roster, id_teams, id_prefix=''):
+        self.id = id_prefix + uuid.uuid4().hex  # 여러 프로세스로 서비스할 때 주인을 알아보는 접두사
+        self.roster = roster
+        self.occupancy = TeamOccupancy.from_teams(roster, id_teams)
+        self.conflicts = self.occupancy.conflicts()
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def teams(self):
+        return self.roster.to_names(self.occupancy.teams)
+
+    def conflict_seats(self):
+        """충돌 표시가 붙는 멤버 이름 목록"""
+        occupancy = self.occupancy
+        return [
+            self.roster.names[member_id]
+            for team in occupancy.teams
+            for member_id in team
+            if occupancy.is_conflicted(member_id)
+        ]
+
+    def _member_id(self, name, team=None):
+        """이름 → 멤버 ID. 같은 이름이 여럿이면 team에 있는 사람을 고른다."""
+        for member_id in self.roster.ids_by_name.get(name, ()):
+            if team is None or self.occupancy.member_team[member_id] == int(team):
+                return member_id
+        raise ValueError(f'배치에 없는 멤버입니다: {name}')
+
+    def _team(self, value):
+        team = int(value)
+        if not 0 <= team < len(self.occupancy.teams):
+            raise ValueError(f'없는 모둠입니다: {value}')
+        return team
+
+    def _parse(self, move):
+        """변경 요청 → (종류, 인자, 자리가 바뀌는 모둠들). 종류는 history_store의 고친 내용 종류와 같다."""
+        kind = move.get('kind')
+        if kind == 'move':
+            member_id = self._member_id(move.get('member'), move.get('from_team'))
+            to_team = self._team(move.get('to_team'))
+            return kind, (member_id, to_team), (self.occupancy.member_team[member_id], to_team)
+        if kind == 'swap':
+            a = self._member_id(move.get('a'), move.get('a_team'))
+            b = self._member_id(move.get('b'), move.get('b_team'))
+            return kind, (a, b), (self.occupancy.member_team[a], self.occupancy.member_team[b])
+        if kind == 'team_swap':
+            return kind, (self._team(move.get('from_team')), self._team(move.get('to_team'))), ()
+        raise ValueError(f'알 수 없는 변경 종류입니다: {kind}')
+
+    def evaluate(self, move, apply=False, version=None):
+        """변경 하나의 충돌 수 변화와, 그 뒤 바뀌는 자리의 충돌 표시를 돌려준다.
+
+        apply가 참이면 변경을 배치에 남기고, 아니면 계산만 하고 되돌린다.
+        version을 주면 지금 판과 다를 때 StaleArrangement를 던진다.
+        """
+        with self._lock:
+            if version is not None and int(version) != self.version:
+                raise StaleArrangement(self.version)
+            kind, args, touched = self._parse(move)
+            occupancy = self.occupancy
+
+            if kind == 'move':
+                member_id, to_team = args
+                from_team = occupancy.member_team[member_id]
+                seat = occupancy.teams[from_team].index(member_id)
+                delta = occupancy.move_delta(member_id, to_team)
+                occupancy.move(member_id, to_team)
+
+                def undo():
+                    # 원래 자리 순서까지 되돌린다
+                    if from_team == to_team:
+                        return
+                    occupancy.move(member_id, from_team)
+                    team = occupancy.teams[from_team]
+                    team.insert(seat, team.pop())
+            elif kind == 'swap':
+                delta = occupancy.swap_delta(*args)
+                occupancy.swap(*args)
+                undo = lambda: occupancy.swap(*args)
+            else:
+                delta = 0
+                occupancy.swap_teams(*args)
+                undo = lambda: occupancy.swap_teams(*args)
+
+            seats = {
+                self.roster.names[member_id]: occupancy.is_conflicted(member_id)
+                for team in dict.fromkeys(touched)
+                for member_id in occupancy.teams[team]
+            }
+
+            if apply:
+                self.conflicts += delta
+                self.version += 1
+            else:
+                undo()
+            return {
+                'conflict_delta': delta,
+                'conflicts': self.conflicts if apply else self.conflicts + delta,
+                'seats': seats,
+                'version': self.version,
+                'applied': bool(apply)
+            }
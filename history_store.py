@@ -0,0 +1,253 @@
+"""
+배치 기록 저장소
+배치와 손으로 고친 내용(이동, 교환, 모둠 교환)을 SQLite 파일 하나에 쌓는다.
+같은 명단/옵션/시드면 같은 배치가 나오므로 배치는 시드와 옵션만, 고친 내용은
+그 배치에 대한 변경만 적는다. 명단은 내용이 같으면 한 번만 저장한다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# 기록 종류: 배치, 그리고 손으로 고친 내용(종류 → 필요한 값)
+ALLOCATION = 'allocation'
+EDIT_FIELDS = {
+    'move': ('member', 'from_team', 'to_team'),   # 멤버를 다른 모둠으로 이동
+    'swap': ('a', 'b'),                           # 두 멤버 자리 교환
+    'team_swap': ('from_team', 'to_team')         # 두 모둠 자리 교환
+}
+
+# 한 번에 돌려주는 최대 기록 수
+MAX_PAGE_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rosters (
+    key TEXT PRIMARY KEY,
+    members TEXT NOT NULL,
+    groups TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    seed INTEGER,
+    roster_key TEXT,
+    base_id INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_room_id ON history (room, id);
+CREATE INDEX IF NOT EXISTS history_room_time ON history (room, created_at);
+CREATE INDEX IF NOT EXISTS history_seed ON history (seed);
+CREATE INDEX IF NOT EXISTS history_base ON history (base_id, id);
+"""
+
+def roster_key(members, groups):
+    """명단과 그룹 내용으로 만든 키 (sha256). normalize_roster를 거친 값을 넣는다."""
+    payload = json.dumps({'members': members, 'groups': groups}, sort_keys=True,
+                         ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def apply_edit(teams, kind, edit):
+    """이름 팀 목록(teams)에 고친 내용 하나를 그대로 적용한다 (모둠 번호는 0부터)."""
+    if kind == 'move':
+        member = edit['member']
+        if member in teams[edit['from_team']]:
+            teams[edit['from_team']].remove(member)
+            teams[edit['to_team']].append(member)
+    elif kind == 'swap':
+        a, b = edit['a'], edit['b']
+        for team in teams:
+            for i, member in enumerate(team):
+                if member == a:
+                    team[i] = b
+                elif member == b:
+                    team[i] = a
+    elif kind == 'team_swap':
+        i, j = edit['from_team'], edit['to_team']
+        teams[i], teams[j] = teams[j], teams[i]
+    else:
+        raise ValueError(f'알 수 없는 기록 종류입니다: {kind}')
+    return teams
+
+def _row_to_entry(row):
+    entry_id, room, created_at, kind, seed, key, base_id, data = row
+    entry = {
+        'id': entry_id,
+        'room': room,
+        'created_at': created_at,
+        'kind': kind,
+        **json.loads(data)
+    }
+    if seed is not None:
+        entry['seed'] = seed
+    if base_id is not None:
+        entry['base_id'] = base_id
+    return entry
+
+class HistoryStore:
+    """방별 배치 기록. 기록 하나를 더하는 일은 INSERT 한 번이다.
+
+    연결은 프로세스마다 처음 쓸 때 열므로(serve.py가 fork한 워커도 각자 연다)
+    파일은 여러 프로세스가 함께 쓸 수 있다 (WAL 모드). 요청 스레드는 쉬는 연결을
+    하나씩 빌려 쓰므로(없으면 새로 연다) 여러 방의 기록 읽기는 서로 기다리지 않고,
+    쓰기만 SQLite의 쓰기 잠금으로 한 번에 하나씩 된다.
+    """
+
+    def __init__(self, path='history.sqlite3'):
+        self.path = path
+        self._idle = []           # 이 프로세스에서 열어 둔, 지금 안 쓰는 연결들
+        self._pid = None
+        self._known_rosters = set()
+        self._lock = threading.Lock()  # _idle, _pid, _known_rosters만 지킨다
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(SCHEMA)
+        return connection
+
+    @contextmanager
+    def _connection(self):
+        """쉬는 연결 하나를 빌려 쓰고 돌려놓는다. 동시에 쓰는 스레드 수만큼만 열린다."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 전 부모의 연결은 닫지 않고 버린다
+                self._idle = []
+                self._pid = os.getpid()
+                self._known_rosters = set()
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._open()
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                if self._pid == os.getpid():
+                    self._idle.append(connection)
+
+    def _append(self, room, kind, data, seed=None, key=None, base_id=None, roster=None):
+        with self._connection() as connection:
+            with connection:
+                if base_id is not None and connection.execute(
+                    'SELECT 1 FROM history WHERE id = ? AND room = ? AND kind = ?', (base_id, room, ALLOCATION)
+                ).fetchone() is None:
+                    raise ValueError(f'이 방에 없는 배치 기록입니다: {base_id}')
+                if roster is not None and key not in self._known_rosters:
+                    connection.execute(
+                        'INSERT OR IGNORE INTO rosters (key, members, groups) VALUES (?, ?, ?)',
+                        (key, json.dumps(roster[0], ensure_ascii=False), json.dumps(roster[1], ensure_ascii=False))
+                    )
+                cursor = connection.execute(
+                    'INSERT INTO history (room, created_at, kind, seed, roster_key, base_id, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (room, time.time(), kind, seed, key, base_id,
+                     json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+                )
+        if roster is not None:
+            with self._lock:
+                self._known_rosters.add(key)
+        return cursor.lastrowid
+
+    def append_allocation(self, room, members, groups, options, seed, conflicts, id_teams=None):
+        """배치 하나를 기록하고 기록 ID를 돌려준다.
+
+        members, groups는 배치에 쓴 표준 형태(normalize_roster)여야 한다.
+        시드로 다시 만들 수 없는 배치(중간에 멈춘 배치, 시간 제한 탐색)는
+        id_teams(멤버 번호 팀 목록)를 함께 넘겨 그대로 남긴다.
+        """
+        data = {'options': options, 'conflicts': conflicts}
+        if id_teams is not None:
+            data['teams'] = id_teams
+        key = roster_key(members, groups)
+        return self._append(room, ALLOCATION, data, seed=seed, key=key, roster=(members, groups))
+
+    def append_edit(self, room, kind, edit, base_id=None):
+        """고친 내용 하나를 기록한다. base_id는 고친 배치의 기록 ID.
+
+        base_id가 같은 방(room)의 배치 기록이 아니면 ValueError를 던진다.
+        """
+        if kind not in EDIT_FIELDS:
+            raise ValueError(f'알 수 없는 기록 종류입니다: {kind}')
+        missing = [field for field in EDIT_FIELDS[kind] if edit.get(field) is None]
+        if missing:
+            raise ValueError(f'{kind} 기록에 필요한 값이 없습니다: {", ".join(missing)}')
+        edit = {field: edit[field] for field in EDIT_FIELDS[kind]}
+        return self._append(room, kind, edit, base_id=base_id)
+
+    def query(self, room, limit=50, before=None, since=None, until=None, seed=None, kind=None):
+        """최신 기록부터 limit개와, 다음 쪽을 가져올 before 값(없으면 None)을 돌려준다.
+
+        쪽 나누기는 기록 ID 기준(before보다 작은 ID)이라 기록이 늘어도 쪽이 밀리지 않는다.
+        since/until은 유닉스 시각(초)이다.
+        """
+        limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+        clauses = ['room = ?']
+        params = [room]
+        for clause, value in (('id < ?', before), ('created_at >= ?', since),
+                              ('created_at < ?', until), ('seed = ?', seed), ('kind = ?', kind)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        with self._connection() as connection:
+            rows = connection.execute(
+                'SELECT id, room, created_at, kind, seed, roster_key, base_id, data FROM history '
+                f'WHERE {" AND ".join(clauses)} ORDER BY id DESC LIMIT ?',
+                params + [limit + 1]
+            ).fetchall()
+        entries = [_row_to_entry(row) for row in rows[:limit]]
+        next_before = entries[-1]['id'] if len(rows) > limit else None
+        return entries, next_before
+
+    def get(self, entry_id):
+        """기록 하나. 없으면 None."""
+        with self._connection() as connection:
+            row = connection.execute(
+                'SELECT id, room, created_at, kind, seed, roster_key, base_id, data FROM history WHERE id = ?',
+                (entry_id,)
+            ).fetchone()
+        return None if row is None else _row_to_entry(row)
+
+    def replay_plan(self, entry_id):
+        """기록 시점의 배치를 다시 만드는 데 필요한 것: (배치 기록, (멤버, 그룹), 고친 내용 목록).
+
+        고친 내용 기록이면 그 기록까지의 고친 내용을 순서대로 돌려준다. 없는 기록이면 None.
+        고친 내용은 배치 기록과 같은 방의 것만 쓴다.
+        """
+        entry = self.get(entry_id)
+        if entry is None:
+            return None
+        base_id = entry_id if entry['kind'] == ALLOCATION else entry.get('base_id')
+        if base_id is None:
+            return None
+        with self._connection() as connection:
+            base_row = connection.execute(
+                'SELECT id, room, created_at, kind, seed, roster_key, base_id, data FROM history WHERE id = ?',
+                (base_id,)
+            ).fetchone()
+            if base_row is None or base_row[1] != entry['room']:
+                return None
+            roster_row = connection.execute(
+                'SELECT members, groups FROM rosters WHERE key = ?', (base_row[5],)
+            ).fetchone()
+            edit_rows = connection.execute(
+                'SELECT id, room, created_at, kind, seed, roster_key, base_id, data FROM history '
+                'WHERE base_id = ? AND room = ? AND id <= ? ORDER BY id',
+                (base_id, base_row[1], entry_id)
+            ).fetchall()
+        roster = (json.loads(roster_row[0]), json.loads(roster_row[1]))
+        return _row_to_entry(base_row), roster, [_row_to_entry(row) for row in edit_rows]
+
+    def close(self):
+        """쉬고 있는 연결을 닫는다. 빌려 간 연결은 돌려받은 뒤 다시 쓰인다."""
+        with self._lock:
+            idle = self._idle if self._pid == os.getpid() else []
+            self._idle = []
+        for connection in idle:
+            connection.close()
@@ -0,0 +1,85 @@
+"""
+배치 결과 캐시
+같은 명단/그룹/옵션/시드로 들어온 배치 요청의 응답을 재사용한다.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_roster(members, groups):
+    """명단과 그룹을 순서와 상관없는 표준 형태로 바꾼다.
+
+    같은 사람들이면 입력 순서가 달라도 같은 배치가 나오도록, 캐시 키를 만들 때와
+    배치를 실행할 때 모두 이 형태를 쓴다.
+    """
+    members = sorted(member.strip() for member in members if member.strip())
+    groups = {
+        group_name.strip(): sorted(member.strip() for member in group_members if member.strip())
+        for group_name, group_members in sorted((groups or {}).items())
+    }
+    return members, {name: group_members for name, group_members in groups.items() if group_members}
+
+def allocation_cache_key(members, groups, group_sizes, options):
+    """(명단, 그룹, 모둠 크기, 배치 옵션)의 내용으로 만든 캐시 키 (sha256)."""
+    payload = json.dumps(
+        {
+            'members': members,
+            'groups': groups,
+            'group_sizes': group_sizes,
+            'options': options
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """크기와 유효 시간(TTL)이 정해진 LRU 캐시. 여러 스레드에서 함께 써도 된다."""
+
+    def __init__(self, max_size=256, ttl_seconds=600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # 키 → (저장 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """값을 돌려준다. 없거나 만료됐으면 None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """저장된 결과를 모두 버린다 (명단/그룹이 바뀌었을 때)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
@@ -0,0 +1,133 @@
+"""
+방(교실/동아리)별 명단 관리
+서버 하나가 방 여러 개의 명단을 함께 다룬다. 방마다 명단 저장소(RosterStore)와
+배치 결과 캐시(ResultCache)를 따로 두고, 오래 안 쓴 방은 메모리에서 내린다.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from roster_store import RosterStore
+from result_cache import ResultCache
+
+# 방 이름을 주지 않은 요청(/api/members 등)이 쓰는 방
+DEFAULT_ROOM = 'default'
+
+# 방 ID는 디렉터리 이름으로 쓰이므로 안전한 문자만 허용한다
+ROOM_ID_PATTERN = re.compile(r'[\w-]{1,64}')
+
+class RoomNotFound(KeyError):
+    """쓸 수 없는 방 ID"""
+
+class Room:
+    """방 하나의 명단 저장소와 결과 캐시"""
+
+    def __init__(self, room_id, store, cache):
+        self.id = room_id
+        self.store = store
+        self.cache = cache
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """밀린 명단 쓰기를 마친다."""
+        self.store.close()
+
+class RoomRegistry:
+    """방 ID → Room. 처음 쓸 때 저장소에서 읽어 오고, max_rooms개를 넘으면
+    가장 오래 안 쓴 방부터 내린다(LRU). 기본 방은 내리지 않는다.
+
+    목록 잠금은 방을 찾을 때만 잡고, 읽기/쓰기/배치는 방마다 따로 잠그므로
+    서로 다른 방의 요청은 서로 기다리지 않는다. 내린 방의 밀린 쓰기는 목록 잠금
+    밖에서 마치되, 그동안 같은 방을 찾는 요청은 쓰기가 끝난 뒤에 다시 읽어 온다.
+    """
+
+    def __init__(self, base_dir='rooms', max_rooms=256, default_store=None, default_cache=None,
+                 cache_size=32, cache_ttl=600):
+        self.base_dir = base_dir
+        self.max_rooms = max_rooms
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.default = Room(
+            DEFAULT_ROOM,
+            default_store if default_store is not None else RosterStore(),
+            default_cache if default_cache is not None else ResultCache(cache_size, cache_ttl)
+        )
+        self._rooms = OrderedDict()
+        self._closing = {}  # 내리는 중인 방 ID → 밀린 쓰기를 마치면 set되는 Event
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def room_path(self, room_id):
+        return os.path.join(self.base_dir, room_id)
+
+    def get(self, room_id=DEFAULT_ROOM):
+        """방을 돌려준다. 메모리에 없으면 저장소에서 (처음 읽을 때) 불러온다."""
+        if room_id == DEFAULT_ROOM:
+            self.default.last_used = time.monotonic()
+            return self.default
+        if not ROOM_ID_PATTERN.fullmatch(room_id or ''):
+            raise RoomNotFound(room_id)
+
+        evicted = []
+        while True:
+            with self._lock:
+                closing = self._closing.get(room_id)
+                if closing is None:
+                    room = self._load(room_id, evicted)
+                    break
+            # 내리는 중인 방을 바로 다시 읽으면 아직 안 쓴 변경을 놓친다
+            closing.wait()
+
+        # 내린 방의 쓰기 마무리는 목록 잠금 밖에서
+        for old_room in evicted:
+            try:
+                old_room.close()
+            finally:
+                with self._lock:
+                    self._closing.pop(old_room.id).set()
+        return room
+
+    def _load(self, room_id, evicted):
+        """메모리의 방, 없으면 새로 읽은 방 (목록 잠금을 잡은 채로 부른다).
+        넘친 방은 evicted에 담고 _closing에 올린다."""
+        room = self._rooms.get(room_id)
+        if room is None:
+            directory = self.room_path(room_id)
+            room = Room(
+                room_id,
+                RosterStore(os.path.join(directory, 'members.txt'), os.path.join(directory, 'groups.txt')),
+                ResultCache(self.cache_size, self.cache_ttl)
+            )
+            self._rooms[room_id] = room
+            self.loads += 1
+            while len(self._rooms) > self.max_rooms:
+                old_room = self._rooms.popitem(last=False)[1]
+                self._closing[old_room.id] = threading.Event()
+                evicted.append(old_room)
+                self.evictions += 1
+        else:
+            self._rooms.move_to_end(room_id)
+        room.last_used = time.monotonic()
+        return room
+
+    def close_all(self):
+        """모든 방의 밀린 쓰기를 마친다 (서버 종료 때)."""
+        with self._lock:
+            rooms = list(self._rooms.values())
+            closing = list(self._closing.values())
+        for room in rooms + [self.default]:
+            room.close()
+        for event in closing:
+            event.wait()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': len(self._rooms),
+                'max_rooms': self.max_rooms,
+                'loads': self.loads,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,259 @@
+"""
+명단/그룹 저장소
+members.txt, groups.txt를 한 번만 읽어 두고 요청마다 다시 파싱하지 않는다.
+"""
+import os
+import tempfile
+import threading
+import time
+
+from seat_allocation import load_members, load_groups, Roster
+from result_cache import normalize_roster
+
+GROUPS_FILE_HEADER = (
+    "# 그룹 설정 파일\n"
+    "# 같은 그룹의 멤버들은 가능한 한 다른 모둠에 배치됩니다.\n"
+    "# 형식: 각 줄에 그룹명:멤버1,멤버2,멤버3 형식으로 작성\n"
+    "# '#'으로 시작하는 줄은 주석입니다.\n\n"
+)
+
+def _file_signature(path):
+    """파일이 바뀌었는지 확인할 (수정 시각, 크기). 파일이 없으면 None."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def format_members_file(members):
+    return "".join(f"{member.strip()}\n" for member in members)
+
+def format_groups_file(groups):
+    lines = [GROUPS_FILE_HEADER]
+    for group_name, group_members in groups.items():
+        if group_members:
+            lines.append(f"{group_name}:{','.join(group_members)}\n")
+    return "".join(lines)
+
+def _current_umask():
+    # umask는 바꿔 봐야 읽을 수 있으므로 (스레드가 뜨기 전인) 가져올 때 한 번만 읽는다
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+_UMASK = _current_umask()
+
+def _file_mode(path):
+    """바꿔 쓸 파일의 권한. 있으면 원래 권한, 없으면 open()으로 새로 만들 때와 같은 0o666 & ~umask."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+def atomic_write(path, text):
+    """임시 파일에 쓰고 fsync한 뒤 이름을 바꿔서, 중간에 끊겨도 파일이 잘리지 않게 쓴다.
+    
+    mkstemp는 임시 파일을 0600으로 만들므로, 이름을 바꾸기 전에 원래 파일 권한으로 맞춘다.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, _file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    # 이름 바꾸기 자체도 디스크에 남도록 디렉터리를 fsync (지원하는 OS에서만)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+class RosterStore:
+    """명단/그룹과 거기서 만든 표준 형태(정렬된 명단, Roster)를 메모리에 두는 저장소.
+
+    읽을 때마다 os.stat으로 파일의 수정 시각과 크기만 확인해서, 밖에서 파일을
+    고쳤을 때만 다시 읽는다. 이 저장소를 통해 쓴 내용은 다시 읽지 않는다.
+    
+    쓰기는 메모리에 바로 반영하고, 파일에는 백그라운드 스레드가 flush_delay초
+    동안 몰려온 변경을 모아 한 번에 원자적으로(atomic_write) 쓴다.
+    flush_delay가 None이면 쓰기 요청 안에서 바로 파일에 쓴다.
+    """
+
+    def __init__(self, members_path="members.txt", groups_path="groups.txt", flush_delay=0.2):
+        self.members_path = members_path
+        self.groups_path = groups_path
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._pending = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()  # 파일 쓰기는 한 번에 하나씩
+        self._dirty = set()                  # 아직 파일에 안 쓴 것: 'members', 'groups'
+        self._writing = set()                # 지금 파일에 쓰고 있는 것
+        self._flusher = None
+        self._closed = False
+        self._members_signature = object()  # 처음에는 반드시 읽도록
+        self._groups_signature = object()
+        self._members = []
+        self._groups = {}
+        self._derived = {}
+        self.version = 0  # 내용이 바뀔 때마다 1씩 증가
+
+    def _revalidate(self):
+        # 아직 파일에 안 썼거나 쓰는 중인 변경이 있으면 메모리 쪽이 최신이다
+        pending = self._dirty | self._writing
+        members_signature = _file_signature(self.members_path)
+        if 'members' not in pending and members_signature != self._members_signature:
+            self._members = load_members(self.members_path) if members_signature else []
+            self._members_signature = members_signature
+            self._changed()
+
+        groups_signature = _file_signature(self.groups_path)
+        if 'groups' not in pending and groups_signature != self._groups_signature:
+            self._groups = load_groups(self.groups_path) if groups_signature else {}
+            self._groups_signature = groups_signature
+            self._changed()
+
+    def _changed(self):
+        self._derived = {}
+        self.version += 1
+
+    def members(self):
+        """멤버 목록 (복사본)"""
+        with self._lock:
+            self._revalidate()
+            return list(self._members)
+
+    def groups(self):
+        """그룹 정보 (복사본)"""
+        with self._lock:
+            self._revalidate()
+            return {name: list(group_members) for name, group_members in self._groups.items()}
+
+    def snapshot(self):
+        """(멤버 목록, 그룹 정보, 버전)을 한 번에 읽는다."""
+        with self._lock:
+            self._revalidate()
+            groups = {name: list(group_members) for name, group_members in self._groups.items()}
+            return list(self._members), groups, self.version
+
+    def normalized(self):
+        """배치에 쓰는 표준 형태 (정렬된 멤버 목록, 정렬된 그룹 정보, Roster).
+
+        내용이 바뀔 때까지 재사용하므로 요청마다 정렬하거나 ID를 다시 매기지 않는다.
+        돌려준 값은 여러 요청이 함께 쓰므로 고치면 안 된다.
+        """
+        with self._lock:
+            self._revalidate()
+            if 'normalized' not in self._derived:
+                members, groups = normalize_roster(self._members, self._groups)
+                self._derived['normalized'] = (members, groups, Roster(members, groups))
+            return self._derived['normalized']
+
+    def roster(self):
+        """정수 ID / 비트마스크로 바꾼 Roster (내용이 바뀔 때까지 재사용)"""
+        return self.normalized()[2]
+
+    def set_members(self, members):
+        """멤버 목록을 바꾼다. 파일에는 곧(또는 flush 때) 쓴다."""
+        self.set_roster(members=members)
+
+    def set_groups(self, groups):
+        """그룹 정보를 바꾼다. 파일에는 곧(또는 flush 때) 쓴다."""
+        self.set_roster(groups=groups)
+
+    def set_roster(self, members=None, groups=None):
+        """멤버 목록과 그룹 정보를 한 번에 바꾼다 (None인 쪽은 그대로)."""
+        if members is not None:
+            members = [member.strip() for member in members if member.strip()]
+        if groups is not None:
+            groups = {
+                name.strip(): [member.strip() for member in group_members if member.strip()]
+                for name, group_members in groups.items()
+            }
+            groups = {name: group_members for name, group_members in groups.items() if group_members}
+        
+        with self._lock:
+            if members is not None:
+                self._members = members
+                self._dirty.add('members')
+            if groups is not None:
+                self._groups = groups
+                self._dirty.add('groups')
+            self._changed()
+            # 닫힌 뒤(방이 메모리에서 내려간 뒤 등)의 쓰기는 바로 파일에 쓴다
+            write_now = self.flush_delay is None or self._closed
+            
+            if not write_now:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                    self._flusher.start()
+                self._pending.notify()
+        
+        if write_now:
+            self.flush()
+
+    def flush(self):
+        """밀린 변경을 지금 파일에 쓴다."""
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                self._writing = dirty
+                contents = []
+                if 'members' in dirty:
+                    contents.append(('members', self.members_path, format_members_file(self._members)))
+                if 'groups' in dirty:
+                    contents.append(('groups', self.groups_path, format_groups_file(self._groups)))
+            
+            written = []
+            try:
+                for kind, path, text in contents:
+                    atomic_write(path, text)
+                    written.append(kind)
+            finally:
+                with self._lock:
+                    self._writing = set()
+                    # 쓰지 못한 것은 다음에 다시 쓴다
+                    self._dirty.update(kind for kind, _, _ in contents if kind not in written)
+                    # 쓰는 동안 또 바뀌지 않았다면 방금 쓴 파일을 기준으로 삼는다
+                    if 'members' in written and 'members' not in self._dirty:
+                        self._members_signature = _file_signature(self.members_path)
+                    if 'groups' in written and 'groups' not in self._dirty:
+                        self._groups_signature = _file_signature(self.groups_path)
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._pending.wait()
+                if self._closed:
+                    return
+            
+            # 잠깐 기다리며 뒤따라오는 쓰기를 모은다
+            time.sleep(self.flush_delay)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"명단 저장 오류: {e}")
+                time.sleep(1)
+
+    def close(self):
+        """밀린 변경을 쓰고 백그라운드 스레드를 멈춘다."""
+        with self._lock:
+            self._closed = True
+            self._pending.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
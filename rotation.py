@@ -0,0 +1,152 @@
+"""
+여러 회차 자리 배치 (로테이션)
+매주 같은 명단으로 자리를 바꿀 때, 지난 회차에 같은 모둠이었던 사람끼리 다시
+만나는 횟수를 줄인다. 그룹 분리 조건이 먼저이고, 그다음이 같은 짝 반복이다.
+"""
+import math
+from array import array
+
+from seat_allocation import (
+    Roster, calculate_group_sizes, make_rng, allocate_roster
+)
+
+class PairHistory:
+    """두 멤버가 같은 모둠에 앉았던 횟수를 상삼각 배열 하나에 담는다.
+
+    멤버 n명이면 n(n-1)/2칸만 쓰고, 한 회차를 더할 때는 그 회차의 모둠 안
+    쌍만 늘린다. 멤버 하나를 모둠에 넣는 비용은 모둠 인원만큼만 본다.
+    """
+
+    def __init__(self, num_members):
+        self.num_members = num_members
+        self.counts = array('I', bytes(4 * (num_members * (num_members - 1) // 2)))
+        self.rounds = 0
+
+    def _index(self, a, b):
+        if a > b:
+            a, b = b, a
+        return a * self.num_members - a * (a + 1) // 2 + (b - a - 1)
+
+    def count(self, a, b):
+        """a와 b가 같은 모둠이었던 횟수"""
+        if a == b:
+            return 0
+        return self.counts[self._index(a, b)]
+
+    def add_teams(self, id_teams):
+        """한 회차의 배치를 기록한다 (모둠 안의 쌍만 갱신)."""
+        for team in id_teams:
+            for i, a in enumerate(team):
+                for b in team[i + 1:]:
+                    if a != b:
+                        self.counts[self._index(a, b)] += 1
+        self.rounds += 1
+
+    def cost(self, member_id, team):
+        """member_id가 team 사람들과 전에 같은 모둠이었던 횟수의 합"""
+        return sum(self.count(member_id, other) for other in team if other != member_id)
+
+    def repeats(self, id_teams):
+        """배치 안의 쌍들이 전에 만난 횟수의 합 (0이면 모두 처음 만나는 짝)"""
+        return sum(
+            self.count(a, b)
+            for team in id_teams
+            for i, a in enumerate(team)
+            for b in team[i + 1:]
+        )
+
+    @classmethod
+    def from_rounds(cls, roster, rounds):
+        """이름으로 된 지난 배치 목록으로 기록을 만든다 (명단에 없는 이름은 무시)."""
+        history = cls(len(roster))
+        for teams in rounds:
+            history.add_teams(roster.to_ids(teams))
+        return history
+
+def swap_repeat_delta(history, occupancy, a, b):
+    """a와 b의 모둠을 맞바꿀 때 반복 짝 수 변화량 (두 모둠 인원만큼만 본다)"""
+    if occupancy.member_team[a] == occupancy.member_team[b]:
+        return 0
+    team_a = occupancy.teams[occupancy.member_team[a]]
+    team_b = occupancy.teams[occupancy.member_team[b]]
+    delta = 0
+    for other in team_a:
+        if other != a:
+            delta += history.count(b, other) - history.count(a, other)
+    for other in team_b:
+        if other != b:
+            delta += history.count(a, other) - history.count(b, other)
+    return delta
+
+def plan_round(roster, group_sizes, history, max_iterations=20000, group_weight=None, rng=None):
+    """지난 기록(history)을 보고 한 회차를 배치한다. (ID 팀 목록, 충돌 수, 반복 짝 수)를 돌려준다.
+
+    그리디 배치(allocate_roster)에서 시작해 두 멤버 맞바꾸기(시뮬레이티드 어닐링)로
+    '그룹 충돌 × group_weight + 반복 짝 수'를 줄인다. 가장 좋은 배치는
+    (충돌 수, 반복 짝 수) 순서로 고르므로 충돌 수는 그리디 결과보다 늘지 않는다.
+    """
+    rng = make_rng(rng)
+    occupancy = allocate_roster(roster, group_sizes, rng)
+    if group_weight is None:
+        # 맞바꾸기 한 번으로 반복 짝 수가 바뀔 수 있는 최대치보다 크게
+        group_weight = 2 * max(group_sizes, default=1) * max(history.rounds, 1) + 1
+
+    conflicts = occupancy.conflicts()
+    repeats = history.repeats(occupancy.teams)
+    best = (conflicts, repeats)
+    swaps_since_best = []
+
+    members = list(range(len(roster)))
+    if len(occupancy.teams) < 2 or history.rounds == 0 and conflicts == 0:
+        return occupancy.teams, conflicts, repeats
+
+    start_temperature = 2.0
+    for iteration in range(max_iterations):
+        if best == (0, 0):
+            break
+        temperature = start_temperature * (1 - iteration / max_iterations) + 1e-3
+
+        a = rng.choice(members)
+        b = rng.choice(members)
+        if occupancy.member_team[a] == occupancy.member_team[b]:
+            continue
+
+        conflict_delta = occupancy.swap_delta(a, b)
+        repeat_delta = swap_repeat_delta(history, occupancy, a, b)
+        delta = group_weight * conflict_delta + repeat_delta
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            occupancy.swap(a, b)
+            conflicts += conflict_delta
+            repeats += repeat_delta
+            swaps_since_best.append((a, b))
+            if (conflicts, repeats) < best:
+                best = (conflicts, repeats)
+                swaps_since_best.clear()
+
+    # 가장 좋았던 배치로 되돌린다
+    for a, b in reversed(swaps_since_best):
+        occupancy.swap(a, b)
+    return occupancy.teams, best[0], best[1]
+
+def plan_rotation(members, groups=None, rounds=1, history=None, max_iterations=20000, rng=None):
+    """rounds회차를 한꺼번에 짠다. history에 지난 배치(이름 팀 목록의 목록)를 주면 이어서 짠다.
+
+    회차마다 그 전까지의 기록을 보고 배치한 뒤 기록에 더하므로, 각 회차의
+    점수 계산은 전체 기록을 다시 훑지 않는다.
+    """
+    rng = make_rng(rng)
+    roster = Roster(members, groups or {})
+    group_sizes = calculate_group_sizes(len(members))
+    pair_history = PairHistory.from_rounds(roster, history or [])
+
+    planned = []
+    for _ in range(rounds):
+        id_teams, conflicts, repeats = plan_round(roster, group_sizes, pair_history, max_iterations, rng=rng)
+        id_teams = [team.copy() for team in id_teams]
+        pair_history.add_teams(id_teams)
+        planned.append({
+            'teams': roster.to_names(id_teams),
+            'conflicts': conflicts,
+            'repeat_pairs': repeats
+        })
+    return planned
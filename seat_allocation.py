@@ -1,6 +1,14 @@
 import random
 import math
+import time
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np  # 여러 배치를 한꺼번에 채점할 때만 필요
+except ImportError:
+    np = None
 
 def load_members(filename="members.txt"):
     """멤버 파일에서 이름 목록을 읽어온다."""
@@ -65,164 +73,1003 @@ def load_groups(filename="groups.txt"):
         print(f"그룹 파일 '{filename}'을 찾을 수 없습니다. 그룹 제약 조건 없이 진행합니다.")
         return {}
 
-def calculate_group_conflicts(groups, team_assignment):
-    """그룹 제약 조건 위반 수를 계산한다."""
-    conflicts = 0
-    
+def build_member_group_index(groups):
+    """멤버 → 소속 그룹 집합 인덱스를 만든다. 배치 한 번에 한 번만 만들어 재사용한다."""
+    index = defaultdict(set)
+    if not groups:
+        return index
     for group_name, group_members in groups.items():
-        # 각 팀별로 이 그룹의 멤버가 몇 명씩 있는지 계산
-        team_counts = defaultdict(int)
         for member in group_members:
-            for team_idx, team in enumerate(team_assignment):
-                if member in team:
-                    team_counts[team_idx] += 1
-                    break
+            index[member].add(group_name)
+    return index
+
+def make_rng(rng=None):
+    """rng 인자를 난수 생성기로 바꾼다.
+    
+    None이면 전역 random 모듈, 정수면 그 시드로 만든 random.Random,
+    random.Random이면 그대로 쓴다. 호출마다 따로 만든 Random을 넘기면
+    여러 스레드에서 동시에 배치해도 서로 영향을 주지 않는다.
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, random.Random) or rng is random:
+        return rng
+    return random.Random(rng)
+
+class Roster:
+    """멤버를 정수 ID로, 그룹 소속을 비트마스크로 바꾼 배치용 표현.
+    
+    같은 이름의 멤버가 여러 명이어도 각자 다른 ID를 받는다. 파이썬 int는
+    길이 제한이 없으므로 그룹이 많아도 비트마스크 하나로 표현된다.
+    """
+    
+    def __init__(self, members, groups=None):
+        groups = groups or {}
+        self.names = list(members)              # ID → 이름
+        self.group_names = list(groups.keys())  # 비트 위치 → 그룹명
+        
+        self.ids_by_name = defaultdict(list)
+        for member_id, name in enumerate(self.names):
+            self.ids_by_name[name].append(member_id)
+        
+        self.group_members = []                 # 그룹 → 멤버 ID 목록
+        member_groups = [[] for _ in self.names]
+        for bit, group_name in enumerate(self.group_names):
+            member_ids = []
+            # 그룹 안의 중복 이름은 한 번만 센다 (로스터에 없는 이름은 무시)
+            for name in dict.fromkeys(groups[group_name]):
+                for member_id in self.ids_by_name.get(name, ()):
+                    member_ids.append(member_id)
+                    member_groups[member_id].append(bit)
+            self.group_members.append(member_ids)
+        
+        # ID → 소속 그룹 번호 목록 (소속 수만큼만 만든다)
+        self.member_groups = [tuple(bits) for bits in member_groups]
+        self._masks = None
+    
+    @property
+    def masks(self):
+        """ID → 소속 그룹 비트마스크. 그룹이 많으면 마스크가 커지므로 처음 쓸 때 만든다."""
+        if self._masks is None:
+            self._masks = [sum(1 << bit for bit in bits) for bits in self.member_groups]
+        return self._masks
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def shares_group(self, a, b):
+        """두 멤버가 같은 그룹에 속하는지 AND 한 번으로 확인한다."""
+        return bool(self.masks[a] & self.masks[b])
+    
+    def to_names(self, id_teams):
+        """ID로 된 팀 목록을 이름 목록으로 바꾼다."""
+        return [[self.names[member_id] for member_id in team] for team in id_teams]
+    
+    def to_ids(self, teams):
+        """이름으로 된 팀 목록을 ID 목록으로 바꾼다. 같은 이름은 앞의 ID부터 차례로 쓴다."""
+        remaining = {name: iter(ids) for name, ids in self.ids_by_name.items()}
+        id_teams = []
+        for team in teams:
+            id_team = []
+            for name in team:
+                member_id = next(remaining.get(name, iter(())), None)
+                if member_id is not None:
+                    id_team.append(member_id)
+            id_teams.append(id_team)
+        return id_teams
+
+class TeamOccupancy:
+    """모둠별 그룹 인원 수 counts[team][group]을 배치와 함께 갱신하는 구조.
+    
+    멤버를 모둠에 넣을 때의 충돌 비용은 그 멤버가 속한 그룹들의 칸을 더한 값이라
+    모둠 인원이 늘어나도 비용 계산이 느려지지 않는다.
+    """
+    
+    def __init__(self, roster, group_sizes):
+        self.roster = roster
+        self.capacities = list(group_sizes)
+        self.teams = [[] for _ in group_sizes]
+        self.counts = [[0] * len(roster.group_names) for _ in group_sizes]
+        self.group_teams = [set() for _ in roster.group_names]  # 그룹 → 그 그룹 멤버가 있는 모둠들
+        self.member_team = [None] * len(roster)                  # 멤버 ID → 모둠
+    
+    @classmethod
+    def from_teams(cls, roster, id_teams):
+        """이미 만들어진 ID 팀 목록으로 점유 현황을 만든다."""
+        occupancy = cls(roster, [len(team) for team in id_teams])
+        for team_idx, team in enumerate(id_teams):
+            for member_id in team:
+                occupancy.add(member_id, team_idx)
+        return occupancy
+    
+    def is_full(self, team):
+        return len(self.teams[team]) >= self.capacities[team]
+    
+    def cost(self, member_id, team):
+        """member_id를 team에 넣을 때 겹치는 (팀원, 그룹) 쌍의 수."""
+        row = self.counts[team]
+        return sum(row[group] for group in self.roster.member_groups[member_id])
+    
+    def add(self, member_id, team):
+        self.teams[team].append(member_id)
+        self._enter(member_id, team)
+    
+    def remove(self, member_id):
+        """멤버를 모둠에서 뺀다."""
+        team = self.member_team[member_id]
+        self.teams[team].remove(member_id)
+        self._leave(member_id, team)
+    
+    def _enter(self, member_id, team):
+        self.member_team[member_id] = team
+        row = self.counts[team]
+        for group in self.roster.member_groups[member_id]:
+            if row[group] == 0:
+                self.group_teams[group].add(team)
+            row[group] += 1
+    
+    def _leave(self, member_id, team):
+        self.member_team[member_id] = None
+        row = self.counts[team]
+        for group in self.roster.member_groups[member_id]:
+            row[group] -= 1
+            if row[group] == 0:
+                self.group_teams[group].discard(team)
+    
+    def swap_delta(self, a, b):
+        """두 멤버의 모둠을 맞바꿀 때 충돌 수 변화량. 두 멤버의 그룹만 본다."""
+        team_a, team_b = self.member_team[a], self.member_team[b]
+        if team_a == team_b:
+            return 0
         
-        # 같은 팀에 2명 이상 있으면 위반
-        for count in team_counts.values():
-            if count > 1:
-                conflicts += count - 1  # n명이 같은 팀에 있으면 n-1개의 위반
+        changes = defaultdict(int)
+        for group in self.roster.member_groups[a]:
+            changes[team_a, group] -= 1
+            changes[team_b, group] += 1
+        for group in self.roster.member_groups[b]:
+            changes[team_b, group] -= 1
+            changes[team_a, group] += 1
+        
+        delta = 0
+        for (team, group), change in changes.items():
+            if change:
+                count = self.counts[team][group]
+                delta += max(count + change - 1, 0) - max(count - 1, 0)
+        return delta
+    
+    def swap(self, a, b):
+        """두 멤버의 자리를 맞바꾼다 (모둠 안에서의 순서는 유지)."""
+        team_a, team_b = self.member_team[a], self.member_team[b]
+        if team_a == team_b:
+            return
+        self.teams[team_a][self.teams[team_a].index(a)] = b
+        self.teams[team_b][self.teams[team_b].index(b)] = a
+        self._leave(a, team_a)
+        self._leave(b, team_b)
+        self._enter(a, team_b)
+        self._enter(b, team_a)
+    
+    def move_delta(self, member_id, team):
+        """멤버를 다른 모둠으로 옮길 때 충돌 수 변화량. 그 멤버의 그룹만 본다."""
+        current = self.member_team[member_id]
+        if current == team:
+            return 0
+        delta = 0
+        for group in self.roster.member_groups[member_id]:
+            if self.counts[current][group] > 1:
+                delta -= 1
+            if self.counts[team][group] > 0:
+                delta += 1
+        return delta
+    
+    def move(self, member_id, team):
+        """멤버를 다른 모둠의 끝자리로 옮긴다."""
+        if self.member_team[member_id] == team:
+            return
+        self.remove(member_id)
+        self.add(member_id, team)
+    
+    def swap_teams(self, i, j):
+        """두 모둠의 자리를 통째로 바꾼다 (충돌 수는 그대로)."""
+        if i == j:
+            return
+        self.teams[i], self.teams[j] = self.teams[j], self.teams[i]
+        self.counts[i], self.counts[j] = self.counts[j], self.counts[i]
+        self.capacities[i], self.capacities[j] = self.capacities[j], self.capacities[i]
+        touched = set()
+        for team in (i, j):
+            for member_id in self.teams[team]:
+                self.member_team[member_id] = team
+                touched.update(self.roster.member_groups[member_id])
+        for group in touched:
+            for team in (i, j):
+                if self.counts[team][group]:
+                    self.group_teams[group].add(team)
+                else:
+                    self.group_teams[group].discard(team)
+    
+    def is_conflicted(self, member_id):
+        """같은 모둠에 같은 그룹 사람이 또 있는지 (화면의 충돌 자리 표시)."""
+        row = self.counts[self.member_team[member_id]]
+        return any(row[group] > 1 for group in self.roster.member_groups[member_id])
+    
+    def team_costs(self, member_id):
+        """비용이 0이 아닌 모둠들만 {모둠: 비용}으로 돌려준다.
+        
+        멤버의 그룹마다 그 그룹이 있는 모둠을 다 보므로, 모둠마다 퍼진 큰 그룹이 있으면
+        O(모둠 수)까지 걸린다.
+        """
+        costs = defaultdict(int)
+        for group in self.roster.member_groups[member_id]:
+            for team in self.group_teams[group]:
+                costs[team] += self.counts[team][group]
+        return costs
+    
+    def conflicts(self):
+        """그룹 제약 조건 위반 수 (같은 모둠의 같은 그룹 n명 → n-1개)."""
+        return sum(count - 1 for row in self.counts for count in row if count > 1)
+    
+    def distribution(self, group):
+        """그룹 하나의 모둠별 인원 수."""
+        return [row[group] for row in self.counts]
+    
+    def group_distributions(self):
+        """그룹명 → 모둠별 인원 수."""
+        return {
+            group_name: self.distribution(group)
+            for group, group_name in enumerate(self.roster.group_names)
+        }
+
+class SparseTeamOccupancy(TeamOccupancy):
+    """모둠 × 그룹 표에서 멤버가 있는 칸만 두는 TeamOccupancy.
+    
+    모둠 수 × 그룹 수가 커서(큰 행사) 빈 칸까지 다 만들 수 없을 때 쓴다.
+    메모리는 모둠 수 + 소속 수에 비례한다.
+    """
+    
+    def __init__(self, roster, group_sizes):
+        self.roster = roster
+        self.capacities = list(group_sizes)
+        self.teams = [[] for _ in group_sizes]
+        self.counts = [defaultdict(int) for _ in group_sizes]
+        self.group_teams = [set() for _ in roster.group_names]
+        self.member_team = [None] * len(roster)
+    
+    def cost(self, member_id, team):
+        row = self.counts[team]
+        return sum(row.get(group, 0) for group in self.roster.member_groups[member_id])
+    
+    def conflicts(self):
+        return sum(count - 1 for row in self.counts for count in row.values() if count > 1)
+    
+    def distribution(self, group):
+        return [row.get(group, 0) for row in self.counts]
+
+class OpenTeams:
+    """자리가 남은 모둠을 라운드로빈 순서로 찾는 구조 (경로 압축한 '다음 빈 모둠' 포인터)."""
+    
+    def __init__(self, group_sizes):
+        self.num_teams = len(group_sizes)
+        # next_open[t]: t 이후 처음 자리가 남은 모둠을 가리키는 포인터 (num_teams는 끝 표시)
+        self.next_open = list(range(self.num_teams + 1))
+        self.open_count = 0
+        for team, size in enumerate(group_sizes):
+            if size > 0:
+                self.open_count += 1
+            else:
+                self.next_open[team] = team + 1
+    
+    def _find(self, team):
+        root = team
+        while self.next_open[root] != root:
+            root = self.next_open[root]
+        while self.next_open[team] != root:
+            self.next_open[team], team = root, self.next_open[team]
+        return root
+    
+    def close(self, team):
+        """가득 찬 모둠을 후보에서 뺀다."""
+        if self.next_open[team] == team:
+            self.next_open[team] = team + 1
+            self.open_count -= 1
+    
+    def next_from(self, start):
+        """start부터 라운드로빈으로 처음 나오는 빈 모둠 (빈 모둠이 하나는 있어야 한다)."""
+        team = self._find(start)
+        if team == self.num_teams:
+            team = self._find(0)
+        return team
     
+    def first_from(self, start, skip=()):
+        """start부터 라운드로빈으로 돌며 skip에 없는 첫 빈 모둠. 없으면 None."""
+        # skip에 든 모둠 수보다 많이 볼 필요는 없다
+        for _ in range(min(len(skip) + 1, self.open_count)):
+            team = self.next_from(start)
+            if team not in skip:
+                return team
+            start = (team + 1) % self.num_teams
+        return None
+
+def count_roster_conflicts(roster, id_teams):
+    """ID로 된 배치의 그룹 제약 조건 위반 수를 계산한다."""
+    conflicts = 0
+    for team in id_teams:
+        seen = 0
+        for member_id in team:
+            mask = roster.masks[member_id]
+            # 이미 팀에 있는 그룹과 겹치는 비트 하나가 위반 하나
+            conflicts += (mask & seen).bit_count()
+            seen |= mask
     return conflicts
 
-def find_member_groups(member, groups):
+def _intern_teams(groups, team_assignment, roster=None):
+    """이름 팀 목록을 (Roster, ID 팀 목록)으로 바꾼다."""
+    if roster is not None:
+        return roster, roster.to_ids(team_assignment)
+    
+    # 팀 순서대로 ID를 매기면 팀 목록을 그대로 ID 구간으로 쓸 수 있다
+    roster = Roster([member for team in team_assignment for member in team], groups)
+    id_teams = []
+    start = 0
+    for team in team_assignment:
+        id_teams.append(range(start, start + len(team)))
+        start += len(team)
+    return roster, id_teams
+
+def calculate_group_conflicts(groups, team_assignment, roster=None):
+    """그룹 제약 조건 위반 수를 계산한다."""
+    if not groups:
+        return 0
+    
+    roster, id_teams = _intern_teams(groups, team_assignment, roster)
+    return count_roster_conflicts(roster, id_teams)
+
+def analyze_roster_conflicts(roster, id_teams):
+    """ID 배치의 충돌 수, 그룹별 분배, 충돌 쌍을 한 번에 계산한다.
+    
+    멤버 → 모둠 표를 한 번 만든 뒤 그룹 소속을 한 번씩만 훑는다.
+    """
+    member_team = [None] * len(roster)
+    for team_idx, team in enumerate(id_teams):
+        for member_id in team:
+            member_team[member_id] = team_idx
+    
+    conflicts = 0
+    group_distributions = {}
+    conflict_pairs = []
+    
+    for group_name, group_member_ids in zip(roster.group_names, roster.group_members):
+        distribution = [0] * len(id_teams)
+        members_in_team = defaultdict(list)
+        for member_id in group_member_ids:
+            team_idx = member_team[member_id]
+            if team_idx is None:
+                continue  # 배치되지 않은 멤버
+            
+            name = roster.names[member_id]
+            # 같은 모둠에 먼저 온 같은 그룹 멤버와 한 쌍씩 충돌
+            for other in members_in_team[team_idx]:
+                conflict_pairs.append({
+                    'group': group_name,
+                    'team': team_idx,
+                    'members': [other, name]
+                })
+            if members_in_team[team_idx]:
+                conflicts += 1  # n명이 같은 팀에 있으면 n-1개의 위반
+            members_in_team[team_idx].append(name)
+            distribution[team_idx] += 1
+        group_distributions[group_name] = distribution
+    
+    return {
+        'conflicts': conflicts,
+        'group_distributions': group_distributions,
+        'conflict_pairs': conflict_pairs
+    }
+
+def analyze_group_conflicts(groups, team_assignment, roster=None):
+    """이름 배치의 충돌 수, 그룹별 분배(모둠별 인원 수), 충돌 쌍을 한 번에 계산한다."""
+    roster, id_teams = _intern_teams(groups or {}, team_assignment, roster)
+    return analyze_roster_conflicts(roster, id_teams)
+
+def find_member_groups(member, groups, index=None):
     """멤버가 속한 모든 그룹을 찾는다."""
+    if index is not None:
+        member_groups = index.get(member, ())
+        # 그룹 정의 순서를 유지한다
+        return [group_name for group_name in groups if group_name in member_groups]
+    
     member_groups = []
     for group_name, group_members in groups.items():
         if member in group_members:
             member_groups.append(group_name)
     return member_groups
 
-def count_same_group_members(member, team, groups):
-    """해당 팀에 있는 같은 그룹 멤버 수를 센다."""
+# index 없이 불린 count_same_group_members가 마지막으로 만든 (groups, 인덱스)
+_last_group_index = (None, None)
+
+def _member_group_index(groups):
+    """groups의 멤버 → 그룹 인덱스. 같은 groups 객체로 거듭 부르면 한 번만 만든다."""
+    global _last_group_index
+    cached_groups, index = _last_group_index
+    if cached_groups is not groups:
+        index = build_member_group_index(groups)
+        _last_group_index = (groups, index)
+    return index
+
+def count_same_group_members(member, team, groups, index=None):
+    """해당 팀에 있는 같은 그룹 멤버 수를 센다.
+    
+    index를 주지 않으면 groups 객체마다 한 번 만든 인덱스를 다시 쓴다. groups를
+    제자리에서 고친 뒤에는 build_member_group_index로 새로 만든 index를 넘긴다.
+    """
     if not team:
         return 0
     
-    member_groups = find_member_groups(member, groups)
+    if index is None:
+        index = _member_group_index(groups)
+    
+    member_groups = index.get(member)
     if not member_groups:
         return 0
     
     count = 0
     for team_member in team:
-        team_member_groups = find_member_groups(team_member, groups)
         # 공통 그룹이 있으면 같은 그룹
-        if any(group in member_groups for group in team_member_groups):
+        if not member_groups.isdisjoint(index.get(team_member, ())):
             count += 1
     
     return count
 
-def allocate_seats_with_groups(members, group_sizes, groups=None):
-    """그룹 제약 조건을 고려하여 멤버들을 그리디 + 라운드로빈으로 배치한다."""
+def allocate_seats_with_groups(members, group_sizes, groups=None, optimize_ms=0, rng=None):
+    """그룹 제약 조건을 고려하여 멤버들을 그리디 + 라운드로빈으로 배치한다.
+    
+    optimize_ms를 주면 맞바꾸기 탐색으로 충돌을 더 줄인다. optimize_ms는 시간이 아니라
+    탐색 예산이라 OPTIMIZE_ITERATIONS_PER_MS × optimize_ms번까지 반복한다.
+    rng에 random.Random이나 시드를 주면 전역 random 상태와 상관없이 재현된다.
+    """
+    rng = make_rng(rng)
     if not groups:
-        return allocate_seats(members, group_sizes)
+        return allocate_seats(members, group_sizes, rng)
     
+    # 이름은 입출력에서만 쓰고, 배치는 정수 ID로 한다
+    roster = Roster(members, groups)
+    occupancy = allocate_roster(roster, group_sizes, rng)
+    if optimize_ms:
+        optimize_allocation(occupancy, max_iterations=OPTIMIZE_ITERATIONS_PER_MS * optimize_ms, rng=rng)
+    return roster.to_names(occupancy.teams)
+
+def shuffle_roster(roster, rng=None):
+    """그룹 멤버끼리 연속되도록 섞은 멤버 ID 순서를 만든다."""
+    rng = make_rng(rng)
     # 그룹 기반 섞기: 그룹별로 연속 배치하여 라운드로빈 효과 극대화
     # 1. 그룹 순서를 랜덤하게 섞기
-    group_names = list(groups.keys())
-    random.shuffle(group_names)
+    group_order = list(range(len(roster.group_names)))
+    rng.shuffle(group_order)
     
     # 2. 각 그룹 내에서 멤버들을 섞고, 그룹 순서대로 연속 배치
     shuffled_members = []
     
     # 그룹에 속한 멤버들을 그룹별로 연속 배치
-    added_members = set()  # 이미 추가된 멤버 추적
+    added = [False] * len(roster)  # 이미 추가된 멤버 추적
     
-    for group_name in group_names:
-        group_members = groups[group_name].copy()
-        random.shuffle(group_members)
+    for group in group_order:
+        group_members = roster.group_members[group].copy()
+        rng.shuffle(group_members)
         # 중복 제거하며 추가
         for member in group_members:
-            if member not in added_members:
+            if not added[member]:
                 shuffled_members.append(member)
-                added_members.add(member)
+                added[member] = True
     
     # 그룹에 속하지 않은 멤버들을 마지막에 추가
-    ungrouped_members = []
-    for member in members:
-        if member not in added_members:  # 아직 추가되지 않은 멤버만
-            ungrouped_members.append(member)
-    random.shuffle(ungrouped_members)
+    ungrouped_members = [member for member in range(len(roster)) if not added[member]]
+    rng.shuffle(ungrouped_members)
     shuffled_members.extend(ungrouped_members)
     
+    return shuffled_members
+
+# 이 인원 이상이면 allocate_roster가 큰 명단용 배치(allocate_roster_large)를 쓴다
+LARGE_ROSTER_SIZE = 2000
+
+# allocate_roster_large가 비용 0인 모둠을 못 찾았을 때 다 살펴보는 (그룹, 모둠) 칸 수의 상한
+LARGE_SCAN_LIMIT = 4096
+
+def allocate_roster(roster, group_sizes, rng=None):
+    """Roster의 멤버 ID들을 그리디 + 라운드로빈으로 배치하고 TeamOccupancy를 돌려준다.
+    
+    멤버 하나를 놓는 시간은 그 멤버의 그룹들이 이미 퍼져 있는 모둠 수의 합에 비례한다
+    (team_costs). 그룹이 작으면 거의 상수지만, 모둠마다 퍼진 큰 그룹의 멤버는 O(모둠 수)라
+    최악에는 O(멤버 수 × 모둠 수)다. 모둠 비용이 멤버마다 그 멤버의 그룹 칸들을 더한
+    값이라 (비용, 모둠)으로 미리 정렬해 둘 수 없어서, 멤버당 O(log 모둠 수) 선택은 하지 않는다.
+    LARGE_ROSTER_SIZE명 이상이면 allocate_roster_large로 배치한다.
+    """
+    if len(roster) >= LARGE_ROSTER_SIZE:
+        return allocate_roster_large(roster, group_sizes, rng)
+    shuffled_members = shuffle_roster(roster, rng)
+    
+    # 팀 초기화 (모둠 × 그룹 인원 수를 함께 관리)
+    occupancy = TeamOccupancy(roster, group_sizes)
     
-    # 팀 초기화
-    teams = [[] for _ in group_sizes]
+    # 자리가 남은 모둠을 라운드로빈 순서로 바로 찾기 위한 구조
+    open_teams = OpenTeams(group_sizes)
     
     # 라운드로빈 시작 지점 초기화 (0모둠부터 시작)
     round_robin_start = 0
+    num_teams = len(group_sizes)
     
     for member in shuffled_members:
-        placed = False
-
-        for lap in range(len(shuffled_members)):
-            for i in range(len(group_sizes)):
-                team = (round_robin_start + i) % len(group_sizes)
-                
-                # 팀 용량 체크
-                if len(teams[team]) >= group_sizes[team]:
-                    continue
-                
-                count = count_same_group_members(member, teams[team], groups)
-                
-                if count <= lap:
-                    teams[team].append(member)
-                    # 다음 사람은 다음 팀부터 시작
-                    round_robin_start = (team + 1) % len(group_sizes)
-                    placed = True
-                    break
+        # 같은 그룹 멤버가 있는 모둠만 비용이 0보다 크다
+        costs = occupancy.team_costs(member)
+        
+        # 1. 라운드로빈 순서상 처음 나오는 비용 0인 빈 모둠
+        team = open_teams.first_from(round_robin_start, skip=costs)
+        
+        # 2. 없으면 (비용, 라운드로빈 거리)가 가장 작은 빈 모둠
+        #    (예전 lap 루프: lap = 0, 1, 2...마다 시작 지점부터 한 바퀴씩 도는 것과 같은 선택)
+        if team is None:
+            team = min(
+                (t for t in costs if not occupancy.is_full(t)),
+                key=lambda t: (costs[t], (t - round_robin_start) % num_teams),
+                default=None
+            )
+        if team is None:
+            break  # 남은 자리 없음
+        
+        occupancy.add(member, team)
+        if occupancy.is_full(team):
+            open_teams.close(team)
+        # 다음 사람은 다음 팀부터 시작
+        round_robin_start = (team + 1) % num_teams
+    
+    return occupancy
+
+def _worth_full_scan(occupancy, member_id, num_teams, scan_limit):
+    """비용 0인 모둠이 있을 수 있고, 그룹이 퍼진 모둠 수의 합이 scan_limit 이하인지.
+    
+    그룹 하나가 이미 모든 모둠에 있으면 어느 모둠도 비용이 0이 아니다.
+    """
+    footprint = 0
+    for group in occupancy.roster.member_groups[member_id]:
+        spread = len(occupancy.group_teams[group])
+        if spread >= num_teams:
+            return False
+        footprint += spread
+    return footprint <= scan_limit
 
-            if placed:
+def allocate_roster_large(roster, group_sizes, rng=None, probe_limit=None, scan_limit=LARGE_SCAN_LIMIT):
+    """큰 명단(수천~수십만 명)용 그리디 + 라운드로빈 배치. SparseTeamOccupancy를 돌려준다.
+    
+    allocate_roster와 같은 순서로 멤버를 놓고 같은 기준(라운드로빈 순서상 처음 나오는
+    비용 0인 빈 모둠, 없으면 (비용, 라운드로빈 거리)가 가장 작은 빈 모둠)으로 고른다.
+    먼저 라운드로빈 순서로 빈 모둠을 probe_limit개(기본: 모둠 수의 비트 수, 최소 8)까지
+    살펴보고, 거기서 비용 0인 모둠을 찾으면 그 모둠이 곧 allocate_roster의 선택이다.
+    
+    못 찾으면 allocate_roster처럼 멤버의 그룹이 있는 모둠을 다 본다(team_costs).
+    다만 그 그룹들이 퍼져 있는 모둠 수의 합이 scan_limit보다 크거나, 그룹 하나가
+    이미 모든 모둠에 있으면(모둠 수보다 큰 그룹처럼 비용 0인 모둠이 없는 경우)
+    살펴본 모둠 중 (비용, 거리)가 가장 작은 모둠으로 정한다. 그래서 그룹이 겹쳐도
+    모둠마다 빠짐없이 퍼진 그룹이 없는 명단이면 allocate_roster와 똑같은 배치가 나온다.
+    
+    시간은 멤버마다 O(probe_limit + min(그룹이 퍼진 모둠 수 합, scan_limit) + 그 멤버의
+    그룹 수)이고, 메모리는 O(모둠 수 + 멤버 수 + 소속 수)다.
+    """
+    shuffled_members = shuffle_roster(roster, rng)
+    occupancy = SparseTeamOccupancy(roster, group_sizes)
+    open_teams = OpenTeams(group_sizes)
+    num_teams = len(group_sizes)
+    if probe_limit is None:
+        probe_limit = max(8, num_teams.bit_length())
+    
+    round_robin_start = 0
+    for member in shuffled_members:
+        if open_teams.open_count == 0:
+            break  # 남은 자리 없음
+        
+        # 라운드로빈 순서로 빈 모둠을 보며 비용 0인 첫 모둠, 없으면 (비용, 거리)가 가장 작은 모둠
+        best = None
+        start = round_robin_start
+        for _ in range(min(probe_limit, open_teams.open_count)):
+            team = open_teams.next_from(start)
+            cost = occupancy.cost(member, team)
+            candidate = (cost, (team - round_robin_start) % num_teams, team)
+            if best is None or candidate < best:
+                best = candidate
+            if cost == 0:
                 break
+            start = (team + 1) % num_teams
+        
+        team = best[2]
+        if best[0] > 0 and _worth_full_scan(occupancy, member, num_teams, scan_limit):
+            # allocate_roster와 같은 선택: 처음 나오는 비용 0인 빈 모둠, 없으면 (비용, 거리)가 가장 작은 빈 모둠
+            costs = occupancy.team_costs(member)
+            team = open_teams.first_from(start, skip=costs)
+            if team is None:
+                team = min(
+                    (t for t in costs if not occupancy.is_full(t)),
+                    key=lambda t: (costs[t], (t - round_robin_start) % num_teams)
+                )
+        occupancy.add(member, team)
+        if occupancy.is_full(team):
+            open_teams.close(team)
+        round_robin_start = (team + 1) % num_teams
+    
+    return occupancy
+
+def conflict_lower_bound(roster, num_teams):
+    """그룹마다 비둘기집 원리로 구한 충돌 수의 하한.
+    
+    s명인 그룹은 모둠 수(num_teams)보다 많은 인원만큼은 반드시 겹친다.
+    """
+    return sum(max(0, len(members) - num_teams) for members in roster.group_members)
 
+# 중단 요청(should_stop)을 확인하는 간격 (반복/탐색 노드 수)
+STOP_CHECK_INTERVAL = 1024
 
+# 같은 시드면 같은 배치가 나오도록 맞바꾸기 탐색은 시간이 아닌 반복 횟수로 제한한다.
+# optimize_ms(탐색 예산) 1당 이만큼 반복한다.
+OPTIMIZE_ITERATIONS_PER_MS = 100
 
+def optimize_allocation(occupancy, time_limit_ms=None, max_iterations=None, rng=None,
+                        on_improve=None, should_stop=None):
+    """두 멤버 맞바꾸기(시뮬레이티드 어닐링)로 충돌 수를 줄인다.
+    
+    맞바꾸기의 충돌 변화량은 두 멤버의 그룹과 두 모둠의 점유 수만으로 계산한다.
+    시간(time_limit_ms)이나 반복 횟수(max_iterations)를 다 쓰거나, 충돌이
+    하한(conflict_lower_bound)에 닿거나, should_stop()이 참이면 멈춘다.
+    occupancy를 가장 좋은 배치로 바꿔 두고 그 충돌 수를 돌려준다.
+    on_improve(충돌 수, ID 팀 목록)는 최선이 나아질 때마다 불린다.
+    """
+    rng = make_rng(rng)
+    if time_limit_ms is None and max_iterations is None:
+        max_iterations = 20000
+    
+    roster = occupancy.roster
+    lower_bound = conflict_lower_bound(roster, len(occupancy.teams))
+    current = occupancy.conflicts()
+    best = current
+    swaps_since_best = []  # 가장 좋았던 배치로 되돌리기 위한 기록
+    
+    # 그룹에 속한 멤버만 움직여 볼 가치가 있다
+    grouped_members = [
+        member_id for member_id in range(len(roster))
+        if roster.member_groups[member_id] and occupancy.member_team[member_id] is not None
+    ]
+    placed_members = [
+        member_id for member_id in range(len(roster)) if occupancy.member_team[member_id] is not None
+    ]
+    if len(occupancy.teams) < 2 or not grouped_members or current <= lower_bound:
+        return current
+    
+    start_temperature = 1.0
+    deadline = None if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+    iteration = 0
     
-    # # 라운드로빈 시작 위치를 회전시키기 위한 변수
-    # round_robin_start = 0
-    # 
-    # # 각 멤버를 배치
-    # for member_idx, member in enumerate(shuffled_members):
-    #     placed = False
-    #     
-    #     # 이번 멤버의 라운드로빈 시작 위치 계산 (매번 회전)
-    #     start_team = (round_robin_start + member_idx) % len(teams)
-    #     
-    #     # 라운드별 시도 (0라운드: 충돌 0개 허용, 1라운드: 1개 허용, ...)
-    #     for allowed_conflicts in range(len(teams)):
-    #         
-    #         # 시작 팀부터 라운드로빈으로 모든 팀 시도
-    #         for team_offset in range(len(teams)):
-    #             team_idx = (start_team + team_offset) % len(teams)
-    #             
-    #             # 팀 용량 초과 체크
-    #             if len(teams[team_idx]) >= group_sizes[team_idx]:
-    #                 continue
-    #             
-    #             # 충돌 계산
-    #             conflicts = count_same_group_members(member, teams[team_idx], groups)
-    #             
-    #             # 허용 범위 내면 배치
-    #             if conflicts <= allowed_conflicts:
-    #                 teams[team_idx].append(member)
-    #                 placed = True
-    #                 break
-    #         
-    #         if placed:
-    #             break
-    #     
-    #     # 배치 실패시 강제 배치 (이론적으로 발생하지 않아야 함)
-    #     if not placed:
-    #         for team_idx, team in enumerate(teams):
-    #             if len(team) < group_sizes[team_idx]:
-    #                 teams[team_idx].append(member)
-    #                 break
+    while best > lower_bound:
+        if max_iterations is not None and iteration >= max_iterations:
+            break
+        
+        # 쓴 예산 비율에 맞춰 온도를 낮춘다
+        progress = 0.0 if max_iterations is None else iteration / max_iterations
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            progress = max(progress, 1 - remaining / (time_limit_ms / 1000))
+        temperature = start_temperature * (1 - progress) + 1e-3
+        iteration += 1
+        if should_stop is not None and iteration % STOP_CHECK_INTERVAL == 0 and should_stop():
+            break
+        
+        a = rng.choice(grouped_members)
+        b = rng.choice(placed_members)
+        if occupancy.member_team[a] == occupancy.member_team[b]:
+            continue
+        
+        delta = occupancy.swap_delta(a, b)
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            occupancy.swap(a, b)
+            current += delta
+            swaps_since_best.append((a, b))
+            if current < best:
+                best = current
+                swaps_since_best.clear()
+                if on_improve is not None:
+                    on_improve(best, occupancy.teams)
     
+    # 가장 좋았던 배치로 되돌린다 (맞바꾸기는 같은 쌍을 다시 바꾸면 원래대로)
+    for a, b in reversed(swaps_since_best):
+        occupancy.swap(a, b)
+    return best
+
+def _fill_ungrouped(roster, teams, group_sizes):
+    """그룹 멤버만 놓인 ID 팀 목록의 빈자리를 그룹 없는 멤버로 채운 복사본"""
+    teams = [team.copy() for team in teams]
+    placed = {member_id for team in teams for member_id in team}
+    ungrouped = (member_id for member_id in range(len(roster)) if member_id not in placed)
+    for team, size in zip(teams, group_sizes):
+        while len(team) < size:
+            team.append(next(ungrouped))
     return teams
 
-def allocate_seats(members, group_sizes):
+def solve_exact(roster, group_sizes, time_limit_ms=2000, rng=None, on_improve=None, should_stop=None):
+    """분기 한정법으로 충돌 수가 최소인 배치를 찾는다.
+    
+    - 그룹에 속한 멤버만 분기하고, 그룹 없는 멤버는 마지막에 빈자리를 채운다.
+    - 같은 크기의 빈 모둠은 서로 바꿔도 같은 배치라 그중 하나만 시도한다.
+    - 그룹마다 '남은 인원 - 그 그룹 멤버가 없는 빈 모둠 수'만큼은 반드시
+      더 겹치므로(비둘기집 원리) 이 하한이 지금까지의 최선 이상이면 가지를 친다.
+    
+    시간(time_limit_ms)이 다 되거나 should_stop()이 참이면 그때까지의 최선과
+    하한과의 차이(gap)를 돌려준다. on_improve(충돌 수, ID 팀 목록)는 최선이
+    나아질 때마다 불린다.
+    """
+    deadline = time.perf_counter() + time_limit_ms / 1000
+    num_teams = len(group_sizes)
+    
+    # 초기 해: 그리디 결과
+    incumbent = allocate_roster(roster, group_sizes, rng)
+    best = incumbent.conflicts()
+    best_teams = [team.copy() for team in incumbent.teams]
+    root_bound = conflict_lower_bound(roster, num_teams)
+    if on_improve is not None:
+        on_improve(best, best_teams)
+    
+    # 소속 그룹이 많은 멤버부터 정한다
+    order = sorted(
+        (member_id for member_id in range(len(roster)) if roster.member_groups[member_id]),
+        key=lambda member_id: -len(roster.member_groups[member_id])
+    )
+    remaining = [len(members) for members in roster.group_members]
+    occupancy = TeamOccupancy(roster, group_sizes)
+    
+    def candidates(member_id):
+        tried_empty = set()
+        result = []
+        for team in range(num_teams):
+            if occupancy.is_full(team):
+                continue
+            if not occupancy.teams[team]:
+                # 대칭 제거: 같은 크기의 빈 모둠은 하나만
+                if occupancy.capacities[team] in tried_empty:
+                    continue
+                tried_empty.add(occupancy.capacities[team])
+            row = occupancy.counts[team]
+            delta = sum(1 for group in roster.member_groups[member_id] if row[group])
+            result.append((delta, team))
+        result.sort()
+        return result
+    
+    def bound(current):
+        open_teams = sum(1 for team in range(num_teams) if not occupancy.is_full(team))
+        extra = 0
+        for group, left in enumerate(remaining):
+            if left:
+                used = sum(1 for team in occupancy.group_teams[group] if not occupancy.is_full(team))
+                extra += max(0, left - (open_teams - used))
+        return current + extra
+    
+    timed_out = False
+    nodes = 0
+    if order and best > root_bound:
+        current = 0
+        frames = [candidates(order[0])]
+        positions = [0]
+        deltas = []
+        
+        def undo(member_id):
+            occupancy.remove(member_id)
+            for group in roster.member_groups[member_id]:
+                remaining[group] += 1
+            return deltas.pop()
+        
+        while frames:
+            nodes += 1
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+            if should_stop is not None and nodes % STOP_CHECK_INTERVAL == 0 and should_stop():
+                timed_out = True
+                break
+            
+            depth = len(frames) - 1
+            if positions[depth] >= len(frames[depth]):
+                frames.pop()
+                positions.pop()
+                if depth > 0:
+                    current -= undo(order[depth - 1])
+                continue
+            
+            delta, team = frames[depth][positions[depth]]
+            positions[depth] += 1
+            if current + delta >= best:
+                positions[depth] = len(frames[depth])  # 후보가 비용순이라 뒤는 볼 필요 없음
+                continue
+            
+            member_id = order[depth]
+            occupancy.add(member_id, team)
+            for group in roster.member_groups[member_id]:
+                remaining[group] -= 1
+            deltas.append(delta)
+            current += delta
+            
+            if depth + 1 == len(order):
+                # 그룹 멤버를 모두 배치: 새 최선
+                best = current
+                best_teams = [team.copy() for team in occupancy.teams]
+                if on_improve is not None:
+                    on_improve(best, _fill_ungrouped(roster, best_teams, group_sizes))
+                current -= undo(member_id)
+                if best <= root_bound:
+                    break
+                continue
+            
+            if bound(current) >= best:
+                current -= undo(member_id)
+                continue
+            
+            frames.append(candidates(order[depth + 1]))
+            positions.append(0)
+        
+        # 그룹 없는 멤버로 빈자리 채우기
+        best_teams = _fill_ungrouped(roster, best_teams, group_sizes)
+    
+    optimal = not timed_out or best <= root_bound
+    return {
+        'teams': best_teams,
+        'conflicts': best,
+        'lower_bound': best if optimal else root_bound,
+        'gap': 0 if optimal else best - root_bound,
+        'optimal': optimal
+    }
+
+def allocate_seats_exact(members, group_sizes, groups=None, time_limit_ms=2000, rng=None):
+    """충돌 수가 최소인 배치를 찾는다. 시간 안에 증명하지 못하면 최선 배치와 gap을 준다."""
+    roster = Roster(members, groups)
+    result = solve_exact(roster, group_sizes, time_limit_ms, rng)
+    result['teams'] = roster.to_names(result['teams'])
+    return result
+
+def _run_seeds(members, group_sizes, groups, seeds, optimize_iterations):
+    """작업 프로세스에서 시드 여러 개로 배치하고 (충돌 수, 시드, ID 팀 목록)을 돌려준다."""
+    roster = Roster(members, groups)
+    results = []
+    for seed in seeds:
+        rng = random.Random(seed)
+        occupancy = allocate_roster(roster, group_sizes, rng)
+        conflicts = occupancy.conflicts()
+        if optimize_iterations:
+            conflicts = optimize_allocation(occupancy, max_iterations=optimize_iterations, rng=rng)
+        results.append((conflicts, seed, occupancy.teams))
+    return results
+
+def best_of(n, members, group_sizes, groups, workers=None, seed=None,
+            optimize_iterations=0, executor=None):
+    """시드만 다른 배치 n개를 프로세스 풀에서 돌려 충돌이 가장 적은 배치를 고른다.
+    
+    각 실행의 시드는 기준 시드(seed)에서 정해지고 충돌이 같으면 시드가 작은 쪽을
+    고르므로, 같은 기준 시드면 작업 프로세스 수와 상관없이 같은 결과가 나온다.
+    최적화도 시간이 아닌 반복 횟수(optimize_iterations)로 제한해 재현성을 지킨다.
+    executor를 주면 미리 띄워 둔 풀을 그대로 쓴다.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    seed_generator = random.Random(seed)
+    seeds = [seed_generator.getrandbits(32) for _ in range(n)]
+    
+    if not groups:
+        return {
+            'teams': allocate_seats(members, group_sizes, random.Random(seeds[0])),
+            'conflicts': 0,
+            'seed': seeds[0],
+            'master_seed': seed,
+            'runs': 1
+        }
+    
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    try:
+        num_workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, math.ceil(n / num_workers))
+        futures = [
+            executor.submit(
+                _run_seeds, members, group_sizes, groups,
+                seeds[start:start + chunk_size], optimize_iterations
+            )
+            for start in range(0, n, chunk_size)
+        ]
+        best = min(
+            (result for future in futures for result in future.result()),
+            key=lambda result: (result[0], result[1])
+        )
+    finally:
+        if owns_executor:
+            executor.shutdown()
+    
+    conflicts, best_seed, id_teams = best
+    return {
+        'teams': Roster(members, groups).to_names(id_teams),
+        'conflicts': conflicts,
+        'seed': best_seed,
+        'master_seed': seed,
+        'runs': n
+    }
+
+def _canonical_teams(id_teams):
+    """모둠 순서와 모둠 안의 순서를 무시한 배치의 표준 형태 (중복 판별용)"""
+    return tuple(sorted(tuple(sorted(team)) for team in id_teams))
+
+def iter_allocations(n, members, group_sizes, groups, seed=None, optimize_iterations=0,
+                     unique=False, executor=None, workers=None, chunk_size=8, max_attempts=None):
+    """시드만 다른 배치 후보 n개를 만들어지는 대로 하나씩 내놓는다.
+    
+    (순번, 시드, 충돌 수, 이름 팀 목록)을 기준 시드(seed)에서 정해진 순서대로
+    내놓으므로, 같은 기준 시드면 작업 프로세스 수와 상관없이 같은 후보가 나온다.
+    executor를 주면 작업 프로세스 수의 두 배까지만 묶음을 미리 맡겨 두고, 앞의
+    묶음이 끝나는 대로 내보내므로 n이 커도 메모리에 쌓이는 결과는 일정하다.
+    unique=True면 이미 나온 배치와 같은 배치는 건너뛰고 새 시드로 다시 시도한다
+    (최대 max_attempts번, 기본은 n의 4배).
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    seed_generator = random.Random(seed)
+    if max_attempts is None:
+        max_attempts = n * 4 if unique else n
+    roster = Roster(members, groups or {})
+    
+    def run_chunk(seeds):
+        if not groups:
+            return [
+                (0, chunk_seed, roster.to_ids(allocate_seats(members, group_sizes, random.Random(chunk_seed))))
+                for chunk_seed in seeds
+            ]
+        if executor is None:
+            return _run_seeds(members, group_sizes, groups, seeds, optimize_iterations)
+        return executor.submit(_run_seeds, members, group_sizes, groups, seeds, optimize_iterations)
+    
+    in_flight = max(1, 2 * (workers or os.cpu_count() or 1)) if executor is not None and groups else 1
+    pending = []
+    attempts = 0
+    produced = 0
+    seen = set()
+    
+    try:
+        while produced < n:
+            # 모자란 만큼 새 시드 묶음을 맡겨 둔다
+            while len(pending) < in_flight and attempts < max_attempts:
+                size = min(chunk_size, max_attempts - attempts)
+                if not unique:
+                    size = min(size, n - produced - sum(len(seeds) for seeds, _ in pending))
+                if size <= 0:
+                    break
+                seeds = [seed_generator.getrandbits(32) for _ in range(size)]
+                attempts += size
+                pending.append((seeds, run_chunk(seeds)))
+            if not pending:
+                return
+            
+            _, chunk = pending.pop(0)
+            results = chunk if isinstance(chunk, list) else chunk.result()
+            for conflicts, run_seed, id_teams in results:
+                if produced >= n:
+                    break
+                if unique:
+                    canonical = _canonical_teams(id_teams)
+                    if canonical in seen:
+                        continue
+                    seen.add(canonical)
+                yield produced, run_seed, conflicts, roster.to_names(id_teams)
+                produced += 1
+    finally:
+        # 중간에 그만두면(연결이 끊기는 등) 아직 시작하지 않은 묶음은 취소한다
+        for _, chunk in pending:
+            if not isinstance(chunk, list):
+                chunk.cancel()
+
+def allocate_seats(members, group_sizes, rng=None):
     """멤버들을 모둠에 랜덤하게 배치한다."""
     shuffled_members = members.copy()
-    random.shuffle(shuffled_members)
+    make_rng(rng).shuffle(shuffled_members)
     
     groups = []
     start_idx = 0
@@ -234,7 +1081,77 @@ def allocate_seats(members, group_sizes):
     
     return groups
 
-def print_allocation(teams, groups=None):
+def _require_numpy():
+    if np is None:
+        raise ImportError("배치 일괄 채점에는 numpy가 필요합니다: pip install numpy")
+
+def roster_incidence(roster):
+    """멤버 × 그룹 소속 행렬을 희소(COO) 형태 (멤버 ID 배열, 그룹 번호 배열)로 만든다."""
+    _require_numpy()
+    member_ids = [member_id for members in roster.group_members for member_id in members]
+    group_ids = [group for group, members in enumerate(roster.group_members) for _ in members]
+    return np.asarray(member_ids, dtype=np.int64), np.asarray(group_ids, dtype=np.int64)
+
+def teams_to_assignment(id_teams, num_members):
+    """ID 팀 목록을 멤버별 모둠 번호 배열로 바꾼다 (배치 안 된 멤버는 -1)."""
+    _require_numpy()
+    assignment = np.full(num_members, -1, dtype=np.int64)
+    for team_idx, team in enumerate(id_teams):
+        assignment[list(team)] = team_idx
+    return assignment
+
+def random_assignments(group_sizes, count, seed=None):
+    """모둠 크기를 지키는 무작위 배치 count개를 K×n 모둠 번호 배열로 만든다."""
+    _require_numpy()
+    generator = np.random.default_rng(seed)
+    labels = np.repeat(np.arange(len(group_sizes)), group_sizes)
+    return generator.permuted(np.tile(labels, (count, 1)), axis=1)
+
+def score_assignments(assignments, incidence, num_teams, num_groups, max_cells=1 << 24):
+    """K개의 배치(K×n 모둠 번호 배열)의 그룹 제약 조건 위반 수를 한꺼번에 계산한다.
+    
+    후보마다 (모둠, 그룹) 칸의 인원 수를 bincount로 세고, 위반 수는
+    '배치된 소속 수 - 사람이 있는 칸 수'로 구한다. 메모리가 max_cells 칸을
+    넘지 않도록 후보를 나눠서 처리한다.
+    """
+    _require_numpy()
+    assignments = np.atleast_2d(np.asarray(assignments, dtype=np.int64))
+    member_ids, group_ids = incidence
+    num_candidates = assignments.shape[0]
+    conflicts = np.zeros(num_candidates, dtype=np.int64)
+    if member_ids.size == 0 or num_candidates == 0:
+        return conflicts
+    
+    cells_per_candidate = num_teams * num_groups
+    chunk = max(1, max_cells // cells_per_candidate)
+    for start in range(0, num_candidates, chunk):
+        teams = assignments[start:start + chunk, member_ids]  # 후보 × 소속
+        placed = teams >= 0
+        cell = teams * num_groups + group_ids
+        # 후보마다 칸 번호를 겹치지 않게 밀어서 한 번의 bincount로 센다
+        cell = cell + (np.arange(teams.shape[0])[:, None] * cells_per_candidate)
+        counts = np.bincount(
+            cell[placed], minlength=teams.shape[0] * cells_per_candidate
+        ).reshape(teams.shape[0], cells_per_candidate)
+        conflicts[start:start + chunk] = placed.sum(axis=1) - np.count_nonzero(counts, axis=1)
+    
+    return conflicts
+
+def best_random_allocation(members, group_sizes, groups, count=1000, seed=None):
+    """무작위 배치 count개를 한꺼번에 채점해서 충돌이 가장 적은 배치를 고른다."""
+    roster = Roster(members, groups)
+    assignments = random_assignments(group_sizes, count, seed)
+    scores = score_assignments(
+        assignments, roster_incidence(roster), len(group_sizes), len(roster.group_names)
+    )
+    best = assignments[int(np.argmin(scores))]
+    
+    id_teams = [[] for _ in group_sizes]
+    for member_id, team_idx in enumerate(best.tolist()):
+        id_teams[team_idx].append(member_id)
+    return roster.to_names(id_teams)
+
+def print_allocation(teams, groups=None, roster=None):
     """배치 결과를 출력한다."""
     print("=" * 50)
     print("🪑 동아리 자리 배치 결과 🪑")
@@ -249,7 +1166,8 @@ def print_allocation(teams, groups=None):
     
     # 그룹 제약 조건 위반 분석
     if groups:
-        conflicts = calculate_group_conflicts(groups, teams)
+        analysis = analyze_group_conflicts(groups, teams, roster)
+        conflicts = analysis['conflicts']
         if conflicts == 0:
             print("🎉 모든 그룹 제약 조건이 완벽히 지켜졌습니다!")
         else:
@@ -257,19 +1175,12 @@ def print_allocation(teams, groups=None):
             
         # 위반 상세 분석
         print("\n📊 그룹별 배치 현황:")
-        for group_name, group_members in groups.items():
-            team_distribution = defaultdict(list)
-            for member in group_members:
-                for team_idx, team in enumerate(teams):
-                    if member in team:
-                        team_distribution[team_idx + 1].append(member)
-                        break
-            
+        for group_name, distribution in analysis['group_distributions'].items():
             print(f"  🏷️  {group_name}: ", end="")
-            for team_num, members in team_distribution.items():
-                if len(members) > 1:
-                    print(f"{team_num}모둠({len(members)}명) ", end="")
-                else:
+            for team_num, count in enumerate(distribution, 1):
+                if count > 1:
+                    print(f"{team_num}모둠({count}명) ", end="")
+                elif count == 1:
                     print(f"{team_num}모둠 ", end="")
             print()
     
@@ -301,14 +1212,15 @@ def main():
     teams = allocate_seats_with_groups(members, group_sizes, groups)
     
     # 결과 출력
-    print_allocation(teams, groups)
+    roster = Roster(members, groups)
+    print_allocation(teams, groups, roster)
     
     # 다시 섞기 옵션
     while True:
         retry = input("\n🔄 다시 섞으시겠습니까? (y/n): ").lower()
         if retry == 'y':
             teams = allocate_seats_with_groups(members, group_sizes, groups)
-            print_allocation(teams, groups)
+            print_allocation(teams, groups, roster)
         elif retry == 'n':
             print("👋 프로그램을 종료합니다.")
             break
@@ -0,0 +1,221 @@
+"""
+운영용 서버 실행
+명단, 인덱스, 정적 파일을 한 번 읽어 둔 뒤 워커 프로세스 N개를 fork한다.
+워커들은 읽어 둔 상태를 copy-on-write로 함께 쓰고, 같은 소켓에서 요청을
+받아 요청마다 스레드로 처리한다. 라우트는 web_server.py 그대로다.
+
+    python serve.py --workers 4 --port 8000
+    python web_server.py serve --workers 4
+"""
+import argparse
+import gc
+import http.client
+import importlib
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from flask import Response, request, stream_with_context
+from werkzeug.serving import make_server
+
+# 라우트와 상태를 가진 web_server 모듈 (main이 정한다).
+# python web_server.py serve로 띄우면 이미 __main__으로 올라온 모듈을 그대로 받으므로
+# web_server를 다시 import해 앱, 방 목록, 기록 저장소가 두 벌 생기지 않는다.
+web_server = None
+
+# 워커가 너무 빨리 죽으면 다시 띄우기 전에 잠깐 쉰다 (초)
+RESPAWN_BACKOFF_SECONDS = 1.0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="자리 배치 서버 (운영 모드)")
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1)),
+                        help="요청을 받을 워커 프로세스 수")
+    return parser.parse_args(argv)
+
+def listen(host, port, backlog=1024):
+    """워커들이 함께 쓸 listen 소켓"""
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def preload():
+    """fork 전에 워커들이 함께 쓸 읽기 전용 상태를 만든다."""
+    web_server.roster_store.normalized()
+    web_server.preload_static_assets()
+    # 읽어 둔 객체를 GC가 건드려 페이지가 복사되지 않도록 고정
+    gc.collect()
+    gc.freeze()
+
+def make_request_forwarder(worker_index, job_ports):
+    """다른 워커가 만든 작업/편집 중인 배치에 대한 요청을 그 워커의 내부 포트로 넘기는 함수.
+
+    작업 ID와 배치 ID는 'w<워커 번호>-'로 시작하므로 그 번호로 주인 워커를 찾는다.
+    """
+
+    def forward(owned_id):
+        owner, _, _ = owned_id.partition('-')
+        if not owner.startswith('w') or not owner[1:].isdigit():
+            return None
+        owner = int(owner[1:])
+        if owner == worker_index or owner >= len(job_ports):
+            return None
+
+        headers = {}
+        for header in ('Last-Event-ID', 'Content-Type'):
+            if header in request.headers:
+                headers[header] = request.headers[header]
+        connection = http.client.HTTPConnection('127.0.0.1', job_ports[owner])
+        try:
+            connection.request(request.method, request.full_path.rstrip('?'),
+                               body=request.get_data() or None, headers=headers)
+            upstream = connection.getresponse()
+        except OSError:
+            connection.close()
+            return None
+
+        def body():
+            try:
+                while True:
+                    chunk = upstream.read1(65536)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                connection.close()
+
+        response = Response(stream_with_context(body()), status=upstream.status,
+                            content_type=upstream.getheader('Content-Type'))
+        for header in ('Cache-Control', 'X-Accel-Buffering'):
+            if upstream.getheader(header):
+                response.headers[header] = upstream.getheader(header)
+        return response
+
+    return forward
+
+def run_worker(worker_index, sock, job_sockets):
+    """워커 프로세스: 공용 소켓과 자기 내부 소켓에서 요청을 받는다."""
+    job_ports = [job_socket.getsockname()[1] for job_socket in job_sockets]
+    web_server.worker_id_prefix = f'w{worker_index}-'
+    web_server.job_manager.id_prefix = web_server.worker_id_prefix
+    web_server.request_forwarder = make_request_forwarder(worker_index, job_ports)
+
+    # 다른 워커의 내부 소켓은 닫는다
+    for index, job_socket in enumerate(job_sockets):
+        if index != worker_index:
+            job_socket.close()
+
+    # 배치용 프로세스 풀은 요청 스레드가 생기기 전에 만들어, 스레드가 도는 중에 fork하지 않는다
+    web_server.get_allocation_pool()
+
+    host = sock.getsockname()[0]
+    servers = [
+        make_server(host, 0, web_server.app, threaded=True, fd=sock.fileno()),
+        make_server('127.0.0.1', 0, web_server.app, threaded=True, fd=job_sockets[worker_index].fileno())
+    ]
+    for server in servers:
+        server.daemon_threads = True
+
+    def stop(signum, frame):
+        # serve_forever를 도는 스레드 밖에서 멈춰야 한다
+        threading.Thread(target=lambda: [server.shutdown() for server in servers]).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    threading.Thread(target=servers[1].serve_forever, daemon=True).start()
+    servers[0].serve_forever()
+
+    # 밀린 명단 쓰기와 작업을 정리하고 끝낸다.
+    # spawn이 os._exit로 끝내 atexit가 돌지 않으므로 모든 방과 기록 저장소를 여기서 닫는다.
+    web_server.job_manager.shutdown()
+    web_server.rooms.close_all()
+    web_server.history_store.close()
+    if web_server._allocation_pool is not None:
+        web_server._allocation_pool.shutdown()
+
+def spawn(worker_index, sock, job_sockets):
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(worker_index, sock, job_sockets)
+        except BaseException as e:
+            print(f"워커 {worker_index} 오류: {e}")
+            code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(code)
+    return pid
+
+def main(argv=None, server_module=None):
+    """운영 모드 진입점. server_module을 주지 않으면 web_server를 import한다."""
+    global web_server
+    if not hasattr(os, 'fork'):
+        raise SystemExit("운영 모드는 fork를 지원하는 OS(리눅스, macOS)에서만 쓸 수 있습니다.")
+
+    web_server = server_module if server_module is not None else importlib.import_module('web_server')
+    args = parse_args(argv)
+    num_workers = max(1, args.workers)
+
+    # 배치용 프로세스 풀은 워커마다 따로 생기므로, 따로 정하지 않았다면 CPU를 나눠 쓴다
+    if 'ALLOCATION_WORKERS' not in os.environ:
+        web_server.ALLOCATION_WORKERS = max(1, (os.cpu_count() or 1) // num_workers)
+
+    sock = listen(args.host, args.port)
+    # 작업(/api/jobs) 요청을 주인 워커로 넘길 때 쓰는 워커별 내부 소켓
+    job_sockets = [listen('127.0.0.1', 0) for _ in range(num_workers)]
+    preload()
+
+    print("🚀 Smart Seat Allocation 서버 시작 (운영 모드)")
+    print(f"📱 http://localhost:{sock.getsockname()[1]} — 워커 {num_workers}개")
+    print("-" * 50)
+    sys.stdout.flush()
+
+    workers = {}  # pid → (워커 번호, 시작 시각)
+    for worker_index in range(num_workers):
+        workers[spawn(worker_index, sock, job_sockets)] = (worker_index, time.monotonic())
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # 죽은 워커는 다시 띄운다
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        if pid not in workers:
+            continue
+        worker_index, started = workers.pop(pid)
+        if stopping:
+            continue
+        print(f"⚠️  워커 {worker_index} 종료됨 (상태 {status}), 다시 시작합니다.")
+        if time.monotonic() - started < RESPAWN_BACKOFF_SECONDS:
+            time.sleep(RESPAWN_BACKOFF_SECONDS)
+        workers[spawn(worker_index, sock, job_sockets)] = (worker_index, time.monotonic())
+
+    print("🛑 서버 종료")
+
+if __name__ == '__main__':
+    main()
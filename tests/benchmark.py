@@ -0,0 +1,223 @@
+"""
+배치 기본 연산 마이크로 벤치마크
+연산마다 몇 번 미리 돌린 뒤(warmup) 여러 번 재서 중앙값과 p95를 낸다.
+결과는 JSON으로 남기고, 저장해 둔 기준(baseline)과 비교해 느려진 연산이 있으면 실패한다.
+
+    python tests/benchmark.py                                # 출력 + benchmark_results.json
+    python tests/benchmark.py --save-baseline baseline.json  # 기준 저장
+    python tests/benchmark.py --compare baseline.json --threshold 0.25
+"""
+import sys
+import os
+import json
+import math
+import time
+import random
+import platform
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import (
+    calculate_group_sizes, load_members, load_groups, count_same_group_members, build_member_group_index,
+    allocate_seats_with_groups, calculate_group_conflicts
+)
+from workloads import make_workload
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEMBERS_FILE = os.path.join(ROOT, "members.txt")
+GROUPS_FILE = os.path.join(ROOT, "groups.txt")
+
+# 한 번 재는 시간이 이보다 짧으면 여러 번 돌려 평균을 한 표본으로 쓴다 (초)
+MIN_SAMPLE_SECONDS = 0.001
+
+# 연산 이름 → 준비 함수. 준비 함수는 잴 함수(인자 없음)를 돌려준다 (준비 시간은 재지 않는다).
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+@benchmark("calculate_group_sizes")
+def bench_calculate_group_sizes():
+    return lambda: [calculate_group_sizes(n) for n in (23, 100, 1000)]
+
+@benchmark("load_members")
+def bench_load_members():
+    return lambda: load_members(MEMBERS_FILE)
+
+@benchmark("load_groups")
+def bench_load_groups():
+    return lambda: load_groups(GROUPS_FILE)
+
+@benchmark("count_same_group_members")
+def bench_count_same_group_members():
+    members = load_members(MEMBERS_FILE)
+    groups = load_groups(GROUPS_FILE)
+    team = members[:6]
+    # 배치처럼 인덱스는 한 번 만들어 두고 세기만 잰다
+    index = build_member_group_index(groups)
+    return lambda: [count_same_group_members(member, team, groups, index) for member in members]
+
+@benchmark("allocate_seats_with_groups")
+def bench_allocate_seats_with_groups():
+    members = load_members(MEMBERS_FILE)
+    groups = load_groups(GROUPS_FILE)
+    group_sizes = calculate_group_sizes(len(members))
+    rng = random.Random(0)
+    return lambda: allocate_seats_with_groups(members, group_sizes, groups, rng=rng)
+
+@benchmark("allocate_synthetic_5000")
+def bench_allocate_synthetic():
+    # 큰 명단 경로(allocate_roster_large)를 타는 크기의 합성 명단
+    members, groups = make_workload("overlapping", 5000, seed=0)
+    group_sizes = calculate_group_sizes(len(members))
+    rng = random.Random(0)
+    return lambda: allocate_seats_with_groups(members, group_sizes, groups, rng=rng)
+
+@benchmark("calculate_group_conflicts")
+def bench_calculate_group_conflicts():
+    members = load_members(MEMBERS_FILE)
+    groups = load_groups(GROUPS_FILE)
+    teams = allocate_seats_with_groups(members, calculate_group_sizes(len(members)), groups, rng=0)
+    return lambda: calculate_group_conflicts(groups, teams)
+
+@benchmark("api_allocate")
+def bench_api_allocate():
+    # 기록 파일이 작업 디렉터리에 쌓이지 않도록 임시 파일을 쓴다
+    os.environ.setdefault("HISTORY_DB", os.path.join(tempfile.mkdtemp(), "history.sqlite3"))
+    import web_server
+    client = web_server.app.test_client()
+    members = load_members(MEMBERS_FILE)
+    groups = load_groups(GROUPS_FILE)
+    seeds = iter(range(1 << 30))
+
+    def run():
+        # 시드를 바꿔 결과 캐시를 거치지 않고 매번 배치한다
+        response = client.post("/api/allocate", json={"members": members, "groups": groups, "seed": next(seeds)})
+        assert response.status_code == 200
+    return run
+
+def percentile(sorted_samples, fraction):
+    """정렬된 표본의 nearest-rank 백분위수"""
+    index = max(0, min(len(sorted_samples) - 1, math.ceil(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+def summarize(samples):
+    """표본(초) → 중앙값/p95/최소/평균"""
+    ordered = sorted(samples)
+    middle = len(ordered) // 2
+    median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    return {
+        "median": median,
+        "p95": percentile(ordered, 0.95),
+        "min": ordered[0],
+        "mean": sum(ordered) / len(ordered),
+        "runs": len(ordered)
+    }
+
+def measure(fn, warmup=3, repeat=30):
+    """fn 한 번에 걸리는 시간(초) 표본 repeat개. 아주 짧은 연산은 묶어서 잰다."""
+    for _ in range(warmup):
+        fn()
+
+    # 한 표본이 MIN_SAMPLE_SECONDS 이상이 되도록 묶음 크기를 정한다
+    number = 1
+    while number < 1_000_000:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS:
+            break
+        number *= 10
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+def run_benchmarks(names=None, warmup=3, repeat=30):
+    """연산별 요약을 담은 결과(JSON으로 저장할 모양)를 돌려준다."""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        results[name] = summarize(measure(setup(), warmup, repeat))
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "warmup": warmup,
+        "repeat": repeat,
+        "results": results
+    }
+
+def compare(report, baseline, threshold=0.25):
+    """기준보다 중앙값이 threshold(비율) 넘게 느려진 연산 목록 [(이름, 기준, 지금, 비율)]"""
+    regressions = []
+    for name, summary in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["median"] <= 0:
+            continue
+        ratio = summary["median"] / base["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["median"], summary["median"], ratio))
+    return regressions
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+def print_report(report, baseline=None):
+    print("⏱️  배치 기본 연산 벤치마크")
+    print("=" * 50)
+    print(f"{'연산':<28} {'중앙값':>10} {'p95':>10}" + (f" {'기준 대비':>9}" if baseline else ""))
+    for name, summary in report["results"].items():
+        line = f"{name:<28} {format_seconds(summary['median']):>10} {format_seconds(summary['p95']):>10}"
+        if baseline and name in baseline["results"]:
+            line += f" {summary['median'] / baseline['results'][name]['median']:>8.2f}x"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="배치 기본 연산 벤치마크")
+    parser.add_argument("--warmup", type=int, default=3, help="재기 전에 돌리는 횟수")
+    parser.add_argument("--repeat", type=int, default=30, help="표본 수")
+    parser.add_argument("--only", nargs="*", help="이 연산들만 잰다")
+    parser.add_argument("--output", default="benchmark_results.json", help="결과 JSON 파일")
+    parser.add_argument("--save-baseline", help="결과를 기준 파일로도 저장")
+    parser.add_argument("--compare", help="이 기준 파일과 비교해 느려졌으면 실패")
+    parser.add_argument("--threshold", type=float, default=0.25, help="허용하는 중앙값 증가 비율 (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.only, args.warmup, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {path}")
+
+    if baseline:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 기준보다 {args.threshold:.0%} 넘게 느려진 연산:")
+            for name, before, after, ratio in regressions:
+                print(f"   {name}: {format_seconds(before)} → {format_seconds(after)} ({ratio:.2f}x)")
+            return 1
+        print(f"\n✅ 모든 연산이 기준의 {1 + args.threshold:.2f}배 안쪽입니다.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
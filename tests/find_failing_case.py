@@ -1,72 +1,247 @@
 #!/usr/bin/env python3
 """
-Find a failing random seed case
+시드 스윕: 많은 시드로 배치해 충돌 수와 실행 시간 분포를 본다
+시드 범위를 조각(shard)으로 나눠 작업 프로세스들에 돌리고, 작업 프로세스마다 명단은
+한 번만 읽는다. 충돌 수/실행 시간 히스토그램, 실패율과 95% 신뢰구간(Wilson), 실패한
+시드를 출력해 그리디 순서가 나빠진 것을 한두 사례가 아닌 통계로 보여 준다.
+
+    python tests/find_failing_case.py                                  # members.txt/groups.txt, 시드 0..999
+    python tests/find_failing_case.py --count 1000000 --workers 8
+    python tests/find_failing_case.py --kind inseparable --size 500 --count 100000
+    python tests/find_failing_case.py --show 3                         # 실패한 시드 3개의 충돌 쌍
+    python tests/find_failing_case.py --max-failure-rate 0.01          # 실패율이 1%보다 확실히 높으면 종료 코드 1
 """
 import sys
 import os
+import json
+import math
+import time
+import random
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from seat_allocation import (
-    load_members, load_groups, calculate_group_sizes,
-    allocate_seats_with_groups, calculate_group_conflicts
+    Roster, load_members, load_groups, calculate_group_sizes, allocate_roster,
+    allocate_seats_with_groups, analyze_group_conflicts, conflict_lower_bound
 )
-import random
+from workloads import WORKLOAD_CLASSES, make_workload
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def test_with_seed(seed):
-    """Test allocation with a specific seed"""
-    random.seed(seed)
-    
-    members = load_members()
-    groups = load_groups()
+# 실행 시간 히스토그램 칸: 2배마다 4칸 (칸 경계가 약 19%씩 커진다)
+TIME_BUCKETS_PER_OCTAVE = 4
+
+def load_source(source):
+    """명단 출처 → (members, groups). 파일({'members_file', 'groups_file'})이나
+    합성 명단({'kind', 'size', 'workload_seed'})을 받는다."""
+    if 'kind' in source:
+        return make_workload(source['kind'], source['size'], seed=source.get('workload_seed', 0))
+    return load_members(source['members_file']), load_groups(source['groups_file'])
+
+# 작업 프로세스마다 한 번 읽어 둔 명단
+_worker = {}
+
+def _init_worker(source):
+    members, groups = load_source(source)
+    roster = Roster(members, groups)
     group_sizes = calculate_group_sizes(len(members))
-    
-    teams = allocate_seats_with_groups(members, group_sizes, groups)
-    conflicts = calculate_group_conflicts(groups, teams)
-    
-    return conflicts, teams
-
-def find_failing_cases():
-    """Find random seeds that produce conflicts"""
-    print("Searching for failing cases...")
-    
-    failing_cases = []
-    
-    for seed in range(1000):
-        conflicts, teams = test_with_seed(seed)
-        
-        if conflicts > 0:
-            failing_cases.append((seed, conflicts, teams))
-            print(f"FOUND FAILING CASE: seed={seed}, conflicts={conflicts}")
-            
-            # Show the conflicting groups
-            members = load_members()
-            groups = load_groups()
-            
-            for group_name, group_members in groups.items():
-                team_distribution = {}
-                for member in group_members:
-                    for team_idx, team in enumerate(teams):
-                        if member in team:
-                            if team_idx not in team_distribution:
-                                team_distribution[team_idx] = []
-                            team_distribution[team_idx].append(member)
-                            break
-                
-                # Check if any team has multiple members from this group
-                for team_idx, members_in_team in team_distribution.items():
-                    if len(members_in_team) > 1:
-                        print(f"  Group '{group_name}' has {len(members_in_team)} members in Team {team_idx+1}: {members_in_team}")
-            
-            print()
-            
-            if len(failing_cases) >= 5:  # Stop after finding 5 cases
-                break
-        
-        if seed % 100 == 0:
-            print(f"  Tested up to seed {seed}...")
-    
-    print(f"\nFound {len(failing_cases)} failing cases out of {seed+1} tested")
-    return failing_cases
+    _worker.update(
+        roster=roster,
+        group_sizes=group_sizes,
+        lower_bound=conflict_lower_bound(roster, len(group_sizes))
+    )
+
+def time_bucket(seconds):
+    return math.ceil(math.log2(max(seconds, 1e-9)) * TIME_BUCKETS_PER_OCTAVE)
+
+def bucket_upper(bucket):
+    """칸의 위쪽 경계 (초)"""
+    return 2 ** (bucket / TIME_BUCKETS_PER_OCTAVE)
+
+def sweep_range(start, stop, allowed=None, keep_failing=100):
+    """작업 프로세스에서 시드 start..stop-1로 배치한 결과 조각.
+
+    allocate_seats_with_groups(rng=seed)와 같은 배치를, 읽어 둔 Roster로 바로 만든다.
+    충돌 수가 allowed(기본: 하한)보다 많으면 실패로 센다.
+    """
+    roster, group_sizes = _worker['roster'], _worker['group_sizes']
+    if allowed is None:
+        allowed = _worker['lower_bound']
+    conflicts_histogram = Counter()
+    time_histogram = Counter()
+    failing = []
+    failures = 0
+    for seed in range(start, stop):
+        began = time.perf_counter()
+        conflicts = allocate_roster(roster, group_sizes, random.Random(seed)).conflicts()
+        time_histogram[time_bucket(time.perf_counter() - began)] += 1
+        conflicts_histogram[conflicts] += 1
+        if conflicts > allowed:
+            failures += 1
+            if len(failing) < keep_failing:
+                failing.append((seed, conflicts))
+    return conflicts_histogram, time_histogram, failures, failing
+
+def wilson_interval(failures, total, z=1.96):
+    """실패율의 Wilson 신뢰구간 (기본 95%). 실패가 0번이어도 위쪽 경계가 0보다 크다."""
+    if total == 0:
+        return 0.0, 1.0
+    rate = failures / total
+    denominator = 1 + z * z / total
+    center = (rate + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+def histogram_percentile(histogram, fraction):
+    """{칸: 개수}에서 fraction 지점이 들어 있는 칸"""
+    target = fraction * sum(histogram.values())
+    seen = 0
+    for key in sorted(histogram):
+        seen += histogram[key]
+        if seen >= target:
+            return key
+    return None
+
+def sweep(source, start=0, count=1000, workers=None, shard_size=None, allowed=None, keep_failing=100):
+    """시드 start..start+count-1을 조각으로 나눠 돌리고 요약을 돌려준다.
+
+    workers가 1이면 프로세스를 띄우지 않고 이 프로세스에서 돌린다.
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, min(10000, math.ceil(count / (workers * 8))))
+    shards = [(begin, min(begin + shard_size, start + count)) for begin in range(start, start + count, shard_size)]
+
+    conflicts_histogram = Counter()
+    time_histogram = Counter()
+    failing = []
+    failures = 0
+    began = time.perf_counter()
+
+    def merge(part):
+        nonlocal failures
+        conflicts_part, time_part, failures_part, failing_part = part
+        conflicts_histogram.update(conflicts_part)
+        time_histogram.update(time_part)
+        failures += failures_part
+        failing.extend(failing_part)
+
+    if workers == 1:
+        _init_worker(source)
+        for begin, stop in shards:
+            merge(sweep_range(begin, stop, allowed, keep_failing))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source,)) as executor:
+            futures = [executor.submit(sweep_range, begin, stop, allowed, keep_failing) for begin, stop in shards]
+            for future in as_completed(futures):
+                merge(future.result())
+
+    members, groups = load_source(source)
+    num_teams = len(calculate_group_sizes(len(members)))
+    lower_bound = conflict_lower_bound(Roster(members, groups), num_teams)
+    low, high = wilson_interval(failures, count)
+    return {
+        'runs': count,
+        'start': start,
+        'workers': workers,
+        'seconds': time.perf_counter() - began,
+        'lower_bound': lower_bound,
+        'allowed': lower_bound if allowed is None else allowed,
+        'failures': failures,
+        'failure_rate': failures / count if count else 0.0,
+        'failure_rate_interval': [low, high],
+        'failing_seeds': sorted(failing)[:keep_failing],
+        'conflicts_histogram': dict(sorted(conflicts_histogram.items())),
+        'time_histogram': dict(sorted(time_histogram.items())),
+        'time_percentiles': {
+            name: bucket_upper(histogram_percentile(time_histogram, fraction))
+            for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+        } if time_histogram else {}
+    }
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+def print_histogram(histogram, label, width=40):
+    total = sum(histogram.values())
+    peak = max(histogram.values())
+    for key, value in histogram.items():
+        bar = "█" * max(1, round(value / peak * width))
+        print(f"  {label(key):>10} {value:>10} {value / total:>7.2%} {bar}")
+
+def show_failure(source, seed):
+    """실패한 시드 하나를 공개 함수(allocate_seats_with_groups)로 다시 배치해 충돌 쌍을 출력한다."""
+    members, groups = load_source(source)
+    teams = allocate_seats_with_groups(members, calculate_group_sizes(len(members)), groups, rng=seed)
+    analysis = analyze_group_conflicts(groups, teams)
+    print(f"\n🔎 시드 {seed}: 충돌 {analysis['conflicts']}개")
+    for pair in analysis['conflict_pairs']:
+        print(f"  그룹 '{pair['group']}' 모둠 {pair['team'] + 1}: {pair['members']}")
+
+def print_summary(summary):
+    print("🎲 시드 스윕")
+    print("=" * 50)
+    print(f"시드 {summary['start']}..{summary['start'] + summary['runs'] - 1} ({summary['runs']}개), "
+          f"작업 프로세스 {summary['workers']}개, {summary['seconds']:.1f}초")
+    print(f"충돌 하한 {summary['lower_bound']}, {summary['allowed']}개보다 많으면 실패")
+
+    print("\n📊 충돌 수")
+    print_histogram(summary['conflicts_histogram'], str)
+    print("\n⏱️  배치 시간 (칸의 위쪽 경계)")
+    print_histogram(summary['time_histogram'], lambda bucket: format_seconds(bucket_upper(bucket)))
+    print("  " + ", ".join(f"{name} ≤ {format_seconds(value)}" for name, value in summary['time_percentiles'].items()))
+
+    low, high = summary['failure_rate_interval']
+    print(f"\n❗ 실패 {summary['failures']}/{summary['runs']} = {summary['failure_rate']:.4%} "
+          f"(95% 신뢰구간 {low:.4%} ~ {high:.4%})")
+    if summary['failing_seeds']:
+        shown = summary['failing_seeds'][:20]
+        print("   실패한 시드(충돌 수): " + ", ".join(f"{seed}({conflicts})" for seed, conflicts in shown)
+              + (" ..." if summary['failures'] > len(shown) else ""))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시드 스윕: 충돌 수/시간 분포와 실패율")
+    parser.add_argument("--start", type=int, default=0, help="첫 시드")
+    parser.add_argument("--count", type=int, default=1000, help="시드 개수")
+    parser.add_argument("--workers", type=int, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--shard-size", type=int, help="작업 프로세스에 한 번에 주는 시드 수")
+    parser.add_argument("--members-file", default=os.path.join(ROOT, "members.txt"))
+    parser.add_argument("--groups-file", default=os.path.join(ROOT, "groups.txt"))
+    parser.add_argument("--kind", choices=sorted(WORKLOAD_CLASSES), help="파일 대신 합성 명단 사용")
+    parser.add_argument("--size", type=int, default=1000, help="합성 명단 인원")
+    parser.add_argument("--workload-seed", type=int, default=0, help="합성 명단 시드")
+    parser.add_argument("--allowed", type=int, help="허용하는 충돌 수 (기본: 하한)")
+    parser.add_argument("--keep-failing", type=int, default=100, help="남길 실패 시드 수")
+    parser.add_argument("--show", type=int, default=0, help="충돌 쌍을 출력할 실패 시드 수")
+    parser.add_argument("--output", help="요약 JSON 파일")
+    parser.add_argument("--max-failure-rate", type=float,
+                        help="실패율 신뢰구간 아래쪽 경계가 이 값보다 크면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    if args.kind:
+        source = {'kind': args.kind, 'size': args.size, 'workload_seed': args.workload_seed}
+    else:
+        source = {'members_file': args.members_file, 'groups_file': args.groups_file}
+
+    summary = sweep(source, args.start, args.count, args.workers, args.shard_size, args.allowed, args.keep_failing)
+    print_summary(summary)
+    for seed, _ in summary['failing_seeds'][:args.show]:
+        show_failure(source, seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.output}")
+
+    if args.max_failure_rate is not None and summary['failure_rate_interval'][0] > args.max_failure_rate:
+        print(f"\n❌ 실패율이 {args.max_failure_rate:.2%}보다 높습니다.")
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    find_failing_cases()
\ No newline at end of file
+    sys.exit(main())
@@ -20,7 +20,23 @@ def run_all_tests():
         ("test_group_constraints", "그룹 제약 조건 테스트"),
         ("test_performance", "성능 비교 테스트"),
         ("test_round_robin", "라운드 로빈 분배 테스트"),
-        ("test_debug", "디버깅 및 상세 분석")
+        ("test_debug", "디버깅 및 상세 분석"),
+        ("test_roster", "정수 ID 로스터 테스트"),
+        ("test_team_selection", "모둠 선택 회귀 테스트"),
+        ("test_optimizer", "맞바꾸기 최적화 테스트"),
+        ("test_exact_solver", "정확한 해 탐색 테스트"),
+        ("test_best_of", "여러 시드 병렬 배치 테스트"),
+        ("test_result_cache", "배치 결과 캐시 테스트"),
+        ("test_roster_store", "명단 저장소 테스트"),
+        ("test_allocation_jobs", "배치 작업 진행/취소 테스트"),
+        ("test_rooms", "방별 명단 테스트"),
+        ("test_rotation", "여러 회차 로테이션 테스트"),
+        ("test_history_store", "배치 기록 저장소 테스트"),
+        ("test_arrangements", "이동/교환 충돌 계산 테스트"),
+        ("test_large_allocation", "큰 명단 배치 테스트"),
+        ("test_benchmark", "벤치마크 도구 테스트"),
+        ("test_workloads", "합성 명단 생성 테스트"),
+        ("test_seed_sweep", "시드 스윕 도구 테스트")
     ]
     
     for i, (module_name, description) in enumerate(test_modules, 1):
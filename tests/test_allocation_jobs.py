@@ -0,0 +1,81 @@
+"""
+배치 작업(진행 상황 / 취소) 테스트
+"""
+import sys
+import os
+import random
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import *
+from allocation_jobs import JobManager
+
+def test_job_progress_and_result():
+    """진행 이벤트가 나아지는 순서로 쌓이고 마지막에 done이 오는지 확인"""
+
+    print("📡 배치 작업 진행 테스트")
+    print("=" * 50)
+
+    rng = random.Random(3)
+    members = [f"사람{i}" for i in range(1, 61)]
+    groups = {f"그룹{j}": rng.sample(members, rng.randint(4, 10)) for j in range(15)}
+    roster = Roster(members, groups)
+    group_sizes = calculate_group_sizes(len(members))
+
+    def run(job):
+        occupancy = allocate_roster(roster, group_sizes, random.Random(1))
+        job.publish('progress', {'conflicts': occupancy.conflicts()})
+        return optimize_allocation(
+            occupancy, max_iterations=5000, rng=random.Random(1),
+            on_improve=lambda conflicts, teams: job.publish('progress', {'conflicts': conflicts}),
+            should_stop=job.should_stop
+        )
+
+    manager = JobManager(max_workers=1)
+    job = manager.submit(run)
+    events = []
+    while not events or events[-1]['event'] != 'done':
+        events += job.wait_events(events[-1]['id'] if events else -1, timeout=5)
+    manager.shutdown()
+
+    progress = [event['data']['conflicts'] for event in events[:-1]]
+    print(f"  충돌 변화: {progress} → 결과 {job.result}")
+    assert progress == sorted(progress, reverse=True)
+    assert job.result == progress[-1]
+    assert job.status == 'done'
+
+def test_job_cancel():
+    """취소하면 탐색이 바로 멈추고 그때까지의 최선을 남기는지 확인"""
+
+    print("\n⏹️  배치 작업 취소 테스트")
+    print("=" * 50)
+
+    rng = random.Random(4)
+    members = [f"사람{i}" for i in range(1, 91)]
+    groups = {f"그룹{j}": rng.sample(members, 12) for j in range(25)}
+    roster = Roster(members, groups)
+    group_sizes = calculate_group_sizes(len(members))
+    started = threading.Event()
+
+    def run(job):
+        def on_improve(conflicts, teams):
+            job.publish('progress', {'conflicts': conflicts})
+            started.set()
+        return solve_exact(roster, group_sizes, time_limit_ms=60000, rng=random.Random(1),
+                           on_improve=on_improve, should_stop=job.should_stop)
+
+    manager = JobManager(max_workers=1)
+    job = manager.submit(run)
+    assert started.wait(5)
+    manager.cancel(job.id)
+    manager.shutdown()
+
+    print(f"  상태: {job.status}, {job.elapsed_ms()}ms, 충돌 {job.result['conflicts']}개")
+    assert job.status == 'cancelled'
+    assert job.elapsed_ms() < 10000
+    assert job.events[-1]['event'] == 'cancelled'
+    assert sorted(member for team in job.result['teams'] for member in team) == list(range(len(roster)))
+
+if __name__ == "__main__":
+    test_job_progress_and_result()
+    test_job_cancel()
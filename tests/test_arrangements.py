@@ -0,0 +1,121 @@
+"""
+편집 중인 배치(Arrangement)의 이동/교환 충돌 계산 테스트
+"""
+import sys
+import os
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import Roster, allocate_roster, analyze_roster_conflicts, calculate_group_sizes
+from arrangements import Arrangement, StaleArrangement
+
+MEMBERS = [f"사람{i}" for i in range(1, 24)]
+GROUPS = {
+    "그룹A": ["사람1", "사람2", "사람3", "사람4"],
+    "그룹B": ["사람4", "사람5", "사람6"],
+    "그룹C": ["사람7", "사람8", "사람9", "사람10", "사람11"],
+    "그룹D": ["사람1", "사람7", "사람12"]
+}
+
+def random_move(rng, arrangement):
+    teams = arrangement.teams()
+    kind = rng.choice(["move", "swap", "team_swap"])
+    if kind == "move":
+        from_team = rng.choice([i for i, team in enumerate(teams) if team])
+        return {"kind": kind, "member": rng.choice(teams[from_team]),
+                "from_team": from_team, "to_team": rng.randrange(len(teams))}
+    if kind == "swap":
+        return {"kind": kind, "a": rng.choice(MEMBERS), "b": rng.choice(MEMBERS)}
+    return {"kind": kind, "from_team": rng.randrange(len(teams)), "to_team": rng.randrange(len(teams))}
+
+def test_move_deltas_match_full_rescore():
+    """이동/교환마다 돌려준 충돌 변화와 자리 표시가 전체를 다시 센 값과 같은지 확인"""
+
+    print("🖱️ 이동/교환 충돌 계산 테스트")
+    print("=" * 50)
+
+    rng = random.Random(7)
+    roster = Roster(MEMBERS, GROUPS)
+    occupancy = allocate_roster(roster, calculate_group_sizes(len(MEMBERS)), rng)
+    arrangement = Arrangement(roster, occupancy.teams)
+
+    for step in range(500):
+        before = arrangement.teams()
+        move = random_move(rng, arrangement)
+        apply = rng.random() < 0.5
+        result = arrangement.evaluate(move, apply=apply)
+
+        if not apply:
+            assert arrangement.teams() == before  # 계산만 하면 자리 순서까지 그대로
+            continue
+        expected = analyze_roster_conflicts(roster, arrangement.occupancy.teams)["conflicts"]
+        assert result["conflicts"] == expected == arrangement.conflicts
+        for member_id, name in enumerate(roster.names):
+            if name in result["seats"]:
+                team = arrangement.occupancy.teams[arrangement.occupancy.member_team[member_id]]
+                shares = any(other != member_id and roster.shares_group(member_id, other) for other in team)
+                assert result["seats"][name] == shares
+
+    print(f"  판: {arrangement.version}, 충돌 수: {arrangement.conflicts}")
+    assert arrangement.version > 0
+
+def test_stale_version_and_bad_moves():
+    """지난 판으로 보낸 변경과 없는 멤버/모둠은 받지 않는지 확인"""
+    roster = Roster(MEMBERS, GROUPS)
+    teams = [MEMBERS[i::4] for i in range(4)]
+    arrangement = Arrangement(roster, roster.to_ids(teams))
+    arrangement.evaluate({"kind": "team_swap", "from_team": 0, "to_team": 1}, apply=True, version=0)
+
+    try:
+        arrangement.evaluate({"kind": "team_swap", "from_team": 0, "to_team": 1}, version=0)
+    except StaleArrangement:
+        pass
+    else:
+        raise AssertionError("지난 판의 변경이 받아들여졌습니다")
+
+    for move in ({"kind": "swap", "a": "없는사람", "b": "사람1"},
+                 {"kind": "move", "member": "사람1", "to_team": 9},
+                 {"kind": "rename"}):
+        try:
+            arrangement.evaluate(move)
+        except ValueError:
+            continue
+        raise AssertionError(f"{move} 변경이 받아들여졌습니다")
+
+def test_handles_forwarded_to_owner_worker():
+    """여러 워커로 서비스할 때 배치 ID에 워커 접두사가 붙고, 다른 워커의 ID는 주인에게 넘기는지 확인"""
+    os.environ.setdefault("HISTORY_DB", os.path.join(tempfile.mkdtemp(), "history.sqlite3"))
+    import web_server
+    client = web_server.app.test_client()
+    forwarded = []
+
+    def forwarder(owned_id):
+        forwarded.append(owned_id)
+        return ({"success": True, "forwarded": owned_id}, 200) if owned_id.startswith("w1-") else None
+
+    saved = web_server.worker_id_prefix, web_server.request_forwarder
+    web_server.worker_id_prefix, web_server.request_forwarder = "w0-", forwarder
+    try:
+        teams = [MEMBERS[i:i + 6] for i in range(0, len(MEMBERS), 6)]
+        opened = client.post("/api/arrangements", json={"teams": teams, "groups": GROUPS}).get_json()
+        assert opened["arrangement"].startswith("w0-")
+
+        # 이 워커의 배치는 넘기지 않고 바로 계산한다
+        move = {"kind": "swap", "a": teams[0][0], "b": teams[1][0]}
+        response = client.post("/api/evaluate-move", json={"arrangement": opened["arrangement"], "move": move})
+        assert response.status_code == 200 and forwarded == []
+
+        response = client.post("/api/evaluate-move", json={"arrangement": "w1-abc", "move": move})
+        assert response.status_code == 200 and response.get_json()["forwarded"] == "w1-abc"
+        response = client.post("/api/evaluate-move", json={"arrangement": "w2-abc", "move": move})
+        assert response.status_code == 404
+        assert forwarded == ["w1-abc", "w2-abc"]
+    finally:
+        web_server.worker_id_prefix, web_server.request_forwarder = saved
+    print("  다른 워커의 배치 ID는 주인 워커로 넘김")
+
+if __name__ == "__main__":
+    test_move_deltas_match_full_rescore()
+    test_stale_version_and_bad_moves()
+    test_handles_forwarded_to_owner_worker()
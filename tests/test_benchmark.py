@@ -0,0 +1,37 @@
+"""
+마이크로 벤치마크 도구(benchmark.py) 테스트
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import summarize, compare, run_benchmarks
+
+def test_summary_and_compare():
+    """중앙값/p95 계산과, 기준보다 느려진 연산만 골라내는지 확인"""
+
+    print("⏱️ 벤치마크 도구 테스트")
+    print("=" * 50)
+
+    summary = summarize([float(i) for i in range(1, 101)])
+    assert summary["median"] == 50.5
+    assert summary["p95"] == 95.0
+    assert summary["min"] == 1.0 and summary["runs"] == 100
+
+    baseline = {"results": {"빠름": {"median": 1.0}, "느림": {"median": 1.0}, "새것": {"median": 0}}}
+    report = {"results": {"빠름": {"median": 1.1}, "느림": {"median": 1.5}, "새것": {"median": 1.0}, "없음": {"median": 9.0}}}
+    regressions = compare(report, baseline, threshold=0.25)
+    print(f"  느려진 연산: {regressions}")
+    assert [name for name, *_ in regressions] == ["느림"]
+
+def test_run_produces_report():
+    """연산 하나를 짧게 돌려 JSON으로 남길 결과 모양이 맞는지 확인"""
+    report = run_benchmarks(["calculate_group_sizes"], warmup=1, repeat=3)
+    assert list(report["results"]) == ["calculate_group_sizes"]
+    result = report["results"]["calculate_group_sizes"]
+    assert result["runs"] == 3 and 0 < result["min"] <= result["median"] <= result["p95"]
+
+if __name__ == "__main__":
+    test_summary_and_compare()
+    test_run_produces_report()
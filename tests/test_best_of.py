@@ -0,0 +1,61 @@
+"""
+여러 시드 병렬 배치(best_of) 테스트
+"""
+import sys
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import *
+
+def test_best_of_reproducible():
+    """같은 기준 시드면 작업 프로세스 수와 상관없이 같은 결과인지 확인"""
+
+    print("🧵 best_of 재현성 테스트")
+    print("=" * 50)
+
+    rng = random.Random(5)
+    members = [f"사람{i}" for i in range(1, 61)]
+    groups = {f"그룹{j}": rng.sample(members, rng.randint(3, 12)) for j in range(15)}
+    group_sizes = calculate_group_sizes(len(members))
+
+    results = []
+    for workers in (1, 2, 3):
+        result = best_of(12, members, group_sizes, groups, workers=workers, seed=42,
+                         optimize_iterations=500)
+        print(f"  작업 프로세스 {workers}개: 충돌 {result['conflicts']}개, 시드 {result['seed']}")
+        results.append(result)
+
+    assert all(result == results[0] for result in results)
+    assert results[0]['conflicts'] == calculate_group_conflicts(groups, results[0]['teams'])
+
+def test_iter_allocations():
+    """후보 스트림이 프로세스 풀 사용 여부와 상관없이 같고, 중복 제거가 되는지 확인"""
+
+    print("\n📦 배치 후보 스트림 테스트")
+    print("=" * 50)
+
+    rng = random.Random(7)
+    members = [f"사람{i}" for i in range(1, 31)]
+    groups = {f"그룹{j}": rng.sample(members, rng.randint(3, 8)) for j in range(8)}
+    group_sizes = calculate_group_sizes(len(members))
+
+    serial = list(iter_allocations(20, members, group_sizes, groups, seed=3))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = list(iter_allocations(20, members, group_sizes, groups, seed=3,
+                                         executor=executor, workers=2, chunk_size=3))
+    print(f"  후보 {len(serial)}개, 최소 충돌 {min(c for _, _, c, _ in serial)}개")
+    assert serial == parallel
+    assert [index for index, _, _, _ in serial] == list(range(20))
+    for _, _, conflicts, teams in serial:
+        assert conflicts == calculate_group_conflicts(groups, teams)
+
+    # 4명을 2명씩 나누는 방법은 3가지뿐이다
+    unique = list(iter_allocations(10, ["가", "나", "다", "라"], [2, 2], {}, seed=1, unique=True))
+    print(f"  중복 제거 후보: {len(unique)}개")
+    assert len(unique) == 3
+
+if __name__ == "__main__":
+    test_best_of_reproducible()
+    test_iter_allocations()
@@ -8,7 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from seat_allocation import (
     load_members, load_groups, calculate_group_sizes,
-    allocate_seats_with_groups, calculate_group_conflicts
+    allocate_seats_with_groups, calculate_group_conflicts, analyze_group_conflicts
 )
 
 def test_consistency(num_runs=10):
@@ -35,21 +35,13 @@ def test_consistency(num_runs=10):
         # Show group distribution for first few runs
         if i < 3 or conflicts > 0:
             print(f"        Group distributions:")
-            for group_name, group_members in groups.items():
-                team_distribution = {}
-                for member in group_members:
-                    for team_idx, team in enumerate(teams):
-                        if member in team:
-                            if team_idx not in team_distribution:
-                                team_distribution[team_idx] = []
-                            team_distribution[team_idx].append(member)
-                            break
-                
+            analysis = analyze_group_conflicts(groups, teams)
+            for group_name, distribution in analysis['group_distributions'].items():
                 distribution_str = []
-                for team_idx, members_in_team in team_distribution.items():
-                    if len(members_in_team) > 1:
-                        distribution_str.append(f"Team{team_idx+1}({len(members_in_team)})")
-                    else:
+                for team_idx, count in enumerate(distribution):
+                    if count > 1:
+                        distribution_str.append(f"Team{team_idx+1}({count})")
+                    elif count == 1:
                         distribution_str.append(f"Team{team_idx+1}")
                 
                 print(f"          {group_name}: {' '.join(distribution_str)}")
@@ -0,0 +1,76 @@
+"""
+정확한 최소 충돌 배치(분기 한정법) 테스트
+"""
+import sys
+import os
+import random
+import itertools
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import *
+
+def brute_force_min_conflicts(members, group_sizes, groups):
+    """모든 순열을 시도해서 최소 충돌 수를 구한다 (작은 경우만)"""
+    best = None
+    for order in itertools.permutations(members):
+        teams = []
+        start = 0
+        for size in group_sizes:
+            teams.append(list(order[start:start + size]))
+            start += size
+        conflicts = calculate_group_conflicts(groups, teams)
+        if best is None or conflicts < best:
+            best = conflicts
+    return best
+
+def test_exact_matches_brute_force():
+    """작은 경우에서 전수 조사 결과와 같은지 확인"""
+
+    print("🧩 정확한 해 vs 전수 조사")
+    print("=" * 50)
+
+    rng = random.Random(3)
+    for i in range(15):
+        n = rng.randint(4, 7)
+        members = [f"사람{j}" for j in range(1, n + 1)]
+        groups = {
+            f"그룹{j}": rng.sample(members, rng.randint(2, n))
+            for j in range(rng.randint(1, 3))
+        }
+        group_sizes = calculate_group_sizes(n, max_per_group=2)
+
+        result = allocate_seats_exact(members, group_sizes, groups)
+        expected = brute_force_min_conflicts(members, group_sizes, groups)
+        print(f"  시도 {i+1}: {n}명 {group_sizes} → {result['conflicts']}개 (전수 조사 {expected}개)")
+
+        assert result['optimal']
+        assert result['conflicts'] == expected
+        assert result['conflicts'] == calculate_group_conflicts(groups, result['teams'])
+        assert [len(team) for team in result['teams']] == group_sizes
+
+def test_extreme_overlap_exact():
+    """극단적 중복 시나리오에서 그리디와 정확한 해 비교"""
+
+    print("\n🚨 극단적 중복 시나리오")
+    print("=" * 50)
+
+    members = ["A", "B", "C", "D", "E", "F", "G", "H"]
+    groups = {
+        "그룹1": ["A", "B", "C", "D"],
+        "그룹2": ["A", "B", "E", "F"],
+        "그룹3": ["C", "D", "G", "H"],
+        "그룹4": ["E", "F", "G", "H"]
+    }
+    group_sizes = [2, 2, 2, 2]
+
+    greedy = calculate_group_conflicts(groups, allocate_seats_with_groups(members, group_sizes, groups))
+    result = allocate_seats_exact(members, group_sizes, groups)
+    print(f"  그리디: {greedy}개, 정확한 해: {result['conflicts']}개 (최적: {result['optimal']})")
+    print(f"  배치: {result['teams']}")
+
+    assert result['optimal']
+    assert result['conflicts'] <= greedy
+
+if __name__ == "__main__":
+    test_exact_matches_brute_force()
+    test_extreme_overlap_exact()
@@ -0,0 +1,130 @@
+"""
+배치 기록 저장소(HistoryStore) 테스트
+"""
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore, apply_edit
+
+MEMBERS = ["가", "나", "다", "라"]
+GROUPS = {"그룹": ["가", "나"]}
+OPTIONS = {"strategy": "greedy", "optimize_ms": 0, "best_of": 1, "time_limit_ms": 2000}
+
+def test_history_pages_and_replays():
+    """방별로 쌓이고, ID 기준으로 쪽이 나뉘며, 배치와 고친 내용을 다시 모을 수 있는지 확인"""
+
+    print("📜 배치 기록 테스트")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.sqlite3")
+        store = HistoryStore(path)
+
+        base_id = store.append_allocation("1반", MEMBERS, GROUPS, OPTIONS, seed=7, conflicts=0)
+        store.append_edit("1반", "swap", {"a": "가", "b": "다"}, base_id=base_id)
+        move_id = store.append_edit("1반", "move", {"member": "라", "from_team": 0, "to_team": 1}, base_id=base_id)
+        for seed in range(5):
+            store.append_allocation("2반", MEMBERS, GROUPS, OPTIONS, seed=seed, conflicts=1)
+
+        # 같은 명단은 한 번만 저장된다
+        with store._connection() as connection:
+            rosters = connection.execute("SELECT COUNT(*) FROM rosters").fetchone()[0]
+        assert rosters == 1
+
+        # 최신순으로 쪽 나누기
+        first_page, next_before = store.query("2반", limit=3)
+        second_page, last = store.query("2반", limit=3, before=next_before)
+        seeds = [entry["seed"] for entry in first_page + second_page]
+        print(f"  2반 시드(최신순): {seeds}")
+        assert seeds == [4, 3, 2, 1, 0]
+        assert last is None
+        assert [entry["seed"] for entry in store.query("2반", seed=3)[0]] == [3]
+        assert [entry["kind"] for entry in store.query("1반")[0]] == ["move", "swap", "allocation"]
+
+        # 고친 내용 기록에서 배치와 그때까지의 고친 내용을 모은다
+        base, (members, groups), edits = store.replay_plan(move_id)
+        assert base["seed"] == 7 and base["options"] == OPTIONS
+        assert (members, groups) == (MEMBERS, GROUPS)
+        teams = [["가", "라"], ["나", "다"]]
+        for edit in edits:
+            teams = apply_edit(teams, edit["kind"], edit)
+        print(f"  다시 만든 배치: {teams}")
+        assert teams == [["다"], ["나", "가", "라"]]
+        store.close()
+
+        # 파일에 남아 있어 다시 열어도 그대로다
+        reopened = HistoryStore(path)
+        assert reopened.get(move_id)["member"] == "라"
+        assert len(reopened.query("1반")[0]) == 3
+        reopened.close()
+
+def test_invalid_edit():
+    """필요한 값이 빠진 고친 내용은 받지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.sqlite3"))
+        for kind, edit in (("move", {"member": "가"}), ("rename", {})):
+            try:
+                store.append_edit("1반", kind, edit)
+            except ValueError:
+                continue
+            raise AssertionError(f"{kind} 기록이 받아들여졌습니다")
+        store.close()
+
+def test_edit_cannot_cross_rooms():
+    """다른 방의 배치나 없는 기록을 base_id로 쓴 고친 내용은 받지 않고, 다시 만들 때도 섞이지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.sqlite3"))
+        base_a = store.append_allocation("A", MEMBERS, GROUPS, OPTIONS, seed=1, conflicts=0)
+        edit_a = store.append_edit("A", "swap", {"a": "가", "b": "다"}, base_id=base_a)
+        for room, base_id in (("B", base_a), ("A", edit_a), ("A", 9999)):
+            try:
+                store.append_edit(room, "swap", {"a": "나", "b": "라"}, base_id=base_id)
+            except ValueError:
+                continue
+            raise AssertionError(f"{room}방의 base_id={base_id} 기록이 받아들여졌습니다")
+
+        # 검사 전에 쌓인 다른 방 기록이 있어도 배치 방의 고친 내용만 모은다
+        with store._connection() as connection, connection:
+            foreign_id = connection.execute(
+                "INSERT INTO history (room, created_at, kind, base_id, data) VALUES ('B', 0, 'swap', ?, ?)",
+                (base_a, '{"a":"나","b":"라"}')
+            ).lastrowid
+        last_a = store.append_edit("A", "move", {"member": "라", "from_team": 0, "to_team": 1}, base_id=base_a)
+        _, _, edits = store.replay_plan(last_a)
+        assert [edit["id"] for edit in edits] == [edit_a, last_a]
+        assert store.replay_plan(foreign_id) is None
+        store.close()
+    print("  다른 방의 배치에 고친 내용을 붙일 수 없음")
+
+def test_concurrent_threads():
+    """여러 스레드가 함께 쓰고 읽어도 기록이 빠지지 않고, 연결은 동시에 쓴 수만큼만 열리는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.sqlite3"))
+
+        def work(room):
+            for seed in range(20):
+                store.append_allocation(room, MEMBERS, GROUPS, OPTIONS, seed=seed, conflicts=0)
+                store.query(room, limit=5)
+
+        threads = [threading.Thread(target=work, args=(f"방{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for i in range(4):
+            entries, _ = store.query(f"방{i}", limit=100)
+            assert sorted(entry["seed"] for entry in entries) == list(range(20))
+        assert 1 <= len(store._idle) <= 4
+        print(f"  스레드 4개, 연결 {len(store._idle)}개")
+        store.close()
+        assert store._idle == []
+
+if __name__ == "__main__":
+    test_history_pages_and_replays()
+    test_invalid_edit()
+    test_edit_cannot_cross_rooms()
+    test_concurrent_threads()
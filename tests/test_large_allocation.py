@@ -0,0 +1,133 @@
+"""
+큰 명단(수천~수십만 명) 배치 테스트
+"""
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import seat_allocation
+from workloads import generate_workload
+from seat_allocation import (
+    Roster, calculate_group_sizes, allocate_roster, allocate_roster_large,
+    allocate_seats_with_groups, analyze_roster_conflicts, conflict_lower_bound
+)
+
+def make_event_roster(n, rng):
+    """행사 명단 흉내: 절반은 2~12명짜리 겹치지 않는 그룹(같은 팀/회사), 50명당 하나는
+    아무나 모인 작은 그룹, 그리고 전체의 1/3인 큰 그룹 하나"""
+    members = [f"참가자{i}" for i in range(n)]
+    order = list(range(n))
+    rng.shuffle(order)
+    groups = {}
+    start = 0
+    while start < n // 2:
+        size = rng.randint(2, 12)
+        groups[f"팀{len(groups)}"] = [members[i] for i in order[start:start + size]]
+        start += size
+    for _ in range(n // 50):
+        groups[f"모임{len(groups)}"] = rng.sample(members, rng.randint(2, 8))
+    groups["큰그룹"] = rng.sample(members, n // 3)
+    return members, groups
+
+def test_matches_small_path_with_full_probe():
+    """살펴볼 모둠 수를 제한하지 않으면 allocate_roster와 똑같은 배치가 나오는지 확인"""
+
+    print("🏟️ 큰 명단 배치 테스트")
+    print("=" * 50)
+
+    rng = random.Random(0)
+    for trial in range(200):
+        n = rng.randint(5, 120)
+        members = [f"사람{i}" for i in range(n)]
+        groups = {
+            f"그룹{g}": rng.sample(members, rng.randint(2, min(30, n)))
+            for g in range(rng.randint(0, 15))
+        }
+        roster = Roster(members, groups)
+        group_sizes = calculate_group_sizes(n)
+        seed = rng.random()
+
+        small = allocate_roster(roster, group_sizes, random.Random(seed))
+        large = allocate_roster_large(roster, group_sizes, random.Random(seed), probe_limit=len(group_sizes))
+        assert large.teams == small.teams
+        assert large.conflicts() == small.conflicts()
+
+        # 기본 probe_limit에서도 모둠 크기는 같다
+        default = allocate_roster_large(roster, group_sizes, random.Random(seed))
+        assert [len(team) for team in default.teams] == group_sizes
+    print("  200개 명단에서 allocate_roster와 같은 배치")
+
+def test_large_event_spreads_groups():
+    """2만 명에서도 모둠 크기가 같고, 그룹마다 고르게 퍼져 충돌 수가 하한과 같은지 확인"""
+    n = 20000
+    members, groups = make_event_roster(n, random.Random(1))
+    group_sizes = calculate_group_sizes(n)
+
+    start = time.perf_counter()
+    teams = allocate_seats_with_groups(members, group_sizes, groups, rng=1)
+    elapsed = time.perf_counter() - start
+
+    roster = Roster(members, groups)
+    conflicts = analyze_roster_conflicts(roster, roster.to_ids(teams))['conflicts']
+    lower_bound = conflict_lower_bound(roster, len(group_sizes))
+    print(f"  {n}명, {len(groups)}개 그룹: {elapsed:.3f}초, 충돌 {conflicts} (하한 {lower_bound})")
+    assert [len(team) for team in teams] == group_sizes
+    assert sorted(member for team in teams for member in team) == sorted(members)
+    assert conflicts == lower_bound
+
+def test_overlapping_groups_match_small_path():
+    """그룹이 많이 겹치는 2400명 명단에서 큰 명단 경로가 작은 명단 경로와 같은 배치를 내는지 확인"""
+    n = 2400
+    members, groups = generate_workload(n, num_groups=250, min_size=20, max_size=120, overlap=0.7, seed=0)
+    roster = Roster(members, groups)
+    group_sizes = calculate_group_sizes(n)
+
+    large_size = seat_allocation.LARGE_ROSTER_SIZE
+    for seed in range(3):
+        large = allocate_roster(roster, group_sizes, random.Random(seed))
+        seat_allocation.LARGE_ROSTER_SIZE = n + 1  # 작은 명단 경로(TeamOccupancy)로 배치
+        try:
+            small = allocate_roster(roster, group_sizes, random.Random(seed))
+        finally:
+            seat_allocation.LARGE_ROSTER_SIZE = large_size
+        assert type(large) is not type(small)
+        assert large.conflicts() == small.conflicts()
+        assert large.teams == small.teams
+        print(f"  겹치는 그룹 {n}명, 시드 {seed}: 충돌 {large.conflicts()} (작은 명단 경로와 같음)")
+
+def scaling_benchmark(sizes=(1000, 3000, 10000, 30000, 100000), seed=0):
+    """인원을 늘려 가며 명단 변환과 배치 시간을 잰다 (거의 선형이어야 한다)."""
+    print("\n📈 인원별 배치 시간")
+    print("=" * 50)
+    print(f"{'인원':>8} {'그룹':>7} {'Roster':>9} {'배치':>9} {'명당 µs':>9} {'충돌':>7} {'하한':>7}")
+
+    rng = random.Random(seed)
+    rows = []
+    for n in sizes:
+        members, groups = make_event_roster(n, rng)
+        group_sizes = calculate_group_sizes(n)
+
+        start = time.perf_counter()
+        roster = Roster(members, groups)
+        built = time.perf_counter()
+        occupancy = allocate_roster(roster, group_sizes, random.Random(seed))
+        allocated = time.perf_counter()
+
+        per_member_us = (allocated - start) / n * 1e6
+        rows.append((n, allocated - start))
+        print(f"{n:>8} {len(groups):>7} {built - start:>8.3f}s {allocated - built:>8.3f}s "
+              f"{per_member_us:>9.1f} {occupancy.conflicts():>7} "
+              f"{conflict_lower_bound(roster, len(group_sizes)):>7}")
+
+    # 인원이 k배일 때 시간이 몇 배인지 (선형이면 k 근처)
+    (small_n, small_time), (large_n, large_time) = rows[0], rows[-1]
+    print(f"\n  인원 {large_n // small_n}배 → 시간 {large_time / small_time:.1f}배")
+    return rows
+
+if __name__ == "__main__":
+    test_matches_small_path_with_full_probe()
+    test_large_event_spreads_groups()
+    test_overlapping_groups_match_small_path()
+    scaling_benchmark()
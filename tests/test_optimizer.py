@@ -0,0 +1,75 @@
+"""
+맞바꾸기 탐색(후처리 최적화) 테스트
+"""
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import *
+
+def make_random_case(rng, n, num_groups):
+    members = [f"사람{i}" for i in range(1, n + 1)]
+    groups = {
+        f"그룹{j}": rng.sample(members, rng.randint(2, min(n, 12)))
+        for j in range(num_groups)
+    }
+    return members, groups
+
+def test_swap_delta():
+    """맞바꾸기 변화량이 전체 재계산 결과와 같은지 확인"""
+
+    print("🔀 맞바꾸기 변화량 테스트")
+    print("=" * 50)
+
+    rng = random.Random(7)
+    members, groups = make_random_case(rng, 30, 8)
+    roster = Roster(members, groups)
+    occupancy = allocate_roster(roster, calculate_group_sizes(len(members)))
+
+    for _ in range(300):
+        a, b = rng.sample(range(len(roster)), 2)
+        before = occupancy.conflicts()
+        delta = occupancy.swap_delta(a, b)
+        occupancy.swap(a, b)
+        assert occupancy.conflicts() - before == delta
+        assert occupancy.conflicts() == count_roster_conflicts(roster, occupancy.teams)
+
+    print("  ✅ 300회 맞바꾸기 모두 일치")
+
+def test_optimize_allocation():
+    """최적화가 충돌을 늘리지 않고 모둠 크기를 지키는지 확인"""
+
+    print("\n🎯 맞바꾸기 최적화 테스트")
+    print("=" * 50)
+
+    rng = random.Random(11)
+    for i in range(10):
+        members, groups = make_random_case(rng, rng.randint(20, 60), rng.randint(3, 10))
+        group_sizes = calculate_group_sizes(len(members))
+        roster = Roster(members, groups)
+
+        occupancy = allocate_roster(roster, group_sizes)
+        greedy = occupancy.conflicts()
+        optimized = optimize_allocation(occupancy, max_iterations=5000)
+        lower_bound = conflict_lower_bound(roster, len(group_sizes))
+
+        print(f"  시도 {i+1}: 그리디 {greedy}개 → 최적화 {optimized}개 (하한 {lower_bound}개)")
+
+        assert lower_bound <= optimized <= greedy
+        assert optimized == count_roster_conflicts(roster, occupancy.teams)
+        assert [len(team) for team in occupancy.teams] == group_sizes
+
+def test_optimize_ms_is_reproducible():
+    """optimize_ms는 반복 예산이라 rng가 같으면 같은 배치가 나오는지 확인"""
+    members, groups = make_random_case(random.Random(5), 60, 12)
+    group_sizes = calculate_group_sizes(len(members))
+    first = allocate_seats_with_groups(members, group_sizes, groups, optimize_ms=20, rng=7)
+    second = allocate_seats_with_groups(members, group_sizes, groups, optimize_ms=20, rng=7)
+    assert first == second
+    print(f"  optimize_ms=20, 시드 7: 두 번 모두 충돌 {calculate_group_conflicts(groups, first)}개")
+
+if __name__ == "__main__":
+    test_swap_delta()
+    test_optimize_allocation()
+    test_optimize_ms_is_reproducible()
@@ -3,20 +3,25 @@
 """
 import sys
 import os
+import csv
 import time
 import random
+import argparse
+import tracemalloc
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from seat_allocation import *
+from workloads import WORKLOAD_CLASSES, make_workload
 
-def old_algorithm_simulation(members, group_sizes, groups, max_attempts=1000):
+def old_algorithm_simulation(members, group_sizes, groups, max_attempts=1000, rng=None):
     """기존 1000번 시도 알고리즘 시뮬레이션"""
+    rng = make_rng(rng)
     best_assignment = None
     min_conflicts = float('inf')
     
     for attempt in range(max_attempts):
         shuffled_members = members.copy()
-        random.shuffle(shuffled_members)
+        rng.shuffle(shuffled_members)
         
         teams = []
         start_idx = 0
@@ -104,6 +109,195 @@ def test_consistency():
     print(f"   평균 충돌: {avg_conflicts:.1f}개")
     print(f"   평균 시간: {avg_time:.4f}초")
 
+def test_vectorized_scoring():
+    """numpy 일괄 채점이 하나씩 계산한 충돌 수와 같은지, 얼마나 빠른지 비교"""
+    try:
+        import numpy as np
+    except ImportError:
+        print("\n⏭️  numpy가 없어 일괄 채점 테스트를 건너뜁니다.")
+        return
+    
+    members = load_members()
+    groups = load_groups()
+    group_sizes = calculate_group_sizes(len(members))
+    roster = Roster(members, groups)
+    
+    print("\n🧮 일괄 채점 (1000개 무작위 배치):")
+    
+    assignments = random_assignments(group_sizes, 1000, seed=0)
+    
+    start_time = time.time()
+    scores = score_assignments(
+        assignments, roster_incidence(roster), len(group_sizes), len(roster.group_names)
+    )
+    vectorized_time = time.time() - start_time
+    
+    start_time = time.time()
+    expected = []
+    for row in assignments:
+        id_teams = [np.flatnonzero(row == team).tolist() for team in range(len(group_sizes))]
+        expected.append(calculate_group_conflicts(groups, roster.to_names(id_teams)))
+    loop_time = time.time() - start_time
+    
+    print(f"   ⏱️  일괄 채점: {vectorized_time:.4f}초, 하나씩: {loop_time:.4f}초")
+    print(f"   🎯 최소 충돌: {scores.min()}개")
+    assert scores.tolist() == expected
+
+def _allocate_large(members, group_sizes, groups, seed):
+    roster = Roster(members, groups)
+    return roster.to_names(allocate_roster_large(roster, group_sizes, random.Random(seed)).teams)
+
+# 전략 이름 → (배치 함수(members, group_sizes, groups, seed) → 팀 목록, 돌릴 최대 인원 또는 None)
+PARETO_STRATEGIES = {
+    "random_1000": (lambda m, s, g, seed: old_algorithm_simulation(m, s, g, rng=seed), 1000),
+    "allocate_seats": (lambda m, s, g, seed: allocate_seats(m, s, rng=seed), None),
+    "greedy": (lambda m, s, g, seed: allocate_seats_with_groups(m, s, g, rng=seed), None),
+    "greedy+optimize_200": (lambda m, s, g, seed: allocate_seats_with_groups(m, s, g, optimize_ms=200, rng=seed), None),
+    "large_path": (_allocate_large, None),
+    "best_of_8": (lambda m, s, g, seed: best_of(8, m, s, g, workers=2, seed=seed)["teams"], None),
+    "exact_1s": (lambda m, s, g, seed: allocate_seats_exact(m, s, g, time_limit_ms=1000, rng=seed)["teams"], None)
+}
+if np is not None:
+    PARETO_STRATEGIES["numpy_random_1000"] = (
+        lambda m, s, g, seed: best_random_allocation(m, s, g, count=1000, seed=seed), 1000
+    )
+
+PARETO_FIELDS = ["kind", "members", "groups", "strategy", "conflicts", "lower_bound", "gap", "seconds", "peak_kb"]
+
+def measure_strategy(allocate, members, group_sizes, groups, seed):
+    """(팀 목록, 걸린 시간(초), 최대 메모리(바이트)).
+
+    tracemalloc을 켜면 실행이 느려지므로 시간과 메모리는 따로 한 번씩 돌려 잰다.
+    작업 프로세스(best_of)에서 쓴 메모리는 잡히지 않는다.
+    """
+    start = time.perf_counter()
+    teams = allocate(members, group_sizes, groups, seed)
+    seconds = time.perf_counter() - start
+    
+    tracemalloc.start()
+    try:
+        allocate(members, group_sizes, groups, seed)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return teams, seconds, peak
+
+def run_pareto(sizes=(100, 1000, 5000), kinds=None, strategies=None, seed=0):
+    """작업량 종류 × 인원 × 전략마다 충돌 수, 하한과의 차이, 시간, 최대 메모리를 잰 행 목록"""
+    rows = []
+    for kind in kinds or WORKLOAD_CLASSES:
+        for n in sizes:
+            members, groups = make_workload(kind, n, seed=seed)
+            group_sizes = calculate_group_sizes(n)
+            roster = Roster(members, groups)
+            lower_bound = conflict_lower_bound(roster, len(group_sizes))
+            for name in strategies or PARETO_STRATEGIES:
+                allocate, max_members = PARETO_STRATEGIES[name]
+                if max_members is not None and n > max_members:
+                    continue
+                teams, seconds, peak = measure_strategy(allocate, members, group_sizes, groups, seed)
+                assert [len(team) for team in teams] == group_sizes
+                assert sorted(member for team in teams for member in team) == sorted(members)
+                conflicts = calculate_group_conflicts(groups, teams, roster)
+                rows.append({
+                    "kind": kind, "members": n, "groups": len(groups), "strategy": name,
+                    "conflicts": conflicts, "lower_bound": lower_bound, "gap": conflicts - lower_bound,
+                    "seconds": round(seconds, 6), "peak_kb": round(peak / 1024, 1)
+                })
+    return rows
+
+def pareto_front(rows):
+    """충돌 수와 시간 둘 다에서 나은 다른 전략이 없는 행들 (같은 작업량, 같은 인원끼리 비교)"""
+    def dominated(row):
+        return any(
+            other["kind"] == row["kind"] and other["members"] == row["members"]
+            and other["conflicts"] <= row["conflicts"] and other["seconds"] <= row["seconds"]
+            and (other["conflicts"], other["seconds"]) != (row["conflicts"], row["seconds"])
+            for other in rows
+        )
+    return [row for row in rows if not dominated(row)]
+
+def write_pareto_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=PARETO_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def format_pareto_summary(rows):
+    """작업량 종류마다 인원별 표. ★는 파레토 최적(충돌·시간 모두 더 나은 전략이 없음)."""
+    front = {id(row) for row in pareto_front(rows)}
+    lines = []
+    for kind in dict.fromkeys(row["kind"] for row in rows):
+        lines.append(f"📊 {kind}")
+        lines.append("=" * 60)
+        lines.append(f"{'인원':>6}  {'전략':<22}{'충돌':>7}{'하한차':>7}{'시간(초)':>10}{'메모리KB':>11}")
+        for row in rows:
+            if row["kind"] != kind:
+                continue
+            mark = "★" if id(row) in front else " "
+            lines.append(
+                f"{row['members']:>6} {mark}{row['strategy']:<22}{row['conflicts']:>7}{row['gap']:>7}"
+                f"{row['seconds']:>10.4f}{row['peak_kb']:>11.1f}"
+            )
+        for n in dict.fromkeys(row["members"] for row in rows if row["kind"] == kind):
+            names = [row["strategy"] for row in rows if row["kind"] == kind and row["members"] == n and id(row) in front]
+            lines.append(f"  {n}명 파레토 최적: {', '.join(names)}")
+        lines.append("")
+    return "\n".join(lines)
+
+def pareto_report(sizes=(100, 1000, 5000), kinds=None, strategies=None, seed=0, csv_path="pareto_results.csv"):
+    """run_pareto 결과를 CSV와 같은 이름의 .txt 요약으로 남기고 요약을 출력한다."""
+    rows = run_pareto(sizes, kinds, strategies, seed)
+    summary = format_pareto_summary(rows)
+    print(summary)
+    if csv_path:
+        write_pareto_csv(rows, csv_path)
+        with open(os.path.splitext(csv_path)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary)
+        print(f"💾 {csv_path}")
+    return rows
+
+def test_pareto_report():
+    """작은 합성 명단에서 전략별 행, 하한과의 차이, 파레토 최적 표시가 맞는지 확인"""
+    import tempfile
+    
+    strategies = ["random_1000", "allocate_seats", "greedy", "large_path"]
+    rows = run_pareto(sizes=(40,), strategies=strategies, seed=1)
+    assert len(rows) == len(WORKLOAD_CLASSES) * len(strategies)
+    assert all(row["gap"] >= 0 and row["seconds"] >= 0 and row["peak_kb"] > 0 for row in rows)
+    # 못 나누는 그룹은 하한이 0이어도 어떤 전략이든 충돌이 남는다
+    assert all(row["gap"] >= 1 for row in rows if row["kind"] == "inseparable")
+    
+    front = pareto_front(rows)
+    for kind in WORKLOAD_CLASSES:
+        kind_rows = [row for row in rows if row["kind"] == kind]
+        best = min(row["conflicts"] for row in kind_rows)
+        fastest = min(row["seconds"] for row in kind_rows)
+        kind_front = [row for row in front if row["kind"] == kind]
+        assert any(row["conflicts"] == best for row in kind_front)
+        assert any(row["seconds"] == fastest for row in kind_front)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "pareto.csv")
+        write_pareto_csv(rows, csv_path)
+        with open(csv_path, encoding="utf-8") as f:
+            saved = list(csv.DictReader(f))
+    assert [row["strategy"] for row in saved] == [row["strategy"] for row in rows]
+    assert "★" in format_pareto_summary(rows)
+
 if __name__ == "__main__":
-    test_performance_comparison()
-    test_consistency()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="배치 전략 성능 비교")
+    parser.add_argument("--pareto", action="store_true", help="합성 명단으로 전략별 품질-시간 파레토 보고서 만들기")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1000, 5000], help="인원 수들")
+    parser.add_argument("--kinds", nargs="*", choices=sorted(WORKLOAD_CLASSES), help="작업량 종류 (기본: 전부)")
+    parser.add_argument("--strategies", nargs="*", choices=sorted(PARETO_STRATEGIES), help="전략 (기본: 전부)")
+    parser.add_argument("--csv", default="pareto_results.csv", help="결과 CSV (요약은 같은 이름의 .txt)")
+    args = parser.parse_args()
+    
+    if args.pareto:
+        pareto_report(args.sizes, args.kinds, args.strategies, csv_path=args.csv)
+    else:
+        test_performance_comparison()
+        test_consistency()
+        test_vectorized_scoring()
+        test_pareto_report()
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+배치 결과 캐시 테스트
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_cache import ResultCache, allocation_cache_key, normalize_roster
+
+def test_cache_key_is_canonical():
+    """입력 순서가 달라도 같은 키가 나오는지 확인"""
+
+    print("🔑 캐시 키 테스트")
+    print("=" * 50)
+
+    options = {'strategy': 'greedy', 'seed': 1}
+    a = normalize_roster(["B", "A", "C"], {"그룹2": ["C", "A"], "그룹1": ["B"]})
+    b = normalize_roster(["C", "A", "B"], {"그룹1": ["B"], "그룹2": ["A", "C"]})
+    key_a = allocation_cache_key(*a, [3], options)
+    key_b = allocation_cache_key(*b, [3], options)
+    key_c = allocation_cache_key(*a, [3], {'strategy': 'greedy', 'seed': 2})
+    print(f"  {key_a[:16]}... / {key_b[:16]}... / {key_c[:16]}...")
+
+    assert key_a == key_b
+    assert key_a != key_c
+
+def test_lru_and_ttl():
+    """크기 제한(LRU)과 유효 시간(TTL)이 지켜지는지 확인"""
+
+    print("\n🗃️  LRU / TTL 테스트")
+    print("=" * 50)
+
+    cache = ResultCache(max_size=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")          # a를 최근 사용으로
+    cache.put("c", 3)       # b가 밀려난다
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    expiring = ResultCache(max_size=2, ttl_seconds=0.01)
+    expiring.put("a", 1)
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+
+    print(f"  {cache.stats()}")
+    assert cache.stats()['hits'] == 3
+    assert cache.stats()['misses'] == 1
+
+if __name__ == "__main__":
+    test_cache_key_is_canonical()
+    test_lru_and_ttl()
@@ -0,0 +1,87 @@
+"""
+방별 명단 관리(RoomRegistry) 테스트
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rooms import RoomRegistry, RoomNotFound, DEFAULT_ROOM
+
+def test_rooms_are_isolated_and_evicted():
+    """방마다 명단이 따로 있고, 넘치면 오래 안 쓴 방부터 내렸다가 다시 읽는지 확인"""
+
+    print("🏫 방별 명단 테스트")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = RoomRegistry(base_dir=directory, max_rooms=2)
+
+        registry.get("1반").store.set_roster(members=["가", "나"], groups={"그룹": ["가", "나"]})
+        registry.get("2반").store.set_roster(members=["다"])
+        first = registry.get("1반")
+        first.cache.put("키", "결과")
+
+        registry.get("3반")  # 가장 오래 안 쓴 2반이 내려간다
+        print(f"  {registry.stats()}")
+        assert registry.stats()['evictions'] == 1
+        assert registry.get("1반") is first
+
+        # 내려간 방은 저장소에서 다시 읽는다 (결과 캐시는 새로)
+        second = registry.get("2반")
+        assert second.store.members() == ["다"]
+        assert second.cache.get("키") is None
+        assert first.store.groups() == {"그룹": ["가", "나"]}
+
+        # 내려간 뒤 늦게 도착한 쓰기도 잃지 않는다
+        registry.get("4반")
+        registry.get("5반")
+        first.store.set_members(["가", "나", "라"])
+        assert registry.get("1반").store.members() == ["가", "나", "라"]
+
+        assert registry.get(DEFAULT_ROOM) is registry.default
+        registry.close_all()
+
+def test_reload_waits_for_eviction_close():
+    """내리는 중인 방을 다시 찾으면 밀린 쓰기가 끝난 뒤에 읽어 오는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        registry = RoomRegistry(base_dir=directory, max_rooms=1)
+        old = registry.get("1반")
+        old.store.set_members(["가", "나"])
+
+        closing = threading.Event()
+        close = old.close
+        def slow_close():
+            closing.set()
+            time.sleep(0.3)
+            close()
+        old.close = slow_close
+
+        evicting = threading.Thread(target=registry.get, args=("2반",))
+        evicting.start()
+        closing.wait()
+        reloaded = registry.get("1반")  # 내리기가 끝날 때까지 기다린다
+        evicting.join()
+
+        assert reloaded is not old
+        assert reloaded.store.members() == ["가", "나"]
+        registry.close_all()
+    print("  내리는 중인 방은 쓰기가 끝난 뒤 다시 읽음")
+
+def test_invalid_room_id():
+    """디렉터리 밖을 가리킬 수 있는 방 ID는 거부하는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        registry = RoomRegistry(base_dir=directory)
+        for room_id in ["../밖", "a/b", "", "x" * 65, "abc\n", "abc\n\n"]:
+            try:
+                registry.get(room_id)
+            except RoomNotFound:
+                continue
+            raise AssertionError(f"거부되지 않음: {room_id!r}")
+
+if __name__ == "__main__":
+    test_rooms_are_isolated_and_evicted()
+    test_reload_waits_for_eviction_close()
+    test_invalid_room_id()
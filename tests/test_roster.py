@@ -0,0 +1,71 @@
+"""
+정수 ID / 비트마스크 로스터 테스트
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import *
+
+def test_roster_masks():
+    """그룹 소속이 비트마스크로 올바르게 변환되는지 확인"""
+
+    print("🔢 로스터 비트마스크 테스트")
+    print("=" * 50)
+
+    members = ["A", "B", "C", "D"]
+    groups = {
+        "그룹1": ["A", "B"],
+        "그룹2": ["B", "C", "없는사람"]
+    }
+    roster = Roster(members, groups)
+
+    for member_id, name in enumerate(roster.names):
+        print(f"  {member_id}: {name} → {roster.masks[member_id]:02b}")
+
+    assert roster.masks == [0b01, 0b11, 0b10, 0b00]
+    assert roster.shares_group(0, 1)
+    assert not roster.shares_group(0, 2)
+    assert roster.group_members == [[0, 1], [1, 2]]
+
+def test_duplicate_names():
+    """같은 이름의 멤버가 있어도 모두 배치되는지 확인"""
+
+    print("\n👥 동명이인 배치 테스트")
+    print("=" * 50)
+
+    members = ["김민수", "김민수", "이영희", "박철수", "최지우", "정하늘", "한바다"]
+    groups = {"스터디": ["김민수", "이영희"]}
+    group_sizes = calculate_group_sizes(len(members))
+
+    for i in range(5):
+        teams = allocate_seats_with_groups(members, group_sizes, groups)
+        placed = sorted(member for team in teams for member in team)
+        conflicts = calculate_group_conflicts(groups, teams)
+        print(f"  시도 {i+1}: {teams} (충돌: {conflicts}개)")
+
+        assert placed == sorted(members)
+        assert [len(team) for team in teams] == group_sizes
+
+def test_analyze_group_conflicts():
+    """한 번에 계산한 충돌 분석이 개별 계산과 같은지 확인"""
+
+    print("\n📊 충돌 분석 테스트")
+    print("=" * 50)
+
+    teams = [["A", "B", "E"], ["C", "D", "F"]]
+    groups = {
+        "그룹1": ["A", "B", "C"],
+        "그룹2": ["B", "E", "D"]
+    }
+    analysis = analyze_group_conflicts(groups, teams)
+    print(f"  {analysis}")
+
+    assert analysis['conflicts'] == calculate_group_conflicts(groups, teams) == 2
+    assert analysis['group_distributions'] == {"그룹1": [2, 1], "그룹2": [2, 1]}
+    assert len(analysis['conflict_pairs']) == 2
+
+if __name__ == "__main__":
+    test_roster_masks()
+    test_duplicate_names()
+    test_analyze_group_conflicts()
@@ -0,0 +1,105 @@
+"""
+명단/그룹 저장소 테스트
+"""
+import sys
+import os
+import stat
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roster_store import RosterStore, atomic_write
+
+def test_store_reloads_only_on_change():
+    """파일이 바뀔 때만 다시 읽고, 파생 인덱스는 재사용하는지 확인"""
+
+    print("📂 명단 저장소 테스트")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        members_path = os.path.join(directory, "members.txt")
+        groups_path = os.path.join(directory, "groups.txt")
+        with open(members_path, 'w', encoding='utf-8') as f:
+            f.write("가\n나\n다\n")
+        with open(groups_path, 'w', encoding='utf-8') as f:
+            f.write("# 주석\n그룹1:가,나\n")
+
+        store = RosterStore(members_path, groups_path)
+        assert store.members() == ["가", "나", "다"]
+        assert store.groups() == {"그룹1": ["가", "나"]}
+
+        roster = store.roster()
+        version = store.version
+        assert store.roster() is roster  # 바뀐 게 없으면 그대로 재사용
+        assert store.version == version
+
+        # 밖에서 파일을 고치면 다시 읽는다 (크기가 달라지도록)
+        with open(members_path, 'w', encoding='utf-8') as f:
+            f.write("가\n나\n다\n라\n")
+        assert store.members() == ["가", "나", "다", "라"]
+        assert store.roster() is not roster
+        print(f"  버전: {version} → {store.version}")
+
+        # 저장소를 통해 쓰면 메모리에는 바로, 파일에는 flush 후에 반영된다
+        store.set_groups({"그룹2": ["다", " 라 "], "빈그룹": []})
+        assert store.groups() == {"그룹2": ["다", "라"]}
+        store.flush()
+        assert RosterStore(members_path, groups_path).groups() == {"그룹2": ["다", "라"]}
+        store.close()
+
+def test_write_behind_coalesces():
+    """몰려온 쓰기가 모여서 마지막 내용만 원자적으로 쓰이는지 확인"""
+
+    print("\n💾 지연 쓰기 테스트")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        members_path = os.path.join(directory, "members.txt")
+        groups_path = os.path.join(directory, "groups.txt")
+        store = RosterStore(members_path, groups_path, flush_delay=0.05)
+
+        for i in range(50):
+            store.set_roster(members=[f"사람{j}" for j in range(i + 1)], groups={"그룹": ["사람0"]})
+        assert len(store.members()) == 50
+        store.close()
+
+        with open(members_path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        print(f"  파일 줄 수: {len(lines)}, 디렉터리: {sorted(os.listdir(directory))}")
+        assert len(lines) == 50
+        assert sorted(os.listdir(directory)) == ["groups.txt", "members.txt"]  # 임시 파일이 남지 않는다
+
+def test_missing_files():
+    """파일이 없으면 빈 명단으로 동작하는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = RosterStore(os.path.join(directory, "없음.txt"), os.path.join(directory, "없음2.txt"))
+        assert store.members() == []
+        assert store.groups() == {}
+
+def test_atomic_write_keeps_mode():
+    """바꿔 쓴 파일이 원래 권한을 유지하고, 새 파일은 umask를 따르는지 확인"""
+    if os.name != "posix":
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "members.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("가\n")
+        os.chmod(path, 0o644)
+        atomic_write(path, "나\n")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+        
+        os.chmod(path, 0o640)
+        atomic_write(path, "다\n")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+        
+        umask = os.umask(0)
+        os.umask(umask)
+        new_path = os.path.join(directory, "groups.txt")
+        atomic_write(new_path, "")
+        assert stat.S_IMODE(os.stat(new_path).st_mode) == 0o666 & ~umask
+        print(f"  권한 유지: {oct(0o640)}, 새 파일: {oct(0o666 & ~umask)}")
+
+if __name__ == "__main__":
+    test_store_reloads_only_on_change()
+    test_write_behind_coalesces()
+    test_missing_files()
+    test_atomic_write_keeps_mode()
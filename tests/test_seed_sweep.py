@@ -0,0 +1,64 @@
+"""
+시드 스윕 도구(find_failing_case.py) 테스트
+"""
+import sys
+import os
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from seat_allocation import (
+    load_members, load_groups, calculate_group_sizes,
+    allocate_seats_with_groups, calculate_group_conflicts
+)
+from find_failing_case import ROOT, sweep, wilson_interval
+
+SOURCE = {
+    'members_file': os.path.join(ROOT, "members.txt"),
+    'groups_file': os.path.join(ROOT, "groups.txt")
+}
+
+def test_sweep_matches_direct_allocation():
+    """스윕의 충돌 수 분포가 allocate_seats_with_groups로 하나씩 배치한 결과와 같은지 확인"""
+
+    print("🎲 시드 스윕 테스트")
+    print("=" * 50)
+
+    members = load_members(SOURCE['members_file'])
+    groups = load_groups(SOURCE['groups_file'])
+    group_sizes = calculate_group_sizes(len(members))
+    expected = Counter(
+        calculate_group_conflicts(groups, allocate_seats_with_groups(members, group_sizes, groups, rng=seed))
+        for seed in range(100, 400)
+    )
+
+    summary = sweep(SOURCE, start=100, count=300, workers=1, shard_size=70, allowed=0)
+    assert summary['conflicts_histogram'] == dict(sorted(expected.items()))
+    assert sum(summary['time_histogram'].values()) == 300
+    failing = sum(expected.values()) - expected[0]
+    assert summary['failures'] == failing
+    assert all(100 <= seed < 400 and conflicts > 0 for seed, conflicts in summary['failing_seeds'])
+    print(f"  시드 300개: 충돌 분포 {summary['conflicts_histogram']}")
+
+    # 작업 프로세스로 나눠 돌려도 같은 결과
+    parallel = sweep(SOURCE, start=100, count=300, workers=2, shard_size=50, allowed=0)
+    assert parallel['conflicts_histogram'] == summary['conflicts_histogram']
+    assert parallel['failing_seeds'] == summary['failing_seeds']
+
+def test_failure_rate_interval():
+    """Wilson 신뢰구간과 합성 명단(다 떨어뜨릴 수 없는 그룹)의 실패율 확인"""
+    low, high = wilson_interval(0, 1000)
+    assert low == 0.0 and 0 < high < 0.005
+    low, high = wilson_interval(50, 1000)
+    assert low < 0.05 < high
+    assert wilson_interval(1000, 1000)[1] == 1.0
+
+    summary = sweep({'kind': 'inseparable', 'size': 60}, count=50, workers=1)
+    assert summary['lower_bound'] == 0
+    assert summary['failures'] == 50
+    assert summary['failure_rate_interval'][0] > 0.9
+    print(f"  못 나누는 그룹: 실패 {summary['failures']}/{summary['runs']}")
+
+if __name__ == "__main__":
+    test_sweep_matches_direct_allocation()
+    test_failure_rate_interval()
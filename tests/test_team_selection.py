@@ -0,0 +1,134 @@
+"""
+모둠 선택 회귀 테스트
+우선순위 기반 모둠 선택이 예전 lap 루프와 같은 결과를 내는지 확인한다.
+"""
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import *
+
+def lap_allocate_seats(members, group_sizes, groups):
+    """시리즈 이전 allocate_seats_with_groups (비교 기준).
+
+    이름 목록을 섞고, 멤버마다 lap = 0, 1, 2...에 대해 시작 모둠부터 한 바퀴 돌며
+    count_same_group_members가 lap 이하인 첫 모둠에 넣는다.
+    """
+    group_names = list(groups.keys())
+    random.shuffle(group_names)
+
+    shuffled_members = []
+    added_members = set()
+    for group_name in group_names:
+        group_members = groups[group_name].copy()
+        random.shuffle(group_members)
+        for member in group_members:
+            if member not in added_members:
+                shuffled_members.append(member)
+                added_members.add(member)
+
+    ungrouped_members = [member for member in members if member not in added_members]
+    random.shuffle(ungrouped_members)
+    shuffled_members.extend(ungrouped_members)
+
+    index = build_member_group_index(groups)
+    teams = [[] for _ in group_sizes]
+    round_robin_start = 0
+
+    for member in shuffled_members:
+        placed = False
+        for lap in range(len(shuffled_members)):
+            for i in range(len(group_sizes)):
+                team = (round_robin_start + i) % len(group_sizes)
+                if len(teams[team]) >= group_sizes[team]:
+                    continue
+                if count_same_group_members(member, teams[team], groups, index) <= lap:
+                    teams[team].append(member)
+                    round_robin_start = (team + 1) % len(group_sizes)
+                    placed = True
+                    break
+            if placed:
+                break
+
+    return teams
+
+def make_disjoint_groups(rng, members):
+    """서로 겹치지 않는 그룹들. 예전 비용(같은 그룹 팀원 수)과 지금 비용(그룹별 인원 합)이 같아진다."""
+    pool = rng.sample(members, rng.randint(2, len(members)))
+    groups = {}
+    while len(pool) >= 2:
+        size = rng.randint(2, min(len(pool), 10))
+        groups[f"그룹{len(groups)}"] = [pool.pop() for _ in range(size)]
+    return groups
+
+def test_same_result_as_lap_loop():
+    """고정 시드에서 예전 lap 루프와 배치 결과가 같은지 확인
+
+    그룹이 겹치면 예전 비용은 공통 그룹이 있는 팀원 수, 지금 비용은 그룹별 인원의
+    합이라 선택이 달라질 수 있으므로 겹치지 않는 그룹으로만 비교한다.
+    """
+
+    print("🔁 모둠 선택 회귀 테스트")
+    print("=" * 50)
+
+    rng = random.Random(2024)
+    cases = [(load_members(), load_groups())]
+    for _ in range(40):
+        n = rng.randint(5, 60)
+        members = [f"사람{i}" for i in range(1, n + 1)]
+        cases.append((members, make_disjoint_groups(rng, members)))
+
+    checked = 0
+    for members, groups in cases:
+        roster = Roster(members, groups)
+        group_sizes = calculate_group_sizes(len(members))
+        for seed in range(10):
+            random.seed(seed)
+            expected = lap_allocate_seats(members, group_sizes, groups)
+            random.seed(seed)
+            actual = roster.to_names(allocate_roster(roster, group_sizes).teams)
+            assert actual == expected, f"seed={seed}, 멤버 {len(members)}명"
+            checked += 1
+
+    print(f"  ✅ {checked}개 경우 모두 동일")
+
+def test_fixed_seed_real_data():
+    """실제 데이터 고정 시드 결과 출력"""
+    members = load_members()
+    groups = load_groups()
+    group_sizes = calculate_group_sizes(len(members))
+
+    random.seed(0)
+    teams = allocate_seats_with_groups(members, group_sizes, groups)
+    print(f"\n🎯 seed=0 결과 (충돌: {calculate_group_conflicts(groups, teams)}개)")
+    for i, team in enumerate(teams, 1):
+        print(f"  {i}모둠: {team}")
+
+    assert sorted(member for team in teams for member in team) == sorted(members)
+
+def test_seeded_rng():
+    """rng를 넘기면 전역 random 상태와 상관없이 같은 결과가 나오는지 확인"""
+    members = load_members()
+    groups = load_groups()
+    group_sizes = calculate_group_sizes(len(members))
+
+    random.seed(1)
+    first = allocate_seats_with_groups(members, group_sizes, groups, rng=random.Random(123))
+    state = random.getstate()
+    random.seed(2)
+    second = allocate_seats_with_groups(members, group_sizes, groups, rng=123)
+
+    print(f"\n🎲 rng=123 결과 동일: {first == second}")
+    assert first == second
+    assert allocate_seats(members, group_sizes, rng=7) == allocate_seats(members, group_sizes, rng=7)
+
+    # 전역 random 상태는 건드리지 않는다
+    random.seed(1)
+    allocate_seats_with_groups(members, group_sizes, groups, rng=123)
+    assert random.getstate() == state
+
+if __name__ == "__main__":
+    test_same_result_as_lap_loop()
+    test_fixed_seed_real_data()
+    test_seeded_rng()
@@ -0,0 +1,85 @@
+"""
+합성 명단/그룹 생성기 테스트
+"""
+import sys
+import os
+import random
+import tempfile
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seat_allocation import (
+    Roster, load_members, load_groups, calculate_group_sizes,
+    allocate_roster, conflict_lower_bound
+)
+from workloads import WORKLOAD_CLASSES, generate_workload, make_workload, write_workload
+
+def memberships(groups):
+    return Counter(member for group in groups.values() for member in group)
+
+def test_generated_workloads():
+    """시드 재현성, 그룹 수/크기, 겹침 정도가 인자대로인지 확인"""
+
+    print("🧪 합성 명단 생성 테스트")
+    print("=" * 50)
+
+    for kind in WORKLOAD_CLASSES:
+        assert make_workload(kind, 500, seed=3) == make_workload(kind, 500, seed=3)
+    assert generate_workload(500, seed=1) != generate_workload(500, seed=2)
+
+    members, groups = generate_workload(1000, num_groups=100, min_size=3, max_size=7, seed=0)
+    assert len(members) == len(set(members)) == 1000
+    assert len(groups) == 100
+    assert all(3 <= len(group) <= 7 for group in groups.values())
+    assert all(len(group) == len(set(group)) for group in groups.values())
+    # overlap=0이면 그룹끼리 겹치지 않는다
+    assert max(memberships(groups).values()) == 1
+
+    _, overlapping = generate_workload(1000, num_groups=100, overlap=0.5, seed=0)
+    multi = sum(1 for count in memberships(overlapping).values() if count > 1)
+    assert multi > 50
+    print(f"  겹침 0.5: 여러 그룹에 속한 멤버 {multi}명")
+
+    # 멤버보다 그룹 자리가 많아도 끝난다
+    _, crowded = generate_workload(30, num_groups=20, min_size=5, max_size=10, seed=0)
+    assert len(crowded) == 20 and all(len(group) == len(set(group)) for group in crowded.values())
+
+    _, heavy = generate_workload(5000, num_groups=500, distribution='zipf', max_size=80, seed=0)
+    sizes = sorted(len(group) for group in heavy.values())
+    assert sizes[len(sizes) // 2] <= 3 and sizes[-1] > 20
+    print(f"  zipf 크기: 중앙값 {sizes[len(sizes) // 2]}, 최대 {sizes[-1]}")
+
+def test_pathological_cases():
+    """모둠 수보다 큰 그룹은 하한이 0보다 크고, 못 나누는 그룹은 하한이 0이어도 충돌이 남는지 확인"""
+    for n in (23, 200, 3000):
+        group_sizes = calculate_group_sizes(n)
+        num_teams = len(group_sizes)
+
+        members, groups = make_workload('oversized', n, seed=0)
+        assert len(groups['모둠수초과']) > num_teams
+        assert conflict_lower_bound(Roster(members, groups), num_teams) > 0
+
+        members, groups = make_workload('inseparable', n, seed=0)
+        hard = {name: group for name, group in groups.items() if name.startswith('못나눔')}
+        assert all(len(group) <= num_teams for group in hard.values())
+        roster = Roster(members, hard)
+        assert conflict_lower_bound(roster, num_teams) == 0
+        occupancy = allocate_roster(roster, group_sizes, random.Random(0))
+        assert occupancy.conflicts() >= 1
+        print(f"  {n}명: 못 나누는 그룹 하한 0, 배치 충돌 {occupancy.conflicts()}")
+
+def test_write_roundtrip():
+    """members.txt / groups.txt로 쓰고 다시 읽으면 같은지 확인"""
+    members, groups = make_workload('overlapping', 300, seed=5)
+    with tempfile.TemporaryDirectory() as directory:
+        members_path = os.path.join(directory, 'members.txt')
+        groups_path = os.path.join(directory, 'groups.txt')
+        write_workload(members, groups, members_path, groups_path)
+        assert load_members(members_path) == members
+        assert load_groups(groups_path) == groups
+    print("  파일로 쓰고 읽기 일치")
+
+if __name__ == "__main__":
+    test_generated_workloads()
+    test_pathological_cases()
+    test_write_roundtrip()
@@ -2,15 +2,31 @@
 웹 서버 및 API 엔드포인트
 Flask를 사용한 백엔드 서버
 """
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, jsonify, request, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import os
 import json
 import time
+import random
+import atexit
+import hashlib
+import mimetypes
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from seat_allocation import (
-    load_members, load_groups, calculate_group_sizes,
-    allocate_seats_with_groups, calculate_group_conflicts
+    calculate_group_sizes,
+    Roster, allocate_roster, analyze_roster_conflicts,
+    optimize_allocation, conflict_lower_bound, solve_exact, best_of,
+    iter_allocations, OPTIMIZE_ITERATIONS_PER_MS
 )
+from seat_allocation import allocate_seats as allocate_random_seats
+from result_cache import ResultCache, allocation_cache_key, normalize_roster
+from roster_store import RosterStore
+from rooms import RoomRegistry, RoomNotFound, DEFAULT_ROOM
+from allocation_jobs import JobManager, TERMINAL_EVENTS
+from rotation import plan_rotation
+from history_store import HistoryStore, apply_edit
+from arrangements import Arrangement, StaleArrangement
 
 app = Flask(__name__)
 CORS(app)  # CORS 허용
@@ -18,24 +34,138 @@ CORS(app)  # CORS 허용
 # 서버 시작 시간 기록
 SERVER_START_TIME = str(int(time.time() * 1000))
 
+# 요청 하나의 맞바꾸기 탐색 예산(optimize_ms) 상한.
+# 같은 시드면 같은 배치가 나오도록 모든 경로(배치, 여러 시드, 후보 여러 개, 로테이션)에서
+# 시간이 아닌 반복 횟수(OPTIMIZE_ITERATIONS_PER_MS × optimize_ms)로 쓰므로 정확한 밀리초가 아니다.
+MAX_OPTIMIZE_MS = 5000
+
+# 정확한 해 탐색(strategy='exact')의 기본 시간 제한 (밀리초)
+DEFAULT_EXACT_TIME_LIMIT_MS = 2000
+
+# 여러 시드 배치(best_of)에 쓸 프로세스 수와 요청 하나의 최대 실행 횟수
+ALLOCATION_WORKERS = int(os.environ.get('ALLOCATION_WORKERS', os.cpu_count() or 1))
+MAX_BEST_OF = 256
+
+# /api/allocate/batch 요청 하나가 만들 수 있는 최대 후보 수
+MAX_BATCH_ALLOCATIONS = 1000
+
+# 요청마다 프로세스를 띄우지 않도록 한 번 만든 풀을 계속 쓴다
+_allocation_pool = None
+
+def _warm_up_worker():
+    """작업 프로세스가 모듈을 미리 불러오도록 하는 빈 작업"""
+    return os.getpid()
+
+def get_allocation_pool():
+    """배치용 프로세스 풀을 (처음이면 만들어서 미리 띄운 뒤) 돌려준다."""
+    global _allocation_pool
+    if _allocation_pool is None:
+        _allocation_pool = ProcessPoolExecutor(max_workers=ALLOCATION_WORKERS)
+        for future in [_allocation_pool.submit(_warm_up_worker) for _ in range(ALLOCATION_WORKERS)]:
+            future.result()
+    return _allocation_pool
+
+# 방(교실/동아리)별 명단 저장소와 배치 결과 캐시
+# - 명단 변경은 메모리에 바로 반영하고 파일에는 백그라운드에서 모아서 쓴다
+# - 같은 명단/그룹/옵션/시드 요청은 다시 계산하지 않는다
+# - 기본 방은 작업 디렉터리의 members.txt / groups.txt, 다른 방은 ROOMS_DIR/<방 ID>/
+rooms = RoomRegistry(
+    base_dir=os.environ.get('ROOMS_DIR', 'rooms'),
+    max_rooms=int(os.environ.get('MAX_ROOMS', 256)),
+    default_store=RosterStore(),
+    default_cache=ResultCache(
+        max_size=int(os.environ.get('ALLOCATION_CACHE_SIZE', 256)),
+        ttl_seconds=float(os.environ.get('ALLOCATION_CACHE_TTL', 600))
+    ),
+    cache_size=int(os.environ.get('ROOM_CACHE_SIZE', 32)),
+    cache_ttl=float(os.environ.get('ALLOCATION_CACHE_TTL', 600))
+)
+atexit.register(rooms.close_all)
+
+# 기본 방의 저장소와 캐시 (방을 지정하지 않은 /api/... 요청이 쓴다)
+roster_store = rooms.default.store
+allocation_cache = rooms.default.cache
+
+@app.errorhandler(RoomNotFound)
+def room_not_found(e):
+    return jsonify({
+        'success': False,
+        'error': f'방을 찾을 수 없습니다: {e.args[0]}'
+    }), 404
+
+# 배치/이동/교환 기록 (모든 방이 SQLite 파일 하나를 함께 쓴다)
+history_store = HistoryStore(os.environ.get('HISTORY_DB', 'history.sqlite3'))
+atexit.register(history_store.close)
+
+# 화면에서 고치는 중인 배치 (/api/arrangements, /api/evaluate-move). 오래 안 쓰면 버린다.
+arrangements = ResultCache(
+    max_size=int(os.environ.get('ARRANGEMENT_CACHE_SIZE', 1024)),
+    ttl_seconds=float(os.environ.get('ARRANGEMENT_TTL', 3600))
+)
+
+# /api/rotation 요청 하나가 짤 수 있는 최대 회차 수와 회차당 기본 맞바꾸기 횟수
+MAX_ROTATION_ROUNDS = 20
+DEFAULT_ROTATION_ITERATIONS = 20000
+
+# 백그라운드 배치 작업 (/api/jobs)
+job_manager = JobManager(max_workers=int(os.environ.get('ALLOCATION_JOB_WORKERS', 2)))
+atexit.register(job_manager.shutdown)
+
+# 여러 프로세스로 서비스할 때(serve.py) 작업과 편집 중인 배치는 그것을 만든 프로세스에만 있다.
+# 그래서 ID 앞에 이 프로세스의 접두사('w<워커 번호>-')를 붙이고, 다른 프로세스의 ID로
+# 요청이 오면 이 함수(ID → 응답 또는 None)로 주인 프로세스에 넘긴다.
+worker_id_prefix = ''
+request_forwarder = None
+
+# SSE 연결이 끊기지 않도록 이벤트가 없을 때 보내는 간격 (초)
+SSE_KEEPALIVE_SECONDS = 15
+
+# /api/test가 쓰는 고정 시드
+TEST_SEED = 0
+
 # 정적 파일 경로
 WEB_UI_PATH = os.path.join(os.path.dirname(__file__), 'web_ui')
 
+# 미리 읽어 둔 정적 파일 (파일 이름 → (내용, mimetype, ETag)). 비어 있으면 매번 디스크에서 읽는다.
+static_assets = {}
+
+def preload_static_assets():
+    """web_ui의 파일을 메모리에 올려 둔다 (serve 모드에서 워커를 띄우기 전에 한 번)."""
+    for filename in os.listdir(WEB_UI_PATH):
+        path = os.path.join(WEB_UI_PATH, filename)
+        if not os.path.isfile(path):
+            continue
+        with open(path, 'rb') as f:
+            content = f.read()
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        static_assets[filename] = (content, mimetype, hashlib.sha1(content).hexdigest())
+
+def send_web_ui_file(filename):
+    asset = static_assets.get(filename)
+    if asset is None:
+        return send_from_directory(WEB_UI_PATH, filename)
+    content, mimetype, etag = asset
+    response = app.response_class(content, mimetype=mimetype)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
 @app.route('/')
 def serve_index():
     """메인 페이지 서빙"""
-    return send_from_directory(WEB_UI_PATH, 'index.html')
+    return send_web_ui_file('index.html')
 
 @app.route('/<path:filename>')
 def serve_static(filename):
     """정적 파일 서빙"""
-    return send_from_directory(WEB_UI_PATH, filename)
+    return send_web_ui_file(filename)
 
 @app.route('/api/members', methods=['GET'])
-def get_members():
+@app.route('/api/rooms/<room_id>/members', methods=['GET'])
+def get_members(room_id=DEFAULT_ROOM):
     """멤버 목록 조회"""
+    room = rooms.get(room_id)
     try:
-        members = load_members()
+        members = room.store.members()
         return jsonify({
             'success': True,
             'members': members,
@@ -48,16 +178,17 @@ def get_members():
         }), 500
 
 @app.route('/api/members', methods=['POST'])
-def update_members():
+@app.route('/api/rooms/<room_id>/members', methods=['POST'])
+def update_members(room_id=DEFAULT_ROOM):
     """멤버 목록 업데이트"""
+    room = rooms.get(room_id)
     try:
         data = request.json
         members = data.get('members', [])
         
         # 멤버 파일 업데이트
-        with open('members.txt', 'w', encoding='utf-8') as f:
-            for member in members:
-                f.write(f"{member.strip()}\n")
+        room.store.set_members(members)
+        room.cache.clear()
         
         return jsonify({
             'success': True,
@@ -71,10 +202,12 @@ def update_members():
         }), 500
 
 @app.route('/api/groups', methods=['GET'])
-def get_groups():
+@app.route('/api/rooms/<room_id>/groups', methods=['GET'])
+def get_groups(room_id=DEFAULT_ROOM):
     """그룹 정보 조회"""
+    room = rooms.get(room_id)
     try:
-        groups = load_groups()
+        groups = room.store.groups()
         return jsonify({
             'success': True,
             'groups': groups,
@@ -87,22 +220,17 @@ def get_groups():
         }), 500
 
 @app.route('/api/groups', methods=['POST'])
-def update_groups():
+@app.route('/api/rooms/<room_id>/groups', methods=['POST'])
+def update_groups(room_id=DEFAULT_ROOM):
     """그룹 정보 업데이트"""
+    room = rooms.get(room_id)
     try:
         data = request.json
         groups = data.get('groups', {})
         
         # 그룹 파일 업데이트
-        with open('groups.txt', 'w', encoding='utf-8') as f:
-            f.write("# 그룹 설정 파일\n")
-            f.write("# 같은 그룹의 멤버들은 가능한 한 다른 모둠에 배치됩니다.\n")
-            f.write("# 형식: 각 줄에 그룹명:멤버1,멤버2,멤버3 형식으로 작성\n")
-            f.write("# '#'으로 시작하는 줄은 주석입니다.\n\n")
-            
-            for group_name, group_members in groups.items():
-                if group_members:
-                    f.write(f"{group_name}:{','.join(group_members)}\n")
+        room.store.set_groups(groups)
+        room.cache.clear()
         
         return jsonify({
             'success': True,
@@ -115,19 +243,287 @@ def update_groups():
             'error': str(e)
         }), 500
 
+def parse_allocation_options(data):
+    """요청 본문에서 배치 옵션을 읽는다. 범위를 벗어난 값은 허용 범위로 자른다."""
+    # 배치 방식: 'greedy'(기본) 또는 'exact'(최소 충돌 보장, 시간 제한 내)
+    strategy = data.get('strategy') or 'greedy'
+    if strategy not in ('greedy', 'exact'):
+        raise ValueError(f'알 수 없는 배치 방식입니다: {strategy}')
+    
+    seed = data.get('seed')
+    return {
+        'strategy': strategy,
+        # 맞바꾸기 탐색 예산 (OPTIMIZE_ITERATIONS_PER_MS배 반복 횟수로 쓴다, 0이면 그리디 결과 그대로)
+        'optimize_ms': min(max(int(data.get('optimize_ms') or 0), 0), MAX_OPTIMIZE_MS),
+        'time_limit_ms': min(max(int(data.get('time_limit_ms') or DEFAULT_EXACT_TIME_LIMIT_MS), 1), MAX_OPTIMIZE_MS),
+        # 여러 시드로 돌려 가장 좋은 배치 고르기 (1이면 한 번만)
+        'best_of': min(max(int(data.get('best_of') or 1), 1), MAX_BEST_OF),
+        'seed': None if seed is None else int(seed)
+    }
+
+def compute_allocation(members, groups, options, roster=None, on_improve=None, should_stop=None):
+    """배치를 실행하고 응답에 담을 결과를 만든다.
+    
+    시드가 없으면 새로 뽑아서 결과에 담아 주므로, 같은 입력과 옵션에 그 시드를
+    넘기면 같은 배치를 다시 만들 수 있다. 그래서 맞바꾸기 탐색도 시간이 아니라
+    optimize_ms에 비례한 반복 횟수로 제한한다.
+    
+    on_improve(충돌 수, ID 팀 목록)는 지금까지의 최선이 나아질 때마다 불리고,
+    should_stop()이 참이 되면 탐색을 멈추고 그때까지의 최선으로 결과를 만든다.
+    """
+    seed = options['seed']
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    rng = random.Random(seed)
+    optimize_iterations = OPTIMIZE_ITERATIONS_PER_MS * options['optimize_ms']
+    
+    # 모둠 크기 계산
+    group_sizes = calculate_group_sizes(len(members))
+    
+    # 멤버/그룹을 정수 ID와 비트마스크로 변환 (이름은 응답에서만 사용)
+    if roster is None:
+        roster = Roster(members, groups)
+    
+    # 자리 배치
+    solver = None
+    if groups and options['strategy'] == 'exact':
+        solver = solve_exact(
+            roster, group_sizes, options['time_limit_ms'], rng,
+            on_improve=on_improve, should_stop=should_stop
+        )
+        id_teams = solver.pop('teams')
+    elif groups and options['best_of'] > 1 and (on_improve or should_stop):
+        # 진행 상황을 알리거나 중간에 멈출 수 있도록 후보를 하나씩 받아 고른다
+        # (best_of와 같은 시드 순서, 같은 선택 기준이라 결과도 같다)
+        best = None
+        runs = 0
+        for _, run_seed, conflicts, names in iter_allocations(
+            options['best_of'], members, group_sizes, groups,
+            seed=seed,
+            optimize_iterations=optimize_iterations,
+            executor=get_allocation_pool(),
+            workers=ALLOCATION_WORKERS
+        ):
+            runs += 1
+            if best is None or (conflicts, run_seed) < best[:2]:
+                if on_improve and (best is None or conflicts < best[0]):
+                    on_improve(conflicts, roster.to_ids(names))
+                best = (conflicts, run_seed, names)
+            if should_stop and should_stop():
+                break
+        solver = {'conflicts': best[0], 'seed': best[1], 'master_seed': seed, 'runs': runs}
+        id_teams = roster.to_ids(best[2])
+    elif groups and options['best_of'] > 1:
+        solver = best_of(
+            options['best_of'], members, group_sizes, groups,
+            workers=ALLOCATION_WORKERS,
+            seed=seed,
+            optimize_iterations=optimize_iterations,
+            executor=get_allocation_pool()
+        )
+        id_teams = roster.to_ids(solver.pop('teams'))
+    elif groups:
+        occupancy = allocate_roster(roster, group_sizes, rng)
+        if on_improve:
+            on_improve(occupancy.conflicts(), occupancy.teams)
+        if optimize_iterations:
+            optimize_allocation(
+                occupancy, max_iterations=optimize_iterations, rng=rng,
+                on_improve=on_improve, should_stop=should_stop
+            )
+        id_teams = occupancy.teams
+    else:
+        id_teams = roster.to_ids(allocate_random_seats(members, group_sizes, rng))
+    
+    # 충돌 수, 그룹별 분배, 충돌 쌍을 한 번에 계산
+    analysis = analyze_roster_conflicts(roster, id_teams)
+    conflicts = analysis['conflicts']
+    
+    teams = roster.to_names(id_teams)
+    
+    return {
+        'teams': teams,
+        'group_sizes': group_sizes,
+        'conflicts': conflicts,
+        'group_distributions': analysis['group_distributions'],
+        'conflict_pairs': analysis['conflict_pairs'],
+        'seed': seed,
+        'stats': {
+            'total_members': len(members),
+            'total_teams': len(teams),
+            'group_constraints': len(groups),
+            'conflict_count': conflicts,
+            'conflict_lower_bound': conflict_lower_bound(roster, len(group_sizes)),
+            'optimize_ms': options['optimize_ms'],
+            'optimize_iterations': optimize_iterations,
+            'strategy': options['strategy']
+        },
+        'solver': solver
+    }
+
+def allocate_cached(members, groups, options, normalized=None, on_improve=None, should_stop=None,
+                    cache=None):
+    """캐시를 거쳐 배치한다. (결과, 캐시 적중 여부)를 돌려준다.
+    
+    명단과 그룹은 순서와 상관없는 표준 형태로 바꾼 뒤 배치하므로 같은 사람들,
+    같은 옵션, 같은 시드면 입력 순서가 달라도 같은 결과(같은 캐시 항목)가 된다.
+    normalized에 저장소의 (멤버, 그룹, Roster)를 주면 정렬과 ID 변환을 건너뛴다.
+    중간에 멈춘(should_stop) 결과는 끝까지 돌린 결과와 다를 수 있어 저장하지 않는다.
+    cache를 주지 않으면 기본 방의 캐시를 쓴다.
+    """
+    if cache is None:
+        cache = allocation_cache
+    if normalized is not None:
+        members, groups, roster = normalized
+    else:
+        members, groups = normalize_roster(members, groups)
+        roster = None
+    options = dict(options)
+    if options['seed'] is None:
+        options['seed'] = random.SystemRandom().getrandbits(32)
+    
+    key = allocation_cache_key(members, groups, calculate_group_sizes(len(members)), options)
+    result = cache.get(key)
+    if result is not None:
+        return result, True
+    
+    result = compute_allocation(members, groups, options, roster, on_improve, should_stop)
+    if not (should_stop and should_stop()):
+        cache.put(key, result)
+    return result, False
+
+def record_allocation(room_id, members, groups, options, result, stopped=False):
+    """배치를 기록에 남기고 기록 ID를 돌려준다. 기록에 실패해도 배치는 그대로 쓴다.
+    
+    시드로 다시 만들 수 있는 배치는 시드와 옵션만 남긴다. 중간에 멈춘 배치와
+    시간 제한으로 탐색한 배치(strategy='exact')는 멤버 번호 팀 목록도 함께 남긴다.
+    """
+    members, groups = normalize_roster(members, groups)
+    options = {key: value for key, value in options.items() if key != 'seed'}
+    id_teams = None
+    if stopped or options['strategy'] == 'exact':
+        id_teams = Roster(members, groups).to_ids(result['teams'])
+    try:
+        return history_store.append_allocation(
+            room_id, members, groups, options, result['seed'], result['conflicts'], id_teams
+        )
+    except sqlite3.Error as e:
+        print(f"배치 기록 오류: {e}")
+        return None
+
+@app.route('/api/roster', methods=['POST'])
+@app.route('/api/rooms/<room_id>/roster', methods=['POST'])
+def update_roster(room_id=DEFAULT_ROOM):
+    """멤버 목록과 그룹 정보를 한 번에 업데이트"""
+    room = rooms.get(room_id)
+    try:
+        data = request.json
+        members = data.get('members', [])
+        groups = data.get('groups', {})
+        
+        room.store.set_roster(members, groups)
+        room.cache.clear()
+        
+        return jsonify({
+            'success': True,
+            'members': members,
+            'groups': groups,
+            'count': {
+                'members': len(members),
+                'groups': len(groups)
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/allocate', methods=['POST'])
-def allocate_seats():
+@app.route('/api/rooms/<room_id>/allocate', methods=['POST'])
+def allocate_seats(room_id=DEFAULT_ROOM):
     """자리 배치 실행"""
+    room = rooms.get(room_id)
     try:
         data = request.json
         members = data.get('members')
         groups = data.get('groups', {})
         
-        # 데이터가 없으면 파일에서 로드
+        try:
+            options = parse_allocation_options(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # 데이터가 없으면 저장소(파일)에서 가져온다
+        normalized = None
+        if not members and not groups:
+            normalized = room.store.normalized()
+            members, groups = normalized[0], normalized[1]
+        if not members:
+            members = room.store.members()
+        if not groups:
+            groups = room.store.groups()
+        
+        if not members:
+            return jsonify({
+                'success': False,
+                'error': '멤버가 없습니다.'
+            }), 400
+        
+        result, cached = allocate_cached(members, groups, options, normalized, cache=room.cache)
+        history_id = record_allocation(room.id, members, groups, options, result)
+        
+        return jsonify({
+            'success': True,
+            **result,
+            'cached': cached,
+            'history_id': history_id
+        })
+        
+    except Exception as e:
+        import traceback
+        print(f"자리 배치 오류: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/allocate/batch', methods=['POST'])
+@app.route('/api/rooms/<room_id>/allocate/batch', methods=['POST'])
+def allocate_batch(room_id=DEFAULT_ROOM):
+    """배치 후보 n개를 만들어지는 대로 한 줄에 하나씩(NDJSON) 보낸다.
+    
+    마지막 줄은 후보 수와 가장 충돌이 적은 후보를 담은 요약이다.
+    unique=true면 같은 배치는 한 번만 보내고, parallel=false면 프로세스 풀을 쓰지 않는다.
+    """
+    room = rooms.get(room_id)
+    try:
+        data = request.get_json(silent=True) or {}
+        n = min(max(request.args.get('n', 10, type=int), 1), MAX_BATCH_ALLOCATIONS)
+        unique = bool(data.get('unique', False))
+        parallel = data.get('parallel', True) is not False
+        
+        try:
+            options = parse_allocation_options(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        members = data.get('members')
+        groups = data.get('groups', {})
+        if not members and not groups:
+            members, groups = room.store.normalized()[:2]
         if not members:
-            members = load_members()
+            members = room.store.members()
         if not groups:
-            groups = load_groups()
+            groups = room.store.groups()
+        members, groups = normalize_roster(members, groups)
         
         if not members:
             return jsonify({
@@ -135,44 +531,436 @@ def allocate_seats():
                 'error': '멤버가 없습니다.'
             }), 400
         
-        # 모둠 크기 계산
+        seed = options['seed']
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
         group_sizes = calculate_group_sizes(len(members))
+        candidates = iter_allocations(
+            n, members, group_sizes, groups,
+            seed=seed,
+            optimize_iterations=OPTIMIZE_ITERATIONS_PER_MS * options['optimize_ms'],
+            unique=unique,
+            executor=get_allocation_pool() if parallel else None,
+            workers=ALLOCATION_WORKERS
+        )
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+    def generate():
+        count = 0
+        best = None
+        try:
+            for index, run_seed, conflicts, teams in candidates:
+                count += 1
+                if best is None or conflicts < best[1]:
+                    best = (index, conflicts)
+                yield json.dumps({
+                    'type': 'allocation',
+                    'index': index,
+                    'seed': run_seed,
+                    'conflicts': conflicts,
+                    'teams': teams
+                }, ensure_ascii=False) + '\n'
+        except Exception as e:
+            print(f"배치 후보 생성 오류: {e}")
+            yield json.dumps({'type': 'error', 'error': str(e)}, ensure_ascii=False) + '\n'
+            return
+        
+        yield json.dumps({
+            'type': 'summary',
+            'success': True,
+            'count': count,
+            'requested': n,
+            'master_seed': seed,
+            'group_sizes': group_sizes,
+            'best_index': None if best is None else best[0],
+            'best_conflicts': None if best is None else best[1],
+            'conflict_lower_bound': conflict_lower_bound(Roster(members, groups), len(group_sizes))
+        }, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/rotation', methods=['POST'])
+@app.route('/api/rooms/<room_id>/rotation', methods=['POST'])
+def plan_rotation_rounds(room_id=DEFAULT_ROOM):
+    """여러 회차 자리 배치. 지난 배치(history)와 같은 짝이 되풀이되지 않게 짠다.
+    
+    history에는 지난 회차들의 배치(이름 팀 목록의 목록)를 주고, rounds에는 새로
+    짤 회차 수를 준다. 그룹 분리가 먼저이고 그다음이 같은 짝 반복 줄이기다.
+    """
+    room = rooms.get(room_id)
+    try:
+        data = request.get_json(silent=True) or {}
+        members = data.get('members') or room.store.members()
+        groups = data.get('groups') or room.store.groups()
+        history = data.get('history') or []
+        rounds = min(max(int(data.get('rounds') or 1), 1), MAX_ROTATION_ROUNDS)
+        optimize_ms = min(max(int(data.get('optimize_ms') or 0), 0), MAX_OPTIMIZE_MS)
+        seed = data.get('seed')
+        seed = random.SystemRandom().getrandbits(32) if seed is None else int(seed)
+        
+        if not members:
+            return jsonify({
+                'success': False,
+                'error': '멤버가 없습니다.'
+            }), 400
+        
+        members, groups = normalize_roster(members, groups)
+        planned = plan_rotation(
+            members, groups,
+            rounds=rounds,
+            history=history,
+            max_iterations=OPTIMIZE_ITERATIONS_PER_MS * optimize_ms or DEFAULT_ROTATION_ITERATIONS,
+            rng=random.Random(seed)
+        )
+        
+        return jsonify({
+            'success': True,
+            'rounds': planned,
+            'group_sizes': calculate_group_sizes(len(members)),
+            'seed': seed
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/jobs', methods=['POST'])
+@app.route('/api/rooms/<room_id>/jobs', methods=['POST'])
+def submit_job(room_id=DEFAULT_ROOM):
+    """배치를 백그라운드 작업으로 시작하고 작업 ID를 돌려준다.
+    
+    진행 상황은 /api/jobs/<id>/events(SSE)로 받고, DELETE /api/jobs/<id>로 취소한다.
+    """
+    room = rooms.get(room_id)
+    try:
+        data = request.get_json(silent=True) or {}
+        members = data.get('members')
+        groups = data.get('groups', {})
+        
+        try:
+            options = parse_allocation_options(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        normalized = None
+        if not members and not groups:
+            normalized = room.store.normalized()
+            members, groups = normalized[0], normalized[1]
+        if not members:
+            members = room.store.members()
+        if not groups:
+            groups = room.store.groups()
+        
+        if not members:
+            return jsonify({
+                'success': False,
+                'error': '멤버가 없습니다.'
+            }), 400
+        
+        if normalized is None:
+            members, groups = normalize_roster(members, groups)
+            normalized = (members, groups, Roster(members, groups))
+        roster = normalized[2]
         
-        # 자리 배치
-        teams = allocate_seats_with_groups(members, group_sizes, groups)
+        def run(job):
+            best = [None]
+            
+            def on_improve(conflicts, id_teams):
+                if best[0] is not None and conflicts >= best[0]:
+                    return
+                best[0] = conflicts
+                job.publish('progress', {
+                    'conflicts': conflicts,
+                    'elapsed_ms': job.elapsed_ms(),
+                    'teams': roster.to_names(id_teams)
+                })
+            
+            result, cached = allocate_cached(
+                members, groups, options, normalized,
+                on_improve=on_improve, should_stop=job.should_stop,
+                cache=room.cache
+            )
+            history_id = record_allocation(room.id, members, groups, options, result, job.should_stop())
+            return {**result, 'cached': cached, 'history_id': history_id}
+        
+        job = job_manager.submit(run)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'events_url': f'/api/jobs/{job.id}/events'
+        }), 202
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def job_not_found(job_id):
+    """이 프로세스에 없는 작업: 주인 프로세스로 넘기거나 404"""
+    if request_forwarder is not None:
+        response = request_forwarder(job_id)
+        if response is not None:
+            return response
+    return jsonify({
+        'success': False,
+        'error': '작업을 찾을 수 없습니다.'
+    }), 404
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """작업 상태와 (끝났다면) 결과"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    return jsonify({
+        'success': True,
+        **job.summary()
+    })
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """작업 취소. 작업은 다음 확인 때 멈추고 그때까지의 최선을 결과로 남긴다."""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status
+    })
+
+def format_sse(event):
+    data = json.dumps(event['data'], ensure_ascii=False)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """작업 진행 상황 스트림 (Server-Sent Events).
+    
+    progress 이벤트에는 지금까지의 최선 충돌 수, 경과 시간, 그 배치가 담기고,
+    마지막에 done / cancelled / failed 이벤트가 온다. 다시 연결할 때
+    Last-Event-ID를 보내면 그 다음 이벤트부터 받는다.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    after = -1 if last_event_id is None else last_event_id
+    
+    def generate():
+        last = after
+        while True:
+            events = job.wait_events(last, timeout=SSE_KEEPALIVE_SECONDS)
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                yield format_sse(event)
+                last = event['id']
+                if event['event'] in TERMINAL_EVENTS:
+                    return
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/history', methods=['GET'])
+@app.route('/api/rooms/<room_id>/history', methods=['GET'])
+def get_history(room_id=DEFAULT_ROOM):
+    """배치 기록을 최신순으로 limit개씩 돌려준다.
+    
+    다음 쪽은 응답의 next_before를 before로 넘겨 가져온다. since/until(유닉스 시각, 초),
+    seed, kind(allocation/move/swap/team_swap)로 거를 수 있다.
+    """
+    room = rooms.get(room_id)
+    try:
+        entries, next_before = history_store.query(
+            room.id,
+            limit=request.args.get('limit', 50, type=int),
+            before=request.args.get('before', type=int),
+            since=request.args.get('since', type=float),
+            until=request.args.get('until', type=float),
+            seed=request.args.get('seed', type=int),
+            kind=request.args.get('kind')
+        )
+        return jsonify({
+            'success': True,
+            'entries': entries,
+            'next_before': next_before
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/history', methods=['POST'])
+@app.route('/api/rooms/<room_id>/history', methods=['POST'])
+def add_history_edit(room_id=DEFAULT_ROOM):
+    """손으로 고친 내용(move/swap/team_swap)을 기록한다. base_id는 고친 배치의 기록 ID."""
+    room = rooms.get(room_id)
+    try:
+        data = request.get_json(silent=True) or {}
+        base_id = data.get('base_id')
+        try:
+            entry_id = history_store.append_edit(
+                room.id, data.get('kind'), data,
+                base_id=None if base_id is None else int(base_id)
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        # 충돌 계산
-        conflicts = calculate_group_conflicts(groups, teams)
+        return jsonify({
+            'success': True,
+            'id': entry_id
+        }), 201
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/history/<int:entry_id>', methods=['GET'])
+@app.route('/api/rooms/<room_id>/history/<int:entry_id>', methods=['GET'])
+def replay_history(entry_id, room_id=DEFAULT_ROOM):
+    """기록 시점의 배치를 다시 만든다: 시드로 배치를 다시 돌리고 그 뒤 고친 내용을 차례로 적용한다."""
+    room = rooms.get(room_id)
+    try:
+        plan = history_store.replay_plan(entry_id)
+        if plan is None or plan[0]['room'] != room.id:
+            return jsonify({
+                'success': False,
+                'error': '기록을 찾을 수 없습니다.'
+            }), 404
+        base, (members, groups), edits = plan
         
-        # 그룹별 분배 정보 계산
-        group_distributions = {}
-        for group_name, group_members in groups.items():
-            distribution = [0] * len(teams)
-            for member in group_members:
-                for team_idx, team in enumerate(teams):
-                    if member in team:
-                        distribution[team_idx] += 1
-                        break
-            group_distributions[group_name] = distribution
+        roster = Roster(members, groups)
+        if 'teams' in base:
+            teams = roster.to_names(base['teams'])
+        else:
+            options = {**base['options'], 'seed': base['seed']}
+            result, _ = allocate_cached(members, groups, options, (members, groups, roster), cache=room.cache)
+            teams = [list(team) for team in result['teams']]
+        for edit in edits:
+            teams = apply_edit(teams, edit['kind'], edit)
         
+        analysis = analyze_roster_conflicts(roster, roster.to_ids(teams))
         return jsonify({
             'success': True,
+            'entry': history_store.get(entry_id),
+            'base_id': base['id'],
+            'edits': len(edits),
             'teams': teams,
-            'group_sizes': group_sizes,
-            'conflicts': conflicts,
-            'group_distributions': group_distributions,
-            'stats': {
-                'total_members': len(members),
-                'total_teams': len(teams),
-                'group_constraints': len(groups),
-                'conflict_count': conflicts
-            }
+            'conflicts': analysis['conflicts'],
+            'conflict_pairs': analysis['conflict_pairs']
         })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/arrangements', methods=['POST'])
+@app.route('/api/rooms/<room_id>/arrangements', methods=['POST'])
+def open_arrangement(room_id=DEFAULT_ROOM):
+    """화면의 배치(teams)를 서버에 올리고 이동/교환 계산에 쓸 배치 ID를 돌려준다.
+    
+    groups를 주지 않으면 방의 그룹을 쓴다. 멤버는 teams에 있는 사람들이다.
+    """
+    room = rooms.get(room_id)
+    try:
+        data = request.get_json(silent=True) or {}
+        teams = data.get('teams')
+        if not teams:
+            return jsonify({
+                'success': False,
+                'error': '배치가 없습니다.'
+            }), 400
+        groups = data.get('groups') or room.store.groups()
+        
+        members = [member for team in teams for member in team]
+        roster = Roster(members, groups)
+        arrangement = Arrangement(roster, roster.to_ids(teams), id_prefix=worker_id_prefix)
+        arrangements.put(arrangement.id, arrangement)
+        
+        return jsonify({
+            'success': True,
+            'arrangement': arrangement.id,
+            'version': arrangement.version,
+            'conflicts': arrangement.conflicts,
+            'conflict_seats': arrangement.conflict_seats()
+        }), 201
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/evaluate-move', methods=['POST'])
+def evaluate_move():
+    """이동/교환 하나의 충돌 수 변화와 바뀌는 자리의 충돌 표시를 계산한다.
+    
+    본문: {arrangement, move: {kind: move/swap/team_swap, ...}, apply, version}
+    apply가 참이면 배치에 변경을 남긴다. version이 지금 판과 다르면 409.
+    전체 배치를 다시 채점하지 않고 옮기는 멤버의 그룹 칸만 본다.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        arrangement_id = str(data.get('arrangement') or '')
+        arrangement = arrangements.get(arrangement_id)
+        if arrangement is None and request_forwarder is not None:
+            # 다른 워커가 만든 배치면 그 워커가 계산한다
+            response = request_forwarder(arrangement_id)
+            if response is not None:
+                return response
+        if arrangement is None:
+            return jsonify({
+                'success': False,
+                'error': '배치를 찾을 수 없습니다. /api/arrangements로 다시 올려 주세요.'
+            }), 404
+        
+        try:
+            result = arrangement.evaluate(
+                data.get('move') or {},
+                apply=bool(data.get('apply')),
+                version=data.get('version')
+            )
+        except StaleArrangement as e:
+            return jsonify({
+                'success': False,
+                'error': '배치가 그 사이에 바뀌었습니다.',
+                'version': e.args[0]
+            }), 409
+        except (ValueError, TypeError) as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if result['applied']:
+            arrangements.put(arrangement.id, arrangement)  # 쓰는 동안은 만료되지 않게
         
+        return jsonify({
+            'success': True,
+            'arrangement': arrangement.id,
+            **result
+        })
     except Exception as e:
-        import traceback
-        print(f"자리 배치 오류: {e}")
-        print(traceback.format_exc())
         return jsonify({
             'success': False,
             'error': str(e)
@@ -190,17 +978,16 @@ def test_algorithm():
             "그룹C": ["사람7", "사람8", "사람9", "사람10"]
         }
         
-        group_sizes = calculate_group_sizes(len(test_members))
-        teams = allocate_seats_with_groups(test_members, group_sizes, test_groups)
-        conflicts = calculate_group_conflicts(test_groups, teams)
+        options = parse_allocation_options({'seed': TEST_SEED})
+        result, _ = allocate_cached(test_members, test_groups, options)
         
         return jsonify({
             'success': True,
             'test_result': {
                 'members_count': len(test_members),
-                'teams': teams,
-                'group_sizes': group_sizes,
-                'conflicts': conflicts,
+                'teams': result['teams'],
+                'group_sizes': result['group_sizes'],
+                'conflicts': result['conflicts'],
                 'groups': test_groups
             }
         })
@@ -210,6 +997,17 @@ def test_algorithm():
             'error': str(e)
         }), 500
 
+@app.route('/api/cache', methods=['GET'])
+@app.route('/api/rooms/<room_id>/cache', methods=['GET'])
+def cache_stats(room_id=DEFAULT_ROOM):
+    """배치 결과 캐시 상태 (적중/실패 횟수 등)"""
+    room = rooms.get(room_id)
+    return jsonify({
+        'success': True,
+        'cache': room.cache.stats(),
+        'rooms': rooms.stats()
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """서버 상태 확인"""
@@ -223,6 +1021,14 @@ def health_check():
     return response
 
 if __name__ == '__main__':
+    # 운영 모드: python web_server.py serve [--workers N ...]
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        # 이 모듈(__main__)을 그대로 넘겨 serve가 web_server를 다시 import하지 않게 한다
+        import serve
+        serve.main(sys.argv[2:], sys.modules[__name__])
+        sys.exit(0)
+    
     # 사용 가능한 포트 찾기
     import socket
     
@@ -243,6 +1049,9 @@ if __name__ == '__main__':
     print("🔧 개발자 도구에서 네트워크 탭을 확인하세요")
     print("-" * 50)
     
+    # 배치용 프로세스 풀 미리 띄우기
+    get_allocation_pool()
+    
     # 개발 모드로 실행
     app.run(
         debug=True,
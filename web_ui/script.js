@@ -4,6 +4,14 @@ let currentGroups = {};
 let currentTeams = [];
 let isLoading = false;
 let allocationCount = parseInt(localStorage.getItem('allocationCount') || '0');
+let currentJob = null;  // 진행 중인 서버 배치 작업 { id, source }
+let currentHistoryId = null;  // 지금 배치의 서버 기록 ID (이동/교환 기록이 가리킨다)
+// 서버에 올린 지금 배치 { id, version, conflicts, conflictSeats, pending, queue }
+// 있으면 충돌 수와 충돌 자리 표시는 서버 계산을 쓴다 (/api/evaluate-move)
+let currentArrangement = null;
+
+// 서버가 맞바꾸기 탐색으로 배치를 다듬는 시간 (밀리초)
+const OPTIMIZE_MS = 500;
 
 // DOM 요소들
 const elements = {
@@ -32,6 +40,9 @@ const elements = {
     logContainer: document.getElementById('logContainer')
 };
 
+// 작업이 끝나면 되돌릴 자리 섞기 버튼 내용
+const shuffleBtnLabel = elements.shuffleBtn.innerHTML;
+
 // 초기화
 document.addEventListener('DOMContentLoaded', function() {
     initializeApp();
@@ -82,6 +93,9 @@ async function loadSampleData() {
         
         // 서버가 새로 시작되었는지 확인하고 기록 초기화
         await checkServerRestartAndClearLogs();
+        
+        // 서버에 남은 최근 기록 표시
+        await loadHistoryFromServer();
     } catch (error) {
         console.log('⚠️ 서버 데이터 로드 실패, 기본 데이터를 사용합니다.');
         // 기본 데이터
@@ -275,22 +289,31 @@ function calculateGroupConflicts(groups, teams) {
 }
 
 // 자리 섞기
+// 서버에 배치 작업을 맡기고, 진행 상황(SSE)을 받아 더 나은 배치가 나올 때마다 바로 보여준다.
+// 작업이 도는 동안 자리 섞기 버튼은 '중지' 버튼이 된다.
 async function shuffleSeats() {
+    if (currentJob) {
+        cancelAllocationJob();
+        return;
+    }
     if (isLoading) return;
     
-    showLoading(true);
     isLoading = true;
+    currentJob = { id: null, source: null };
+    currentArrangement = null;
+    showJobProgress(null, 0);
     
     try {
-        // Python 백엔드 API 호출
-        const response = await fetch('/api/allocate', {
+        // Python 백엔드에 배치 작업 제출
+        const response = await fetch('/api/jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify({
                 members: currentMembers,
-                groups: currentGroups
+                groups: currentGroups,
+                optimize_ms: OPTIMIZE_MS
             })
         });
         
@@ -300,24 +323,33 @@ async function shuffleSeats() {
         
         const data = await response.json();
         
-        if (data.success) {
-            currentTeams = data.teams;
-            allocationCount++;
-            localStorage.setItem('allocationCount', allocationCount);
-            localStorage.setItem('lastTeams', JSON.stringify(currentTeams));
-            updateUI();
-            addAllocationLog(currentTeams);
-            showToast('자리 배치가 완료되었습니다!', 'success');
-            
-            console.log('📊 배치 결과:', {
-                conflicts: data.conflicts,
-                stats: data.stats,
-                groupDistributions: data.group_distributions
-            });
-        } else {
+        if (!data.success) {
             throw new Error(data.error);
         }
         
+        currentJob.id = data.job_id;
+        const { status, result } = await followAllocationJob(data.events_url);
+        
+        currentTeams = result.teams;
+        currentHistoryId = result.history_id ?? null;
+        openArrangement();
+        allocationCount++;
+        localStorage.setItem('allocationCount', allocationCount);
+        localStorage.setItem('lastTeams', JSON.stringify(currentTeams));
+        updateUI();
+        addAllocationLog(currentTeams);
+        if (status === 'cancelled') {
+            showToast('중지했습니다. 지금까지 가장 좋은 배치를 사용합니다.', 'warning');
+        } else {
+            showToast('자리 배치가 완료되었습니다!', 'success');
+        }
+        
+        console.log('📊 배치 결과:', {
+            conflicts: result.conflicts,
+            stats: result.stats,
+            groupDistributions: result.group_distributions
+        });
+        
     } catch (error) {
         console.error('자리 배치 오류:', error);
         
@@ -326,6 +358,7 @@ async function shuffleSeats() {
         try {
             const groupSizes = calculateGroupSizes(currentMembers.length);
             currentTeams = allocateSeatsWithGroups(currentMembers, groupSizes, currentGroups);
+            currentHistoryId = null;
             allocationCount++;
             localStorage.setItem('allocationCount', allocationCount);
             localStorage.setItem('lastTeams', JSON.stringify(currentTeams));
@@ -337,11 +370,61 @@ async function shuffleSeats() {
             console.error('Fallback 오류:', fallbackError);
         }
     } finally {
-        showLoading(false);
+        currentJob = null;
+        hideJobProgress();
         isLoading = false;
     }
 }
 
+// 배치 작업의 진행 상황 스트림을 따라가다 끝나면 { status, result }로 resolve
+function followAllocationJob(eventsUrl) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(eventsUrl);
+        currentJob.source = source;
+        
+        // 지금까지 가장 좋은 배치를 바로 보여준다
+        source.addEventListener('progress', (event) => {
+            const progress = JSON.parse(event.data);
+            currentTeams = progress.teams;
+            updateUI();
+            showJobProgress(progress.conflicts, progress.elapsed_ms);
+        });
+        
+        const finish = (event) => {
+            source.close();
+            const data = JSON.parse(event.data);
+            resolve({ status: data.status, result: data.result });
+        };
+        source.addEventListener('done', finish);
+        source.addEventListener('cancelled', finish);
+        
+        source.addEventListener('failed', (event) => {
+            source.close();
+            reject(new Error(JSON.parse(event.data).error));
+        });
+        
+        // 연결이 아예 끊기면 (서버 종료 등) 실패로 처리, 일시적인 끊김은 브라우저가 다시 연결한다
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                reject(new Error('진행 상황 연결이 끊어졌습니다.'));
+            }
+        };
+    });
+}
+
+// 진행 중인 배치 작업 중지 (서버는 그때까지의 최선을 결과로 보내준다)
+async function cancelAllocationJob() {
+    if (!currentJob || !currentJob.id) return;
+    
+    elements.shuffleBtn.disabled = true;
+    elements.shuffleBtn.innerHTML = '<span class="btn-icon">⏳</span> 중지하는 중...';
+    try {
+        await fetch(`/api/jobs/${currentJob.id}`, { method: 'DELETE' });
+    } catch (error) {
+        console.error('작업 중지 오류:', error);
+    }
+}
+
 // UI 업데이트
 function updateUI() {
     updateStats();
@@ -351,9 +434,12 @@ function updateUI() {
 
 // 통계 업데이트
 function updateStats() {
-    const conflicts = Object.keys(currentGroups).length > 0 
-        ? calculateGroupConflicts(currentGroups, currentTeams) 
-        : 0;
+    let conflicts = 0;
+    if (hasServerScores()) {
+        conflicts = currentArrangement.conflicts;
+    } else if (Object.keys(currentGroups).length > 0) {
+        conflicts = calculateGroupConflicts(currentGroups, currentTeams);
+    }
         
     elements.totalMembers.textContent = currentMembers.length;
     elements.totalTeams.textContent = currentTeams.length;
@@ -442,8 +528,11 @@ function createTeamElement(team, teamNumber) {
             seat.classList.add('occupied');
             seat.textContent = team[i];
             
-            // 그룹 겹침 체크
-            if (isConflictSeat(team[i], team, currentGroups)) {
+            // 그룹 겹침 체크 (서버 계산이 있으면 그것을 쓴다)
+            const conflicted = hasServerScores()
+                ? currentArrangement.conflictSeats.has(team[i])
+                : isConflictSeat(team[i], team, currentGroups);
+            if (conflicted) {
                 seat.classList.add('conflict');
                 seat.title = '그룹 겹침 발생';
             }
@@ -706,31 +795,22 @@ async function saveSettings() {
 
 // 서버에 데이터 저장
 async function saveDataToServer(members, groups) {
-    const [membersResponse, groupsResponse] = await Promise.all([
-        fetch('/api/members', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ members })
-        }),
-        fetch('/api/groups', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ groups })
-        })
-    ]);
+    // 멤버와 그룹을 한 번의 요청으로 저장
+    const response = await fetch('/api/roster', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ members, groups })
+    });
     
-    if (!membersResponse.ok || !groupsResponse.ok) {
+    if (!response.ok) {
         throw new Error('서버 저장 실패');
     }
     
-    const membersData = await membersResponse.json();
-    const groupsData = await groupsResponse.json();
+    const data = await response.json();
     
-    if (!membersData.success || !groupsData.success) {
+    if (!data.success) {
         throw new Error('서버 저장 실패');
     }
 }
@@ -746,6 +826,22 @@ function showLoading(show) {
     }
 }
 
+// 배치 작업 진행 표시 (자리 섞기 버튼이 중지 버튼이 된다)
+function showJobProgress(conflicts, elapsedMs) {
+    if (!currentJob || elements.shuffleBtn.disabled) return;
+    
+    const seconds = (elapsedMs / 1000).toFixed(1);
+    const status = conflicts === null ? '배치 중' : `충돌 ${conflicts}개`;
+    elements.shuffleBtn.classList.add('running');
+    elements.shuffleBtn.innerHTML = `<span class="btn-icon">⏹</span> 중지 · ${status} · ${seconds}초`;
+}
+
+function hideJobProgress() {
+    elements.shuffleBtn.classList.remove('running');
+    elements.shuffleBtn.innerHTML = shuffleBtnLabel;
+    elements.shuffleBtn.disabled = false;
+}
+
 // 토스트 알림
 function showToast(message, type = 'success') {
     const toast = elements.toast;
@@ -838,6 +934,51 @@ function loadAllocationLogs() {
     });
 }
 
+// 서버 기록 하나를 로그 문구로
+function describeHistoryEntry(entry) {
+    switch (entry.kind) {
+        case 'move':
+            return `이동: ${entry.member} → ${entry.from_team + 1}모둠에서 ${entry.to_team + 1}모둠으로`;
+        case 'swap':
+            return `교환: ${entry.a} ↔ ${entry.b}`;
+        case 'team_swap':
+            return `모둠교환: ${entry.from_team + 1}모둠 ↔ ${entry.to_team + 1}모둠`;
+        default:
+            return `배치 (시드 ${entry.seed}, 충돌 ${entry.conflicts})`;
+    }
+}
+
+// 서버에 남은 최근 배치 기록 불러오기 (서버를 다시 시작해도 남아 있다)
+async function loadHistoryFromServer() {
+    try {
+        const response = await fetch('/api/history?limit=10');
+        if (!response.ok) return;
+        const data = await response.json();
+        if (!data.success || data.entries.length === 0) return;
+        
+        const logClasses = { move: 'move-log', swap: 'swap-log', team_swap: 'team-swap-log' };
+        const logContainer = elements.logContainer;
+        logContainer.innerHTML = '';
+        data.entries.forEach(entry => {
+            const timeString = new Date(entry.created_at * 1000).toLocaleTimeString('ko-KR', {
+                hour: '2-digit',
+                minute: '2-digit',
+                second: '2-digit'
+            });
+            const logEntry = document.createElement('div');
+            logEntry.className = `log-entry ${logClasses[entry.kind] || ''}`.trim();
+            logEntry.innerHTML = `
+                <span class="log-number">#${entry.id}</span>
+                <span class="log-time">${timeString}</span>
+                <span class="log-teams">${describeHistoryEntry(entry)}</span>
+            `;
+            logContainer.appendChild(logEntry);
+        });
+    } catch (error) {
+        console.log('서버 기록 불러오기 실패:', error);
+    }
+}
+
 // localStorage에 배치 로그 저장
 function saveAllocationLogs(logData) {
     let logs = JSON.parse(localStorage.getItem('allocationLogs') || '[]');
@@ -1055,6 +1196,8 @@ function moveToEmptySpotInTeam(dragData, toTeamIndex) {
     
     // 이동 로그 추가
     addMoveLog(member, fromTeamIndex + 1, toTeamIndex + 1);
+    recordHistoryEdit('move', { member, from_team: fromTeamIndex, to_team: toTeamIndex });
+    applyMoveOnServer({ kind: 'move', member, from_team: fromTeamIndex, to_team: toTeamIndex });
 }
 
 // 자리 교환
@@ -1105,12 +1248,16 @@ function swapSeats(fromTeam, fromSeat, fromMember, toTeam, toSeat, toMember) {
     if (fromMember && toMember) {
         // 사람끼리 교환
         addSwapLog(fromMember, toMember);
+        recordHistoryEdit('swap', { a: fromMember, b: toMember });
+        applyMoveOnServer({ kind: 'swap', a: fromMember, b: toMember, a_team: fromTeam, b_team: toTeam });
     } else {
         // 사람이 빈자리로 이동
         const member = fromMember || toMember;
         const fromTeamNum = fromMember ? fromTeam + 1 : toTeam + 1;
         const toTeamNum = fromMember ? toTeam + 1 : fromTeam + 1;
         addMoveLog(member, fromTeamNum, toTeamNum);
+        recordHistoryEdit('move', { member, from_team: fromTeamNum - 1, to_team: toTeamNum - 1 });
+        applyMoveOnServer({ kind: 'move', member, from_team: fromTeamNum - 1, to_team: toTeamNum - 1 });
     }
 }
 
@@ -1131,6 +1278,110 @@ function swapTeams(fromTeamIndex, toTeamIndex) {
     
     // 교환 로그 추가
     addTeamSwapLog(fromTeamIndex + 1, toTeamIndex + 1);
+    recordHistoryEdit('team_swap', { from_team: fromTeamIndex, to_team: toTeamIndex });
+    applyMoveOnServer({ kind: 'team_swap', from_team: fromTeamIndex, to_team: toTeamIndex });
+}
+
+// 서버 계산(충돌 수, 충돌 자리)을 화면에 쓸 수 있는지
+function hasServerScores() {
+    return currentArrangement !== null && currentArrangement.pending === 0;
+}
+
+// 지금 배치를 서버에 올린다. 이후 이동/교환은 서버가 바뀐 부분만 다시 채점한다.
+async function openArrangement() {
+    const teams = currentTeams;
+    try {
+        const response = await fetch('/api/arrangements', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ teams, groups: currentGroups })
+        });
+        const data = await response.json();
+        if (!data.success || teams !== currentTeams) return;
+        
+        currentArrangement = {
+            id: data.arrangement,
+            version: data.version,
+            conflicts: data.conflicts,
+            conflictSeats: new Set(data.conflict_seats),
+            pending: 0,
+            queue: Promise.resolve()
+        };
+        updateStats();
+        updateClassroom();
+    } catch (error) {
+        currentArrangement = null;
+        console.log('배치 올리기 실패, 화면에서 계산합니다:', error);
+    }
+}
+
+// 화면에서 고친 내용을 서버 배치에도 적용하고, 돌아온 충돌 변화로 화면을 고친다.
+// 변경은 보낸 순서대로 하나씩 적용한다. 서버가 배치를 잃었거나(다른 워커, 만료)
+// 판이 어긋나면 지금 배치를 다시 올린다.
+function applyMoveOnServer(move) {
+    if (!currentArrangement) {
+        if (currentTeams.length > 0) openArrangement();
+        return;
+    }
+    const arrangement = currentArrangement;
+    arrangement.pending++;
+    arrangement.queue = arrangement.queue.then(() => sendMove(arrangement, move));
+}
+
+async function sendMove(arrangement, move) {
+    try {
+        const response = await fetch('/api/evaluate-move', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                arrangement: arrangement.id,
+                version: arrangement.version,
+                move,
+                apply: true
+            })
+        });
+        const data = await response.json();
+        if (arrangement !== currentArrangement) return;
+        
+        if (!data.success) {
+            currentArrangement = null;
+            openArrangement();
+            return;
+        }
+        
+        arrangement.version = data.version;
+        arrangement.conflicts = data.conflicts;
+        for (const [member, conflicted] of Object.entries(data.seats)) {
+            if (conflicted) {
+                arrangement.conflictSeats.add(member);
+            } else {
+                arrangement.conflictSeats.delete(member);
+            }
+        }
+        arrangement.pending--;
+        if (arrangement.pending === 0) {
+            updateStats();
+            updateClassroom();
+        }
+    } catch (error) {
+        if (arrangement === currentArrangement) currentArrangement = null;
+        console.log('서버 채점 실패, 화면에서 계산합니다:', error);
+    }
+}
+
+// 고친 내용을 서버 기록에 남긴다 (실패해도 화면의 배치는 그대로 둔다)
+function recordHistoryEdit(kind, edit) {
+    fetch('/api/history', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ kind, base_id: currentHistoryId, ...edit })
+    }).catch(error => console.log('기록 저장 실패:', error));
 }
 
 // 이동 로그 추가
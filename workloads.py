@@ -0,0 +1,141 @@
+"""
+합성 명단/그룹 생성기
+실제 규모(수백~수십만 명)로 배치를 시험할 수 있도록, 시드로 재현되는 명단과 그룹을 만든다.
+그룹 수, 크기 분포, 겹침 정도(여러 그룹에 속한 멤버 비율)와 일부러 어려운 경우
+(모둠 수보다 큰 그룹, 하한은 0인데 다 떨어뜨릴 수 없는 그룹)를 정할 수 있다.
+
+    python workloads.py --members 1000 --overlap 0.2 --seed 1 --out data/
+"""
+import argparse
+import os
+import random
+
+from seat_allocation import calculate_group_sizes
+from roster_store import atomic_write, format_members_file, format_groups_file
+
+SIZE_DISTRIBUTIONS = ('fixed', 'uniform', 'zipf')
+
+# 품질/성능 실험에 쓰는 작업량 종류 → generate_workload 인자
+WORKLOAD_CLASSES = {
+    'disjoint': {},                                          # 겹치지 않는 작은 그룹
+    'overlapping': {'overlap': 0.3},                         # 멤버 일부가 여러 그룹에
+    'heavy_tailed': {'distribution': 'zipf', 'max_size': 60}, # 대부분 작고 몇 개는 큰 그룹
+    'oversized': {'oversized': True},                        # 모둠 수보다 큰 그룹 하나
+    'inseparable': {'inseparable': True}                     # 다 떨어뜨릴 수 없는 그룹들
+}
+
+def member_names(num_members, prefix='사람'):
+    return [f'{prefix}{i}' for i in range(1, num_members + 1)]
+
+def _group_size(rng, distribution, min_size, max_size):
+    if distribution == 'fixed':
+        return max_size
+    if distribution == 'uniform':
+        return rng.randint(min_size, max_size)
+    if distribution == 'zipf':
+        # 파레토 꼬리: 대부분 min_size 근처이고 가끔 max_size까지 커진다
+        return min(max_size, int(min_size * rng.paretovariate(1.2)))
+    raise ValueError(f'알 수 없는 크기 분포입니다: {distribution}')
+
+def generate_groups(members, num_groups, rng, min_size=2, max_size=6, distribution='uniform',
+                    overlap=0.0, prefix='그룹'):
+    """members로 그룹 num_groups개를 만든다.
+
+    자리마다 overlap 확률로 이미 그룹이 있는 멤버를 다시 뽑고, 아니면 아직 그룹이
+    없는 멤버를 뽑는다. overlap=0이면 (멤버가 모자라지 않는 한) 그룹끼리 겹치지 않는다.
+    """
+    free = list(members)
+    rng.shuffle(free)
+    next_free = 0
+    grouped = []
+    groups = {}
+    for index in range(num_groups):
+        size = min(_group_size(rng, distribution, min_size, max_size), len(members))
+        chosen = {}
+        while len(chosen) < size:
+            member = None
+            if grouped and (next_free >= len(free) or rng.random() < overlap):
+                member = rng.choice(grouped)
+                if member in chosen and next_free < len(free):
+                    member = None
+            if member is None:
+                member = free[next_free]
+                next_free += 1
+                grouped.append(member)
+            chosen[member] = None
+        groups[f'{prefix}{index + 1}'] = list(chosen)
+    return groups
+
+def inseparable_groups(members, num_teams, rng, prefix='못나눔'):
+    """모둠 수 + 1명을 세 묶음 A, B, C로 나눠 A∪B, B∪C, C∪A 그룹을 만든다.
+
+    그룹마다 모둠 수 이하라 비둘기집 하한은 0이지만, 뽑힌 사람끼리는 모두 어떤
+    그룹을 함께 쓰므로 모두 다른 모둠에 앉을 수 없어 충돌이 적어도 하나 생긴다.
+    """
+    picked = rng.sample(members, min(len(members), num_teams + 1))
+    parts = [picked[i::3] for i in range(3)]
+    return {
+        f'{prefix}{i + 1}': parts[i] + parts[(i + 1) % 3]
+        for i in range(3)
+    }
+
+def generate_workload(num_members, num_groups=None, min_size=2, max_size=6, distribution='uniform',
+                      overlap=0.0, oversized=False, inseparable=False, seed=None):
+    """합성 (멤버 목록, 그룹 딕셔너리). 같은 인자와 seed면 항상 같은 결과다.
+
+    num_groups를 주지 않으면 대략 멤버 절반이 그룹에 들어가도록 정한다.
+    oversized면 모둠 수의 1.5배 크기 그룹을, inseparable이면 inseparable_groups를 더한다.
+    """
+    if distribution not in SIZE_DISTRIBUTIONS:
+        raise ValueError(f'알 수 없는 크기 분포입니다: {distribution}')
+    rng = random.Random(seed)
+    members = member_names(num_members)
+    if num_groups is None:
+        num_groups = max(1, num_members // (min_size + max_size)) if num_members else 0
+    groups = generate_groups(members, num_groups, rng, min_size, max_size, distribution, overlap)
+
+    num_teams = len(calculate_group_sizes(num_members))
+    if oversized and members:
+        groups['모둠수초과'] = rng.sample(members, min(num_members, num_teams + max(1, num_teams // 2)))
+    if inseparable and num_members > num_teams:
+        groups.update(inseparable_groups(members, num_teams, rng))
+    return members, groups
+
+def make_workload(kind, num_members, seed=None, **overrides):
+    """WORKLOAD_CLASSES의 이름으로 작업량을 만든다."""
+    if kind not in WORKLOAD_CLASSES:
+        raise ValueError(f'알 수 없는 작업량 종류입니다: {kind}')
+    return generate_workload(num_members, seed=seed, **{**WORKLOAD_CLASSES[kind], **overrides})
+
+def write_workload(members, groups, members_path='members.txt', groups_path='groups.txt'):
+    """members.txt / groups.txt 형식으로 쓴다."""
+    atomic_write(members_path, format_members_file(members))
+    atomic_write(groups_path, format_groups_file(groups))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 명단/그룹 생성")
+    parser.add_argument('--members', type=int, required=True, help="멤버 수")
+    parser.add_argument('--kind', choices=sorted(WORKLOAD_CLASSES), help="미리 정한 작업량 종류")
+    parser.add_argument('--groups', type=int, help="그룹 수 (기본: 멤버 절반쯤이 그룹에 들어가게)")
+    parser.add_argument('--min-size', type=int, default=2)
+    parser.add_argument('--max-size', type=int, default=6)
+    parser.add_argument('--distribution', choices=SIZE_DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--overlap', type=float, default=0.0, help="이미 그룹이 있는 멤버를 다시 뽑을 확률")
+    parser.add_argument('--oversized', action='store_true', help="모둠 수보다 큰 그룹 추가")
+    parser.add_argument('--inseparable', action='store_true', help="다 떨어뜨릴 수 없는 그룹 추가")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='.', help="members.txt / groups.txt를 쓸 디렉터리")
+    args = parser.parse_args(argv)
+
+    if args.kind:
+        members, groups = make_workload(args.kind, args.members, seed=args.seed)
+    else:
+        members, groups = generate_workload(
+            args.members, args.groups, args.min_size, args.max_size, args.distribution,
+            args.overlap, args.oversized, args.inseparable, seed=args.seed
+        )
+    write_workload(members, groups, os.path.join(args.out, 'members.txt'), os.path.join(args.out, 'groups.txt'))
+    print(f"✅ {len(members)}명, {len(groups)}개 그룹 → {args.out}")
+
+if __name__ == '__main__':
+    main()